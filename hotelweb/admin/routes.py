@@ -1,7 +1,7 @@
 """
 Admin routes for platform management
 """
-from flask import render_template, request, url_for, redirect, flash, abort, jsonify
+from flask import render_template, request, url_for, redirect, flash, abort, jsonify, current_app, send_from_directory
 from flask_login import login_user, current_user
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
@@ -9,7 +9,18 @@ from sqlalchemy import or_
 from ..extensions import db
 from ..models import User, Hotel, RoomType, Booking, Review, PointsTransaction, ContactMessage, Amenity
 from ..utils.decorators import admin_required
-from ..utils.security import validate_csrf_token, get_client_ip, check_login_attempts, record_login_attempt
+from ..utils.admission import cost_class
+from ..utils.streaming import stream_page
+from ..main.points import credit_points_lot
+from ..main.stats import get_site_stats, record_user_created, record_role_changed
+from ..main.refdata import get_reference_data
+from ..main.loaders import loader_profile
+from ..main.page_cache import mark_hotel_changed
+from ..main.room_batch import validate_room_changeset, apply_room_changeset
+from ..main.permissions import mark_staff_changed
+from ..utils.images import schedule_variants
+from ..utils.profiling import list_profiles, PROFILE_EXTENSIONS
+from ..utils.security import validate_csrf_token, get_client_ip, check_login_allowed, record_login_result
 from werkzeug.security import generate_password_hash
 from . import bp
 
@@ -29,10 +40,8 @@ def login():
         password = request.form.get('password', '')
         client_ip = get_client_ip()
         
-        identifier = email if email else client_ip
-        
-        # Check login attempts
-        allowed, remaining, lockout_until = check_login_attempts(identifier, max_attempts=5, lockout_duration=900)
+        # Check login attempts (per account and per IP)
+        allowed, remaining, lockout_until = check_login_allowed(email, client_ip)
         if not allowed:
             if lockout_until:
                 now = datetime.now()
@@ -46,7 +55,7 @@ def login():
             return render_template('admin/login.html')
         
         if not email or not password:
-            record_login_attempt(identifier, False)
+            record_login_result(email, client_ip, False)
             flash('Email and password are required.', 'danger')
             return render_template('admin/login.html')
         
@@ -59,16 +68,16 @@ def login():
         
         if user and password_valid:
             if user.role != 'admin':
-                record_login_attempt(identifier, False)
+                record_login_result(email, client_ip, False)
                 flash('Access denied. This is an admin-only area.', 'danger')
                 return render_template('admin/login.html')
             
-            record_login_attempt(identifier, True)
+            record_login_result(email, client_ip, True)
             login_user(user)
             flash('You have been logged in successfully.', 'success')
             return redirect(url_for('admin.dashboard'))
         else:
-            record_login_attempt(identifier, False)
+            record_login_result(email, client_ip, False)
             flash('Invalid email or password. Please try again.', 'danger')
             if remaining and remaining < 5:
                 flash(f'Warning: {remaining} attempt(s) remaining before account lockout.', 'warning')
@@ -77,17 +86,22 @@ def login():
 
 @bp.route('/dashboard')
 @admin_required
+@cost_class('admin')
 def dashboard():
     """Admin dashboard with platform statistics"""
-    total_users = User.query.count()
-    total_customers = User.query.filter_by(role='customer').count()
-    total_staff = User.query.filter_by(role='staff').count()
-    total_hotels = Hotel.query.count()
-    total_bookings = Booking.query.count()
+    # Platform counters are maintained incrementally (see main/stats.py)
+    stats = get_site_stats()
+    total_users = stats.total_users
+    total_customers = stats.total_customers
+    total_staff = stats.total_staff
+    total_hotels = stats.total_hotels
+    total_bookings = stats.total_bookings
     
     # Recent activity
     recent_users = User.query.order_by(User.created_at.desc()).limit(10).all()
-    recent_bookings = Booking.query.order_by(Booking.created_at.desc()).limit(10).all()
+    recent_bookings = Booking.query.options(*loader_profile('booking_admin_list')).order_by(
+        Booking.created_at.desc()
+    ).limit(10).all()
     
     return render_template('admin/dashboard.html',
                          total_users=total_users,
@@ -100,6 +114,7 @@ def dashboard():
 
 @bp.route('/users')
 @admin_required
+@cost_class('admin')
 def users():
     """View all users with roles, search and pagination"""
     search = request.args.get('search', '').strip()
@@ -125,11 +140,11 @@ def users():
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
     users = pagination.items
     
-    return render_template('admin/users.html', 
-                         users=users,
-                         pagination=pagination,
-                         search=search,
-                         role_filter=role_filter)
+    return stream_page('admin/users.html', 
+                       users=users,
+                       pagination=pagination,
+                       search=search,
+                       role_filter=role_filter)
 
 @bp.route('/users/<int:user_id>/edit', methods=['GET', 'POST'])
 @admin_required
@@ -172,6 +187,7 @@ def edit_user(user_id):
             flash('Email already taken.', 'danger')
             return render_template('admin/edit_user.html', user=user, all_hotels=Hotel.query.all())
         
+        record_role_changed(user.role, role)
         user.username = username
         user.email = email
         user.role = role
@@ -193,6 +209,7 @@ def edit_user(user_id):
         else:
             # Clear assigned hotels for non-staff
             user.assigned_hotels = []
+        mark_staff_changed(user.id)  # Drop cached hotel permissions in every worker
         
         db.session.commit()
         flash('User updated successfully.', 'success')
@@ -249,6 +266,7 @@ def create_user():
                 pass
         
         db.session.add(user)
+        record_user_created(role)
         db.session.commit()
         flash('User created successfully.', 'success')
         return redirect(url_for('admin.users'))
@@ -289,12 +307,14 @@ def grant_points(user_id):
         description=description
     )
     db.session.add(transaction)
+    credit_points_lot(transaction)
     db.session.commit()
     
     return jsonify({'success': True, 'message': f'{points_int:,} points granted successfully.', 'new_balance': user.points})
 
 @bp.route('/hotels')
 @admin_required
+@cost_class('admin')
 def hotels():
     """View all hotels with search and pagination"""
     search = request.args.get('search', '').strip()
@@ -302,7 +322,7 @@ def hotels():
     page = request.args.get('page', 1, type=int)
     per_page = 10
     
-    query = Hotel.query
+    query = Hotel.query.options(*loader_profile('hotel_admin_list'))
     
     if city_filter:
         query = query.filter(Hotel.city.ilike(f'%{city_filter}%'))
@@ -329,24 +349,22 @@ def hotels():
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
     hotels = pagination.items
     
-    # Get unique cities for filter
-    all_cities = db.session.query(Hotel.city).distinct().order_by(Hotel.city).all()
-    cities = [c[0] for c in all_cities]
-    
-    # Get all brands for filter
-    from ..models import Brand
-    brands = Brand.query.order_by(Brand.name).all()
-    
-    return render_template('admin/hotels.html', 
-                         hotels=hotels,
-                         pagination=pagination,
-                         search=search,
-                         city_filter=city_filter,
-                         cities=cities,
-                         brands=brands)
+    # Get unique cities and all brands for filter
+    refdata = get_reference_data()
+    cities = list(refdata.cities)
+    brands = refdata.brands_sorted_by_name()
+    
+    return stream_page('admin/hotels.html', 
+                       hotels=hotels,
+                       pagination=pagination,
+                       search=search,
+                       city_filter=city_filter,
+                       cities=cities,
+                       brands=brands)
 
 @bp.route('/hotels/<int:hotel_id>/reviews')
 @admin_required
+@cost_class('admin')
 def hotel_reviews(hotel_id):
     """View and manage reviews for a hotel with search and pagination"""
     search = request.args.get('search', '').strip()
@@ -356,7 +374,7 @@ def hotel_reviews(hotel_id):
     
     hotel = Hotel.query.get_or_404(hotel_id)
     
-    query = Review.query.filter_by(hotel_id=hotel_id)
+    query = Review.query.filter_by(hotel_id=hotel_id).options(*loader_profile('review_list'))
     
     if rating_filter:
         query = query.filter(Review.rating == rating_filter)
@@ -389,6 +407,7 @@ def delete_review(review_id):
     hotel_id = review.hotel_id
     
     db.session.delete(review)
+    mark_hotel_changed(hotel_id)
     db.session.commit()
     
     return jsonify({'success': True, 'message': 'Review deleted successfully.'})
@@ -433,7 +452,9 @@ def edit_hotel(hotel_id):
                     except (ValueError, InvalidOperation):
                         flash('Invalid breakfast price format.', 'danger')
                 
+                mark_hotel_changed(hotel_id)
                 db.session.commit()
+                schedule_variants(image_url)
                 flash('Hotel details updated successfully.', 'success')
         
         # Add new room
@@ -474,7 +495,9 @@ def edit_hotel(hotel_id):
                     pass
                 
                 db.session.add(room)
+                mark_hotel_changed(hotel_id)
                 db.session.commit()
+                schedule_variants(image_url)
                 flash('Room added successfully.', 'success')
         
         # Update room details
@@ -519,7 +542,9 @@ def edit_hotel(hotel_id):
                         except (ValueError, TypeError):
                             pass
                         
+                        mark_hotel_changed(hotel_id)
                         db.session.commit()
+                        schedule_variants(image_url)
                         flash('Room updated successfully.', 'success')
         
         # Delete room
@@ -538,22 +563,46 @@ def edit_hotel(hotel_id):
                         flash('Cannot delete room type with existing bookings.', 'danger')
                     else:
                         db.session.delete(room)
+                        mark_hotel_changed(hotel_id)
                         db.session.commit()
                         flash('Room deleted successfully.', 'success')
         
         return redirect(url_for('admin.edit_hotel', hotel_id=hotel_id))
     
     # GET request - display hotel management page
-    room_types = RoomType.query.filter_by(hotel_id=hotel_id).all()
-    all_amenities = Amenity.query.all()
+    room_types = RoomType.query.filter_by(hotel_id=hotel_id).options(*loader_profile('room_type_edit')).all()
+    all_amenities = get_reference_data().amenities
     
     return render_template('admin/edit_hotel.html', 
                          hotel=hotel, 
                          room_types=room_types,
                          all_amenities=all_amenities)
 
+@bp.route('/hotels/<int:hotel_id>/rooms/batch', methods=['POST'])
+@admin_required
+def batch_edit_rooms(hotel_id):
+    """Apply a JSON changeset of room type upserts, deletes and amenities (see main/room_batch.py)"""
+    Hotel.query.get_or_404(hotel_id)
+    if not request.is_json:
+        return jsonify({'success': False, 'message': 'Invalid request format.'}), 400
+    
+    data = request.get_json(silent=True)
+    csrf_token = data.get('csrf_token') if isinstance(data, dict) else None
+    if not validate_csrf_token(csrf_token or request.headers.get('X-CSRFToken')):
+        return jsonify({'success': False, 'message': 'Invalid request. Please try again.'}), 400
+    
+    changeset, errors = validate_room_changeset(hotel_id, data)
+    if errors:
+        return jsonify({'success': False, 'message': 'No changes were saved.', 'errors': errors}), 400
+    
+    summary = apply_room_changeset(hotel_id, changeset)
+    for image_url in changeset.image_urls:
+        schedule_variants(image_url)
+    return jsonify({'success': True, 'message': 'Rooms updated successfully.', **summary})
+
 @bp.route('/messages')
 @admin_required
+@cost_class('admin')
 def messages():
     """View all contact messages with search and pagination"""
     search = request.args.get('search', '').strip()
@@ -562,7 +611,7 @@ def messages():
     page = request.args.get('page', 1, type=int)
     per_page = 10
     
-    query = ContactMessage.query
+    query = ContactMessage.query.options(*loader_profile('message_list'))
     
     if subject_filter:
         query = query.filter(ContactMessage.subject == subject_filter)
@@ -586,12 +635,12 @@ def messages():
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
     messages = pagination.items
     
-    return render_template('admin/messages.html', 
-                         messages=messages,
-                         pagination=pagination,
-                         search=search,
-                         subject_filter=subject_filter,
-                         read_filter=read_filter)
+    return stream_page('admin/messages.html', 
+                       messages=messages,
+                       pagination=pagination,
+                       search=search,
+                       subject_filter=subject_filter,
+                       read_filter=read_filter)
 
 @bp.route('/messages/<int:message_id>/read', methods=['POST'])
 @admin_required
@@ -611,3 +660,22 @@ def delete_message(message_id):
     db.session.commit()
     return jsonify({'success': True, 'message': 'Message deleted successfully.'})
 
+@bp.route('/profiles')
+@admin_required
+def profiles():
+    """Request profiles saved by the on-demand profiler"""
+    if not current_app.config.get('PROFILING_ENABLED'):
+        abort(404)
+    entries = [
+        {'name': name, 'size_kb': size / 1024, 'created_at': datetime.fromtimestamp(mtime)}
+        for name, size, mtime in list_profiles(current_app.config['PROFILE_DIR'])
+    ]
+    return render_template('admin/profiles.html', profiles=entries)
+
+@bp.route('/profiles/<path:name>')
+@admin_required
+def download_profile(name):
+    """Download one saved profile"""
+    if not current_app.config.get('PROFILING_ENABLED') or not name.endswith(PROFILE_EXTENSIONS):
+        abort(404)
+    return send_from_directory(current_app.config['PROFILE_DIR'], name, as_attachment=True)
@@ -1,6 +1,7 @@
 import os
 import logging
-from flask import Flask
+from flask import Flask, request
+from sqlalchemy import event
 from .config import Config
 from .extensions import db, login_manager
 
@@ -8,9 +9,48 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Take the client address from the known number of proxies only
+    proxies = app.config.get('TRUSTED_PROXY_COUNT', 0)
+    if proxies:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies, x_host=proxies)
+
     # Initialize Extensions
     db.init_app(app)
     login_manager.init_app(app)
+    configure_database(app)
+
+    # On-demand request profiling; registered first so it wraps the other hooks
+    from .utils.profiling import init_profiling
+    init_profiling(app)
+
+    # gzip/brotli response compression; its after_request hook runs after the ones registered below
+    from .utils.compression import init_compression
+    init_compression(app)
+
+    # Opt-in query counting, N+1 detection and Server-Timing headers
+    from .utils.sql_instrumentation import init_sql_instrumentation
+    init_sql_instrumentation(app)
+
+    # Request latency, status, DB pool and cache metrics at /metrics
+    from .utils.metrics import init_metrics
+    init_metrics(app)
+
+    # Releases the @cost_class concurrency slots held by streamed pages
+    from .utils.admission import init_admission
+    init_admission(app)
+
+    # Sanitized request log for replaying production traffic
+    from .utils.request_capture import init_request_capture
+    init_request_capture(app)
+
+    # Fingerprinted static assets and the static_url()/asset_tags() template helpers
+    from .utils.assets import init_assets
+    init_assets(app)
+
+    # Resized image variants and the responsive_img()/background_style() template helpers
+    from .utils.images import init_images
+    init_images(app)
 
     # Register Blueprints
     from .auth import bp as auth_bp
@@ -25,13 +65,23 @@ def create_app(config_class=Config):
     from .admin import bp as admin_bp
     app.register_blueprint(admin_bp)
 
+    # Pick up cache invalidations published by other workers
+    @app.before_request
+    def poll_cache_invalidations():
+        from .main.invalidation import poll_invalidations
+        if request.endpoint != 'static':
+            poll_invalidations()
+
     # Context processor to make brands available in all templates
     @app.context_processor
     def inject_brands():
-        from .models import Brand
-        brands = Brand.query.all()
-        return dict(brands=brands)
+        from .main.refdata import get_reference_data
+        return dict(brands=get_reference_data().brands)
     
+    # Cached hotel card fragments for listing templates
+    from .main.fragments import hotel_card_fragment
+    app.add_template_global(hotel_card_fragment)
+
     # Context processor to make CSRF token function available in all templates
     @app.context_processor
     def inject_csrf():
@@ -42,12 +92,12 @@ def create_app(config_class=Config):
     @app.context_processor
     def inject_language():
         from flask import session
-        from .main.language import get_current_language, SUPPORTED_LANGUAGES, get_translation
+        from .main.language import get_current_language, SUPPORTED_LANGUAGES, get_translator
         current_lang = get_current_language(session)
         return dict(
             current_language=current_lang,
             supported_languages=SUPPORTED_LANGUAGES,
-            t=lambda key, default=None: get_translation(session, key, default)
+            t=get_translator(current_lang)  # Bound once per request to the language's catalog
         )
 
     # Setup Logging
@@ -62,8 +112,47 @@ def create_app(config_class=Config):
     with app.app_context():
         db.create_all()
 
+        # Warm this worker's reference data cache (brands, amenities, cities)
+        from .main.refdata import warm_reference_data
+        refdata = warm_reference_data()
+        app.logger.info(
+            'Reference data cache warmed: %d brands, %d amenities, %d cities',
+            len(refdata.brands), len(refdata.amenities), len(refdata.cities)
+        )
+
+        # Caches are fresh as of now; apply only events published from here on
+        from .main.invalidation import start_polling
+        start_polling()
+
     return app
 
+def sqlite_pragmas(config):
+    """Pragmas for the production SQLite profile, in the order they are applied"""
+    return [
+        ('journal_mode', 'WAL'),  # Readers no longer block on the writer
+        ('synchronous', 'NORMAL'),  # Safe with WAL; fsync at checkpoints only
+        ('busy_timeout', config['SQLITE_BUSY_TIMEOUT']),
+        ('cache_size', config['SQLITE_CACHE_SIZE']),
+        ('mmap_size', config['SQLITE_MMAP_SIZE']),
+    ]
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """Run the pragmas on every new DBAPI connection of the engine"""
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+def configure_database(app):
+    if app.config.get('DATABASE_PROFILE') != 'production':
+        return
+    with app.app_context():
+        for engine in db.engines.values():  # Primary and replica
+            if engine.dialect.name == 'sqlite':
+                apply_sqlite_pragmas(engine, sqlite_pragmas(app.config))
+
 def configure_logging(app):
     # Requirement 7.2: Logging
     app.logger.setLevel(logging.INFO)
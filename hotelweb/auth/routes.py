@@ -3,13 +3,14 @@ from flask_login import login_user, logout_user, login_required, current_user
 from email_validator import validate_email, EmailNotValidError
 from ..models import User
 from ..extensions import db
+from ..main.stats import record_user_created
 from ..utils.security import (
     validate_email as validate_email_format,
     validate_username,
     validate_password,
     sanitize_string,
-    check_login_attempts,
-    record_login_attempt,
+    check_login_allowed,
+    record_login_result,
     get_client_ip,
     generate_csrf_token
 )
@@ -30,11 +31,8 @@ def login():
         password = request.form.get('password', '')
         client_ip = get_client_ip()
         
-        # Use email as identifier for login attempts (more secure than IP)
-        identifier = email if email else client_ip
-        
-        # Check login attempts
-        allowed, remaining, lockout_until = check_login_attempts(identifier, max_attempts=5, lockout_duration=900)
+        # Check login attempts (per account and per IP)
+        allowed, remaining, lockout_until = check_login_allowed(email, client_ip)
         if not allowed:
             if lockout_until:
                 from datetime import datetime
@@ -50,20 +48,20 @@ def login():
         
         # Validate credentials
         if not email or not password:
-            record_login_attempt(identifier, False)
+            record_login_result(email, client_ip, False)
             flash('Email and password are required.', 'danger')
             return render_template('auth/login.html', email=email, csrf_token=csrf_token)
         
         # Validate email format
         is_valid, error_msg = validate_email_format(email)
         if not is_valid:
-            record_login_attempt(identifier, False)
+            record_login_result(email, client_ip, False)
             flash(error_msg or 'Invalid email format.', 'danger')
             return render_template('auth/login.html', email=email, csrf_token=csrf_token)
         
         # Validate password (basic check - not empty)
         if len(password) < 1:
-            record_login_attempt(identifier, False)
+            record_login_result(email, client_ip, False)
             flash('Password is required.', 'danger')
             return render_template('auth/login.html', email=email, csrf_token=csrf_token)
         
@@ -81,14 +79,14 @@ def login():
         
         if user and password_valid:
             # Login successful
-            record_login_attempt(identifier, True)
+            record_login_result(email, client_ip, True)
             login_user(user)
             next_page = request.args.get('next')
             flash('You have been logged in successfully.', 'success')
             return redirect(next_page) if next_page else redirect(url_for('main.index'))
         else:
             # Login failed - don't reveal if email exists
-            record_login_attempt(identifier, False)
+            record_login_result(email, client_ip, False)
             flash('Invalid email or password. Please try again.', 'danger')
             if remaining and remaining < 5:
                 flash(f'Warning: {remaining} attempt(s) remaining before account lockout.', 'warning')
@@ -152,6 +150,7 @@ def register():
         user = User(username=username, email=email, role='customer')
         user.set_password(password)
         db.session.add(user)
+        record_user_created('customer')
         db.session.commit()
         
         flash('Account created successfully! You can now login.', 'success')
@@ -20,4 +20,158 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(os.path.abspath(os.path.dirname(__file__)), 'instance', 'hotel.db')
     
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Database profile: 'production' applies the SQLite pragmas below to every
+    # new connection (WAL journal, synchronous=NORMAL, busy timeout, page cache
+    # and mmap sizes); see configure_database() in app.py
+    DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'development')
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # Milliseconds
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -65536))  # Negative = KiB, i.e. 64 MiB
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 268435456))  # Bytes, 256 MiB
+
+    # Connection pool; pool size and overflow only apply when set
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes'),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),  # Seconds
+    }
+    if os.environ.get('DB_POOL_SIZE'):
+        SQLALCHEMY_ENGINE_OPTIONS['pool_size'] = int(os.environ['DB_POOL_SIZE'])
+    if os.environ.get('DB_MAX_OVERFLOW'):
+        SQLALCHEMY_ENGINE_OPTIONS['max_overflow'] = int(os.environ['DB_MAX_OVERFLOW'])
+
+    # Read replica: when REPLICA_DATABASE_URL is set, views marked @replica_reads
+    # query it instead of the primary (utils/db_routing.py); a client that wrote
+    # reads from the primary for the next REPLICA_STICKY_SECONDS
+    SQLALCHEMY_BINDS = {}
+    if os.environ.get('REPLICA_DATABASE_URL'):
+        SQLALCHEMY_BINDS['replica'] = os.environ['REPLICA_DATABASE_URL']
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+
+    # Per-request SQL instrumentation (utils/sql_instrumentation.py): adds
+    # Server-Timing headers and logs requests over the query/time budgets or
+    # running one statement shape SQL_N_PLUS_ONE_THRESHOLD+ times
+    SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', 'false').lower() in ('1', 'true', 'yes')
+    SQL_BUDGET_QUERIES = int(os.environ.get('SQL_BUDGET_QUERIES', 50))
+    SQL_BUDGET_MS = float(os.environ.get('SQL_BUDGET_MS', 200))
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.environ.get('SQL_N_PLUS_ONE_THRESHOLD', 5))
+    SQL_SLOWEST_COUNT = int(os.environ.get('SQL_SLOWEST_COUNT', 3))
+
+    # Queries built with a loader profile (main/loaders.py) raise on any relationship
+    # the profile doesn't plan for; used by scripts/tools/check_lazy_loads.py
+    LOADER_RAISELOAD = os.environ.get('LOADER_RAISELOAD', 'false').lower() in ('1', 'true', 'yes')
+
+    # Metrics at /metrics (utils/metrics.py), for admins and scrapers sending
+    # "Authorization: Bearer <METRICS_TOKEN>". METRICS_ALLOW_LOCALHOST also lets in
+    # loopback requests: keep it off behind a reverse proxy on the same host.
+    # Workers write snapshots to METRICS_DIR (default: instance/metrics) every
+    # METRICS_FLUSH_INTERVAL seconds; /metrics sums them
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    METRICS_DIR = os.environ.get('METRICS_DIR')
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 10))
+    METRICS_RETENTION = int(os.environ.get('METRICS_RETENTION', 86400))  # Seconds to keep stopped workers' files
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    METRICS_ALLOW_LOCALHOST = os.environ.get('METRICS_ALLOW_LOCALHOST', 'false').lower() in ('1', 'true', 'yes')
+
+    # On-demand profiling (utils/profiling.py): requests with the header
+    # "X-Profile: <PROFILE_SECRET>" or an admin's ?_profile=1 run under cProfile;
+    # PROFILE_SAMPLE_RATE of all requests get a low-overhead stack sample.
+    # Results are saved to PROFILE_DIR (default: instance/profiles)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    PROFILE_SECRET = os.environ.get('PROFILE_SECRET')
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))  # 0.01 = 1% of requests
+    PROFILE_SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', 0.005))  # Seconds
+    PROFILE_DIR = os.environ.get('PROFILE_DIR')
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 200))
+
+    # Traffic capture (utils/request_capture.py): sanitized request descriptors
+    # written as JSON lines to REQUEST_CAPTURE_DIR (default: instance/capture),
+    # one rotating file per worker, for scripts/tools/replay_requests.py
+    REQUEST_CAPTURE = os.environ.get('REQUEST_CAPTURE', 'false').lower() in ('1', 'true', 'yes')
+    REQUEST_CAPTURE_DIR = os.environ.get('REQUEST_CAPTURE_DIR')
+    REQUEST_CAPTURE_SAMPLE_RATE = float(os.environ.get('REQUEST_CAPTURE_SAMPLE_RATE', 1.0))
+    REQUEST_CAPTURE_MAX_BYTES = int(os.environ.get('REQUEST_CAPTURE_MAX_BYTES', 50 * 1024 * 1024))
+    REQUEST_CAPTURE_BACKUPS = int(os.environ.get('REQUEST_CAPTURE_BACKUPS', 5))
+
+    # Login rate limiting (utils/login_throttle.py): failures per account and per
+    # IP over a sliding window; LOGIN_ATTEMPT_STORE is 'memory' (one worker) or
+    # 'database' (shared by all workers through the login_attempt table)
+    LOGIN_ATTEMPT_STORE = os.environ.get('LOGIN_ATTEMPT_STORE', 'memory')
+    LOGIN_ATTEMPT_MAX_ENTRIES = int(os.environ.get('LOGIN_ATTEMPT_MAX_ENTRIES', 10000))  # Memory store size bound
+    LOGIN_MAX_ATTEMPTS = int(os.environ.get('LOGIN_MAX_ATTEMPTS', 5))  # Per account
+    LOGIN_IP_MAX_ATTEMPTS = int(os.environ.get('LOGIN_IP_MAX_ATTEMPTS', 20))  # Per client IP
+    LOGIN_WINDOW_SECONDS = int(os.environ.get('LOGIN_WINDOW_SECONDS', 900))
+    LOGIN_LOCKOUT_SECONDS = int(os.environ.get('LOGIN_LOCKOUT_SECONDS', 900))
+
+    # Number of reverse proxies in front of the app (e.g. 1 for nginx -> gunicorn).
+    # Their X-Forwarded-For/-Proto/-Host entries are applied with ProxyFix, so
+    # request.remote_addr is the real client; client-sent headers are never trusted
+    TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 0))
+
+    # Admission control (utils/admission.py) for routes marked @cost_class:
+    # per-client token buckets (requests per second, burst) answered with 429,
+    # and a per-worker cap on concurrent requests answered with 503
+    ADMISSION_CONTROL = os.environ.get('ADMISSION_CONTROL', 'true').lower() in ('1', 'true', 'yes')
+    ADMISSION_RATE_LIMITS = {
+        'search': (2, 20),
+        'booking': (1, 10),
+        'account': (2, 20),
+        'admin': (5, 50),
+    }
+    ADMISSION_CONCURRENCY = {
+        'search': int(os.environ.get('ADMISSION_SEARCH_CONCURRENCY', 8)),
+        'booking': int(os.environ.get('ADMISSION_BOOKING_CONCURRENCY', 8)),
+        'account': int(os.environ.get('ADMISSION_ACCOUNT_CONCURRENCY', 8)),
+        'admin': int(os.environ.get('ADMISSION_ADMIN_CONCURRENCY', 2)),
+    }
+    ADMISSION_MAX_CLIENTS = int(os.environ.get('ADMISSION_MAX_CLIENTS', 10000))  # Token buckets kept
+
+    # Static assets: use the fingerprinted bundles in static/dist when
+    # scripts/tools/build_assets.py has built them (utils/assets.py)
+    STATIC_ASSETS_MANIFEST = os.environ.get('STATIC_ASSETS_MANIFEST', 'true').lower() in ('1', 'true', 'yes')
+
+    # Response compression (utils/compression.py): brotli when the package is
+    # installed and accepted, else gzip, for text responses of COMPRESSION_MIN_SIZE bytes or more
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))  # Bytes
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4))
+    COMPRESSION_MIMETYPES = [
+        'text/html', 'text/css', 'text/plain', 'text/csv', 'text/xml', 'text/javascript',
+        'application/javascript', 'application/json', 'application/xml', 'image/svg+xml',
+    ]
+
+    # Long list pages (search, account, my stays, admin and staff lists) are
+    # rendered while they are sent, in chunks of STREAM_BUFFER_SIZE bytes (utils/streaming.py)
+    STREAM_TEMPLATES = os.environ.get('STREAM_TEMPLATES', 'true').lower() in ('1', 'true', 'yes')
+    STREAM_BUFFER_SIZE = int(os.environ.get('STREAM_BUFFER_SIZE', 8192))
+
+    # Responsive images: variants built by scripts/tools/build_image_variants.py,
+    # and in the background for image URLs saved in the staff/admin forms (utils/images.py)
+    IMAGE_VARIANTS_ON_SAVE = os.environ.get('IMAGE_VARIANTS_ON_SAVE', 'true').lower() in ('1', 'true', 'yes')
+    IMAGE_MANIFEST_CHECK_SECONDS = int(os.environ.get('IMAGE_MANIFEST_CHECK_SECONDS', 30))  # Re-read by other workers
+
+    # Loyalty points expiry: lots older than this many days are written off by
+    # scripts/tools/expire_points.py, processed in chunks of POINTS_EXPIRY_BATCH_SIZE lots
+    POINTS_EXPIRY_DAYS = int(os.environ.get('POINTS_EXPIRY_DAYS', 730))
+    POINTS_EXPIRY_BATCH_SIZE = int(os.environ.get('POINTS_EXPIRY_BATCH_SIZE', 5000))
+
+    # Cross-worker cache invalidation: minimum seconds between polls of the
+    # cache_event table (0 = every request) and how long events are kept
+    CACHE_BUS_POLL_INTERVAL = float(os.environ.get('CACHE_BUS_POLL_INTERVAL', 0))
+    CACHE_BUS_RETENTION = int(os.environ.get('CACHE_BUS_RETENTION', 3600))
+
+    # Anonymous catalog pages (main/page_cache.py): rendered pages are served
+    # for PAGE_CACHE_TTL seconds (also the public max-age), then for up to
+    # PAGE_CACHE_STALE_TTL more while one request revalidates them
+    PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    PAGE_CACHE_TTL = int(os.environ.get('PAGE_CACHE_TTL', 60))
+    PAGE_CACHE_STALE_TTL = int(os.environ.get('PAGE_CACHE_STALE_TTL', 300))
+    PAGE_CACHE_MAX_ENTRIES = int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', 500))
+
+    # Cached hotel card fragments (main/fragments.py), least recently used evicted first
+    FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', 2000))
+
+    # Staff hotel assignments (main/permissions.py) are cached per worker for this
+    # many seconds; admin changes drop them right away through the cache bus (0 = no cache)
+    STAFF_PERMISSION_TTL = int(os.environ.get('STAFF_PERMISSION_TTL', 60))
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Fragment cache for hotel card markup.
+
+Hotel cards (image, name, address, brand badge, stars, review score) appear on
+the search, destinations, city and brand pages and in the hotel page
+recommendations.  Rendering one touches ``hotel.brand`` and ``hotel.reviews``,
+so a page of cards costs a lazy load per card.  ``hotel_card_fragment``
+renders a part of a card once per (hotel, content version, language) and
+serves the markup from memory afterwards; a hit reads only columns already
+loaded on the hotel row.
+
+Nothing user-specific goes into a fragment: the favorite toggle is rendered
+per request around it (see templates/main/_hotel_cards.html).  A changed hotel
+gets a new content_version, so its old fragments are simply never looked up
+again and age out of the LRU.
+"""
+import threading
+from collections import OrderedDict
+from flask import current_app, render_template, session
+from markupsafe import Markup
+from .language import get_current_language
+from .refdata import get_reference_data
+from ..utils.images import image_variants
+
+FRAGMENT_TEMPLATE = 'main/_hotel_card_fragment.html'
+
+_lock = threading.Lock()
+_fragments = OrderedDict()
+_stats = {'hits': 0, 'misses': 0}
+
+def hotel_card_fragment(hotel, part, **options):
+    """Cached markup for one part of a hotel card ('image', 'body' or 'search_rating')"""
+    key = (
+        hotel.id,
+        hotel.content_version,
+        get_current_language(session),
+        get_reference_data().fingerprint,  # Brand name and colour in the badge
+        image_variants(hotel.image_url) is not None,  # Variants built after the card was cached
+        part,
+        tuple(sorted(options.items()))
+    )
+    with _lock:
+        html = _fragments.get(key)
+        if html is not None:
+            _fragments.move_to_end(key)
+            _stats['hits'] += 1
+            return html
+
+    html = Markup(render_template(FRAGMENT_TEMPLATE, hotel=hotel, part=part, **options))
+    with _lock:
+        _stats['misses'] += 1
+        _fragments[key] = html
+        while len(_fragments) > current_app.config.get('FRAGMENT_CACHE_MAX_ENTRIES', 2000):
+            _fragments.popitem(last=False)
+    return html
+
+def fragment_cache_stats():
+    with _lock:
+        return dict(_stats, entries=len(_fragments))
@@ -0,0 +1,132 @@
+"""
+Cross-worker cache invalidation bus.
+
+Every worker keeps its own in-process caches, so a write handled by one
+worker must reach the others.  Write paths publish a typed event with
+``publish_invalidation(kind, key)``; the event is inserted into the
+``cache_event`` table in the writer's own transaction, so it exists only if
+the write commits.  Each worker polls the table once per request (an indexed
+``id > last_seen`` range scan that is normally empty) and hands new events to
+the handlers registered for that kind with ``subscribe``.
+
+The publishing worker also dispatches its events right after commit, so its
+own caches never lag.  Handlers must be idempotent: they may see the same
+event twice.  A worker that has not polled for longer than the retention
+window may have missed pruned events, so it flushes every subscriber instead.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event, select, delete, func
+from sqlalchemy.orm import Session
+from ..extensions import db
+from ..models import CacheEvent
+
+EVENT_KINDS = {
+    'refdata',  # Brands, amenities or hotel cities changed (key unused)
+    'hotel',    # A hotel, its room types or prices changed (key: hotel id)
+    'staff',    # A user's role or assigned hotels changed (key: user id)
+}
+
+logger = logging.getLogger(__name__)
+
+_subscribers = {kind: [] for kind in EVENT_KINDS}
+_lock = threading.Lock()
+_state = {'last_seen': None, 'last_poll': 0.0, 'last_prune': 0.0}
+_stats = {'polls': 0, 'events': 0, 'published': 0, 'full_flushes': 0}
+
+def subscribe(kind, handler):
+    """Register handler(key) for an event kind; key is None for 'everything'"""
+    if kind not in EVENT_KINDS:
+        raise ValueError(f'Unknown cache event kind: {kind}')
+    _subscribers[kind].append(handler)
+
+def publish_invalidation(kind, key=None, session=None):
+    """
+    Record an invalidation event in the current transaction.
+    Nothing is published if the transaction rolls back.
+    """
+    if kind not in EVENT_KINDS:
+        raise ValueError(f'Unknown cache event kind: {kind}')
+    session = session or db.session
+    key = str(key) if key is not None else None
+    pending = session.info.setdefault('cache_events', [])
+    if (kind, key) in pending:
+        return
+    pending.append((kind, key))
+    session.add(CacheEvent(kind=kind, key=key))
+
+def _dispatch(kind, key):
+    for handler in _subscribers.get(kind, ()):
+        try:
+            handler(key)
+        except Exception:
+            logger.exception('Cache invalidation handler failed for %s:%s', kind, key)
+
+def _flush_all():
+    _stats['full_flushes'] += 1
+    for kind in EVENT_KINDS:
+        _dispatch(kind, None)
+
+def _latest_event_id():
+    return db.session.execute(select(func.max(CacheEvent.id))).scalar() or 0
+
+def start_polling():
+    """Start from the newest event; call once per worker after caches are built"""
+    with _lock:
+        _state['last_seen'] = _latest_event_id()
+        _state['last_poll'] = time.monotonic()
+
+def poll_invalidations():
+    """Apply events published by other workers since the last poll"""
+    config = current_app.config
+    now = time.monotonic()
+    if now - _state['last_poll'] < config.get('CACHE_BUS_POLL_INTERVAL', 0):
+        return 0
+
+    with _lock:
+        retention = config.get('CACHE_BUS_RETENTION', 3600)
+        if _state['last_seen'] is None or now - _state['last_poll'] > retention / 2:
+            # Events we have not seen may already be pruned
+            _state['last_seen'] = _latest_event_id()
+            _state['last_poll'] = now
+            _flush_all()
+            return 0
+
+        rows = db.session.execute(
+            select(CacheEvent.id, CacheEvent.kind, CacheEvent.key)
+            .where(CacheEvent.id > _state['last_seen'])
+            .order_by(CacheEvent.id)
+        ).all()
+        _state['last_poll'] = now
+        _stats['polls'] += 1
+        for event_id, kind, key in rows:
+            _dispatch(kind, key)
+            _state['last_seen'] = event_id
+        _stats['events'] += len(rows)
+
+        if now - _state['last_prune'] > retention:
+            _state['last_prune'] = now
+            cutoff = datetime.utcnow() - timedelta(seconds=retention)
+            db.session.execute(delete(CacheEvent).where(CacheEvent.created_at < cutoff))
+            db.session.commit()
+        return len(rows)
+
+def invalidation_bus_stats():
+    return dict(_stats, last_seen=_state['last_seen'])
+
+@event.listens_for(Session, 'after_commit')
+def _dispatch_local_events(session):
+    pending = session.info.pop('cache_events', None)
+    if pending:
+        _stats['published'] += len(pending)
+        for kind, key in pending:
+            _dispatch(kind, key)
+
+@event.listens_for(Session, 'after_transaction_end')
+def _discard_local_events(session, transaction):
+    # Runs after after_commit; anything still pending here was rolled back
+    if transaction.parent is None:
+        session.info.pop('cache_events', None)
@@ -0,0 +1,83 @@
+"""
+Named eager-loading profiles.
+
+Each list page walks the same relationships for every row it shows
+(``booking.room_type.hotel``, ``hotel.brand``, ``booking.user``...), and
+with the default lazy loading each walk is one query per row.  A profile
+names the relationships one use case needs and how to load them:
+
+    Booking.query.filter_by(user_id=user_id).options(*loader_profile('booking_list'))
+
+  - 'joined'    many-to-one, loaded in the same query with a LEFT OUTER JOIN
+  - 'selectin'  collections, loaded with one extra ``IN`` query per relationship
+  - 'lazy'      deliberately left lazy, such as ``hotel.reviews`` behind the
+                hotel card fragment cache, which only a cache miss reads
+
+With LOADER_RAISELOAD=true every other relationship of an object loaded
+through a profile raises on access instead of lazy loading.
+scripts/tools/check_lazy_loads.py walks the hot pages in that mode, so a
+template that starts using a relationship its profile doesn't list fails the
+check instead of quietly adding a query per row.
+"""
+from flask import current_app
+from sqlalchemy.orm import joinedload, lazyload, raiseload, selectinload
+from ..models import Booking, ContactMessage, FavoriteHotel, Hotel, Review, RoomType
+
+STRATEGIES = {'joined': joinedload, 'selectin': selectinload, 'lazy': lazyload}
+
+# Profile name -> (root model, {relationship: strategy or (strategy, {nested relationships})})
+PROFILES = {
+    # Hotel cards (destinations, city, brand pages): the badge needs the brand
+    'hotel_card': (Hotel, {'brand': 'joined', 'reviews': 'lazy'}),
+    # Search results: room types with their hotel, brand and amenities
+    'search': (RoomType, {
+        'hotel': ('joined', {'brand': 'joined', 'reviews': 'lazy'}),
+        'amenities': 'selectin',
+    }),
+    # Hotel page: review authors and each room type's amenity count
+    'hotel_detail': (Hotel, {
+        'brand': 'joined',
+        'reviews': ('selectin', {'author': 'joined'}),
+        'room_types': ('selectin', {'amenities': 'selectin'}),
+    }),
+    # Hotel editors (staff and admin): room rows with their amenity checkboxes
+    'room_type_edit': (RoomType, {'amenities': 'selectin'}),
+    # A guest's own bookings (My Stays, Account)
+    'booking_list': (Booking, {'room_type': ('joined', {'hotel': 'joined'})}),
+    # Staff and admin booking tables, which also show the guest
+    'booking_admin_list': (Booking, {'user': 'joined', 'room_type': ('joined', {'hotel': 'joined'})}),
+    # Favorite hotel cards on My Stays
+    'favorite_hotels': (FavoriteHotel, {
+        'hotel': ('joined', {'brand': 'joined', 'reviews': 'selectin', 'room_types': 'selectin'}),
+    }),
+    'hotel_admin_list': (Hotel, {'brand': 'joined'}),
+    'review_list': (Review, {'author': 'joined'}),
+    'message_list': (ContactMessage, {'user': 'joined'}),
+}
+
+def _options(model, spec, parent, raise_others):
+    options = []
+    for name, value in spec.items():
+        strategy, nested = value if isinstance(value, tuple) else (value, {})
+        attribute = getattr(model, name)
+        if parent is None:
+            load = STRATEGIES[strategy](attribute)
+        else:
+            load = getattr(parent, STRATEGIES[strategy].__name__)(attribute)
+        options.append(load)
+        if strategy == 'lazy':
+            continue
+        related = attribute.property.mapper.class_
+        if raise_others:
+            options.append(load.raiseload('*'))
+        options.extend(_options(related, nested, load, raise_others))
+    return options
+
+def loader_profile(name):
+    """Loader options for a named profile, to pass to Query.options()"""
+    model, spec = PROFILES[name]
+    raise_others = current_app.config.get('LOADER_RAISELOAD', False)
+    options = _options(model, spec, None, raise_others)
+    if raise_others:
+        options.append(raiseload('*'))
+    return options
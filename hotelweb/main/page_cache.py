@@ -0,0 +1,231 @@
+"""
+Conditional HTTP caching and a rendered-page cache for anonymous catalog pages
+(brands, brand detail, destinations, city, hotel and room type pages).
+
+Each cached view declares a validator that returns the hotels the page shows
+plus any extra state it depends on.  From their ``content_version`` and
+``content_updated_at`` columns we derive an ETag and Last-Modified, which are
+identical in every worker, so a proxy, CDN or browser can revalidate with
+If-None-Match / If-Modified-Since and get a 304 without the page being rendered.
+
+Rendered bodies are also kept per worker.  An entry is served without touching
+the database for ``PAGE_CACHE_TTL`` seconds; for ``PAGE_CACHE_STALE_TTL``
+seconds after that it is still served while a single request revalidates it
+(and re-renders only if the validators changed).  'hotel' and 'refdata' events
+on the invalidation bus drop affected entries in every worker right away.
+
+Write paths call ``mark_hotel_changed`` so the version moves and the bus event
+is published in the same transaction.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime, date
+from functools import wraps
+from flask import current_app, request, session, make_response, Response
+from flask_login import current_user
+from sqlalchemy import update, select, func, or_
+from ..extensions import db
+from ..models import Hotel, RoomType, Booking
+from .invalidation import subscribe, publish_invalidation
+from .language import get_current_language
+from .refdata import get_reference_data
+
+CachedPage = namedtuple('CachedPage', ['body', 'mimetype', 'etag', 'last_modified', 'hotel_ids', 'stored_at'])
+
+_lock = threading.Lock()
+_pages = OrderedDict()
+_refreshing = set()
+_stats = {'hits': 0, 'stale_hits': 0, 'revalidated': 0, 'not_modified': 0, 'misses': 0, 'bypassed': 0}
+
+def mark_hotel_changed(hotel_id):
+    """Bump a hotel's content version and publish a 'hotel' event; call before commit"""
+    db.session.execute(
+        update(Hotel).where(Hotel.id == hotel_id).values(
+            content_version=func.coalesce(Hotel.content_version, 0) + 1,
+            content_updated_at=datetime.utcnow()
+        ),
+        execution_options={'synchronize_session': False}
+    )
+    publish_invalidation('hotel', hotel_id)
+
+def _drop_hotel_pages(key):
+    with _lock:
+        if key is None:
+            _pages.clear()
+            return
+        hotel_id = int(key)
+        for page_key in [k for k, page in _pages.items() if hotel_id in page.hotel_ids]:
+            del _pages[page_key]
+
+def _drop_all_pages(key):
+    with _lock:
+        _pages.clear()
+
+subscribe('hotel', _drop_hotel_pages)
+subscribe('refdata', _drop_all_pages)  # Every page renders the brand list in its footer
+
+def page_cache_stats():
+    with _lock:
+        return dict(_stats, entries=len(_pages))
+
+# Validators: each returns (hotel rows, extra) or None when the view should
+# run uncached (e.g. to produce its 404).  Hotel rows are
+# (id, content_version, content_updated_at) tuples.
+
+def _hotel_versions(*criteria):
+    return db.session.execute(
+        select(Hotel.id, Hotel.content_version, Hotel.content_updated_at)
+        .where(*criteria).order_by(Hotel.id)
+    ).all()
+
+def brands_validator():
+    return [], None
+
+def brand_validator(brand_id):
+    brand = get_reference_data().brands_by_id.get(brand_id)
+    if brand is None:
+        return None
+    return _hotel_versions(Hotel.brand_id == brand_id), brand
+
+def destinations_validator():
+    return _hotel_versions(), None
+
+def city_validator(city_name):
+    return _hotel_versions(Hotel.city == city_name), None
+
+def hotel_validator(hotel_id):
+    hotel = db.session.execute(select(Hotel.city, Hotel.brand_id).where(Hotel.id == hotel_id)).first()
+    if hotel is None:
+        return None
+    # Recommendations come from the same city or brand
+    return _hotel_versions(or_(Hotel.id == hotel_id, Hotel.city == hotel.city, Hotel.brand_id == hotel.brand_id)), None
+
+def roomtype_validator(roomtype_id):
+    hotel_id = db.session.execute(select(RoomType.hotel_id).where(RoomType.id == roomtype_id)).scalar()
+    if hotel_id is None:
+        return None
+    # The page shows today's availability, which moves with bookings
+    bookings = db.session.execute(
+        select(func.count(Booking.id), func.max(Booking.id))
+        .where(Booking.roomtype_id == roomtype_id, Booking.status == 'CONFIRMED')
+    ).one()
+    return _hotel_versions(Hotel.id == hotel_id), (tuple(bookings), date.today().isoformat())
+
+def has_search_dates(**kwargs):
+    """Hotel pages reached from a search show live availability for the searched dates"""
+    return bool(request.args.get('check_in') or 'check_in=' in (request.referrer or ''))
+
+def _cacheable_request():
+    return (
+        current_app.config.get('PAGE_CACHE_ENABLED', True)
+        and request.method in ('GET', 'HEAD')
+        and not current_user.is_authenticated
+        and '_flashes' not in session
+        and not session.get('show_celebration_modal')
+    )
+
+def _page_key(vary_referrer):
+    return (
+        request.path,
+        tuple(sorted(request.args.items(multi=True))),
+        get_current_language(session),
+        (request.referrer or '') if vary_referrer else ''
+    )
+
+def _validators(page_key, hotel_rows, extra, with_last_modified):
+    seed = repr((page_key, get_reference_data().fingerprint, [tuple(row[:2]) for row in hotel_rows], extra))
+    etag = hashlib.sha1(seed.encode()).hexdigest()[:20]
+    last_modified = None
+    if with_last_modified:
+        last_modified = max((row[2] for row in hotel_rows if row[2]), default=None)
+    return etag, last_modified, frozenset(row[0] for row in hotel_rows)
+
+def _finish(response, etag, last_modified, vary_referrer):
+    config = current_app.config
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = config.get('PAGE_CACHE_TTL', 60)
+    response.headers['Cache-Control'] += f", stale-while-revalidate={config.get('PAGE_CACHE_STALE_TTL', 300)}"
+    response.vary.add('Cookie')  # Language lives in the session cookie
+    if vary_referrer:
+        response.vary.add('Referer')  # Breadcrumbs follow the referring page
+    return response.make_conditional(request)
+
+def _serve(page, vary_referrer):
+    response = Response(page.body, mimetype=page.mimetype)
+    return _finish(response, page.etag, page.last_modified, vary_referrer)
+
+def _store(page_key, page):
+    with _lock:
+        _pages[page_key] = page
+        _pages.move_to_end(page_key)
+        while len(_pages) > current_app.config.get('PAGE_CACHE_MAX_ENTRIES', 500):
+            _pages.popitem(last=False)
+
+def cached_page(validator, vary_referrer=False, bypass=None, last_modified=True):
+    """
+    Serve an anonymous catalog view from the page cache with conditional headers.
+    Pass last_modified=False when the page depends on state without a
+    timestamp (availability), so clients revalidate by ETag only.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not _cacheable_request() or (bypass and bypass(**kwargs)):
+                _stats['bypassed'] += 1
+                return view(*args, **kwargs)
+
+            config = current_app.config
+            page_key = _page_key(vary_referrer)
+            now = time.monotonic()
+            ttl = config.get('PAGE_CACHE_TTL', 60)
+            with _lock:
+                page = _pages.get(page_key)
+                age = now - page.stored_at if page else None
+                if page and age < ttl:
+                    fresh = 'hits'
+                elif page and age < ttl + config.get('PAGE_CACHE_STALE_TTL', 300) and page_key in _refreshing:
+                    fresh = 'stale_hits'  # Another request is revalidating this page
+                else:
+                    fresh = None
+                    _refreshing.add(page_key)
+            if fresh:
+                _stats[fresh] += 1
+                return _serve(page, vary_referrer)
+
+            try:
+                validated = validator(**kwargs)
+                if validated is None:
+                    _stats['bypassed'] += 1
+                    return view(*args, **kwargs)
+                etag, modified, hotel_ids = _validators(page_key, *validated, last_modified)
+
+                if page and page.etag == etag:
+                    _stats['revalidated'] += 1
+                    page = page._replace(stored_at=now)
+                    _store(page_key, page)
+                    return _serve(page, vary_referrer)
+
+                # Weak comparison: compression (utils/compression.py) sends W/"..."
+                if request.if_none_match.contains_weak(etag):
+                    # The client already has this version; skip rendering
+                    _stats['not_modified'] += 1
+                    return _finish(Response(status=304), etag, modified, vary_referrer)
+
+                _stats['misses'] += 1
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or session.modified:
+                    return response
+                _store(page_key, CachedPage(
+                    response.get_data(), response.mimetype, etag, modified, hotel_ids, now
+                ))
+                return _finish(response, etag, modified, vary_referrer)
+            finally:
+                with _lock:
+                    _refreshing.discard(page_key)
+        return wrapper
+    return decorator
@@ -0,0 +1,92 @@
+"""
+Cache of which hotels each staff member is assigned to.
+
+Every staff page and action checks the signed-in staff member's hotels, often
+more than once per request (the access check, then the view's own hotel
+filter).  ``assigned_hotel_ids`` answers from, in order:
+
+  - the request (``flask.g``), so one request looks the set up once;
+  - a per-worker cache of frozensets keyed by user id, kept for
+    ``STAFF_PERMISSION_TTL`` seconds;
+  - one query on ``staff_hotel``.
+
+``can_access_hotel`` is then a set membership test.  Admin writes that change
+a user's role or assignments call ``mark_staff_changed`` before commit, which
+publishes a 'staff' event on the invalidation bus (see invalidation.py), so
+every worker drops that user's entry; the TTL only bounds how long a missed
+event could leave an entry stale.
+"""
+import threading
+import time
+from flask import current_app, g
+from flask_login import current_user
+from sqlalchemy import select
+from ..extensions import db
+from ..models import staff_hotel
+from .invalidation import subscribe, publish_invalidation
+
+_lock = threading.Lock()
+_entries = {}  # user id -> (expires at, frozenset of hotel ids)
+_version = 0
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+def _load_hotel_ids(user_id):
+    return frozenset(db.session.execute(
+        select(staff_hotel.c.hotel_id).where(staff_hotel.c.user_id == user_id)
+    ).scalars())
+
+def _cached_hotel_ids(user_id):
+    now = time.monotonic()
+    entry = _entries.get(user_id)
+    if entry is not None and entry[0] > now:
+        _stats['hits'] += 1
+        return entry[1]
+
+    _stats['misses'] += 1
+    version = _version
+    hotel_ids = _load_hotel_ids(user_id)
+    ttl = current_app.config.get('STAFF_PERMISSION_TTL', 60)
+    with _lock:
+        # An invalidation while we were loading means the set may already be stale
+        if ttl > 0 and version == _version:
+            _entries[user_id] = (now + ttl, hotel_ids)
+    return hotel_ids
+
+def assigned_hotel_ids(user=None):
+    """Frozenset of the hotel ids a staff member (default: the current user) is assigned to"""
+    user = user if user is not None else current_user
+    memo = g.setdefault('_assigned_hotel_ids', {})
+    if user.id not in memo:
+        memo[user.id] = _cached_hotel_ids(user.id)
+    return memo[user.id]
+
+def can_access_hotel(hotel_id, user=None):
+    """Admins can manage every hotel, staff the ones they are assigned to"""
+    user = user if user is not None else current_user
+    if user.role == 'admin':
+        return True
+    return hotel_id in assigned_hotel_ids(user)
+
+def mark_staff_changed(user_id):
+    """Publish a 'staff' event for a user whose role or hotels changed; call before commit"""
+    publish_invalidation('staff', user_id)
+
+def _drop_entries(key):
+    global _version
+    with _lock:
+        _version += 1
+        _stats['invalidations'] += 1
+        if key is None:
+            _entries.clear()
+        else:
+            _entries.pop(int(key), None)
+    # The publishing request sees the change too
+    memo = g.get('_assigned_hotel_ids') if g else None
+    if memo:
+        memo.clear()
+
+def staff_permission_stats():
+    with _lock:
+        return dict(_stats, entries=len(_entries))
+
+subscribe('staff', _drop_entries)
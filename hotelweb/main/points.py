@@ -0,0 +1,154 @@
+"""
+Points lots: earned points are tracked as dated lots so they can be
+redeemed oldest-first (FIFO) and expired by age.
+
+Every credit to ``User.points`` (EARNED, BONUS, REFUNDED) opens a lot, every
+redemption drains lots oldest-first, and ``expire_points_lots`` writes off
+whatever is left in lots older than the configured age.  The expiry job works
+entirely in set-based SQL, one chunk of lots per transaction, so it never
+loads lots or transactions into Python objects.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, update, func, case, and_, literal
+from ..extensions import db
+from ..models import User, PointsTransaction, PointsLot
+
+def credit_points_lot(transaction, earned_at=None):
+    """
+    Open a lot for a positive points transaction.
+    Call after the transaction has been added to the session; the lot is
+    linked through the relationship so no flush is needed.
+    """
+    if not transaction.points or transaction.points <= 0:
+        return None
+    lot = PointsLot(
+        user_id=transaction.user_id,
+        transaction=transaction,
+        points=transaction.points,
+        remaining=transaction.points,
+        earned_at=earned_at or transaction.created_at or datetime.utcnow()
+    )
+    db.session.add(lot)
+    return lot
+
+def consume_points_lots(user_id, points):
+    """
+    Drain ``points`` from the user's open lots, oldest first.
+    Returns the number of points actually taken from lots; balances that
+    predate lot tracking may not be fully covered (see backfill_points_lots).
+    """
+    to_consume = points
+    open_lots = db.session.execute(
+        select(PointsLot.id, PointsLot.remaining)
+        .where(PointsLot.user_id == user_id, PointsLot.remaining > 0)
+        .order_by(PointsLot.earned_at, PointsLot.id)
+    )
+    for lot_id, remaining in open_lots.all():
+        if to_consume <= 0:
+            break
+        taken = min(remaining, to_consume)
+        db.session.execute(
+            update(PointsLot)
+            .where(PointsLot.id == lot_id)
+            .values(remaining=PointsLot.remaining - taken)
+        )
+        to_consume -= taken
+    return points - to_consume
+
+def backfill_points_lots(earned_at=None):
+    """
+    Open a single lot for every user whose balance is not covered by lots
+    (balances earned before lot tracking existed).  The lot is dated now, so
+    legacy points get a full expiry window.  Returns the number of lots created.
+    """
+    earned_at = earned_at or datetime.utcnow()
+    covered = (
+        select(func.coalesce(func.sum(PointsLot.remaining), 0))
+        .where(PointsLot.user_id == User.id)
+        .scalar_subquery()
+    )
+    uncovered = User.points - covered
+    stmt = insert(PointsLot).from_select(
+        ['user_id', 'points', 'remaining', 'earned_at'],
+        select(User.id, uncovered, uncovered, literal(earned_at, PointsLot.earned_at.type))
+        .where(User.points > covered)
+    )
+    result = db.session.execute(stmt)
+    db.session.commit()
+    return result.rowcount
+
+def expire_points_lots(max_age_days, batch_size=5000, now=None):
+    """
+    Expire every open lot earned more than ``max_age_days`` ago.
+
+    Lots are processed in id-ordered chunks of ``batch_size``, each starting
+    after the last id of the one before (so expired lots are never rescanned)
+    and found through the partial index of open lots.  For each chunk,
+    in one transaction:
+      1. one EXPIRED ledger row per user is inserted with the summed remainder,
+      2. each affected user's balance is reduced by that sum (never below 0),
+      3. the lots are zeroed and stamped with expired_at.
+    Returns (lots_expired, points_expired).
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=max_age_days)
+    expirable = and_(PointsLot.remaining > 0, PointsLot.earned_at < cutoff)
+
+    lots_expired = 0
+    points_expired = 0
+    last_id = 0
+    while True:
+        # Upper id bound of the next chunk; the chunk is then addressed by
+        # predicate alone, which keeps every statement below set-based.
+        remaining_lots = and_(expirable, PointsLot.id > last_id)
+        upper_id = db.session.execute(
+            select(PointsLot.id).where(remaining_lots)
+            .order_by(PointsLot.id)
+            .offset(batch_size - 1).limit(1)
+        ).scalar()
+        if upper_id is None:
+            upper_id = db.session.execute(select(func.max(PointsLot.id)).where(remaining_lots)).scalar()
+            if upper_id is None:
+                break
+        in_chunk = and_(remaining_lots, PointsLot.id <= upper_id)
+        last_id = upper_id
+
+        chunk_lots, chunk_points = db.session.execute(
+            select(func.count(PointsLot.id), func.coalesce(func.sum(PointsLot.remaining), 0)).where(in_chunk)
+        ).one()
+
+        db.session.execute(
+            insert(PointsTransaction).from_select(
+                ['user_id', 'points', 'transaction_type', 'description', 'created_at'],
+                select(
+                    PointsLot.user_id,
+                    -func.sum(PointsLot.remaining),
+                    literal('EXPIRED'),
+                    literal(f'Points expired ({max_age_days} days after earning)'),
+                    literal(now, PointsTransaction.created_at.type)
+                ).where(in_chunk).group_by(PointsLot.user_id)
+            )
+        )
+
+        user_expired = (
+            select(func.coalesce(func.sum(PointsLot.remaining), 0))
+            .where(in_chunk, PointsLot.user_id == User.id)
+            .scalar_subquery()
+        )
+        db.session.execute(
+            update(User)
+            .where(User.id.in_(select(PointsLot.user_id).where(in_chunk)))
+            .values(points=case((User.points > user_expired, User.points - user_expired), else_=0)),
+            execution_options={'synchronize_session': False}
+        )
+
+        db.session.execute(
+            update(PointsLot).where(in_chunk).values(remaining=0, expired_at=now),
+            execution_options={'synchronize_session': False}
+        )
+        db.session.commit()
+
+        lots_expired += chunk_lots
+        points_expired += chunk_points
+
+    return lots_expired, points_expired
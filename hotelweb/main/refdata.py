@@ -0,0 +1,135 @@
+"""
+Per-process cache of reference data: brands, amenities and hotel cities.
+
+This data changes rarely but is read on almost every page (the footer brand
+list, search filters, room editors).  Each worker holds one immutable
+``ReferenceData`` snapshot made of plain tuples, so it can be shared between
+requests and threads without touching a database session.
+
+The snapshot is built on first use (or by ``warm_reference_data`` at startup)
+and dropped by ``invalidate_reference_data``.  Commits that add, delete or
+change a Brand or Amenity, or a Hotel's city or brand, publish a 'refdata'
+event on the invalidation bus (see invalidation.py) through the session hook
+at the bottom of this module, so every worker drops its snapshot.
+"""
+import hashlib
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from ..extensions import db
+from ..models import Brand, Amenity, Hotel
+from .invalidation import subscribe, publish_invalidation
+
+BrandRef = namedtuple('BrandRef', ['id', 'name', 'description', 'logo_color'])
+AmenityRef = namedtuple('AmenityRef', ['id', 'name'])
+
+class ReferenceData:
+    """Immutable snapshot of brands, amenities and cities"""
+    __slots__ = ('version', 'brands', 'amenities', 'cities', 'brands_by_id', 'amenities_by_id', 'fingerprint')
+
+    def __init__(self, version, brands, amenities, cities):
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'brands', tuple(brands))  # Ordered by id
+        object.__setattr__(self, 'amenities', tuple(amenities))  # Ordered by id
+        object.__setattr__(self, 'cities', tuple(cities))  # Distinct, sorted
+        object.__setattr__(self, 'brands_by_id', MappingProxyType({b.id: b for b in self.brands}))
+        object.__setattr__(self, 'amenities_by_id', MappingProxyType({a.id: a for a in self.amenities}))
+        # Content hash, identical in every worker holding the same data (unlike version)
+        content = repr((self.brands, self.amenities, self.cities)).encode()
+        object.__setattr__(self, 'fingerprint', hashlib.sha1(content).hexdigest()[:16])
+
+    def __setattr__(self, name, value):
+        raise AttributeError('ReferenceData snapshots are immutable')
+
+    def brands_sorted_by_name(self):
+        return sorted(self.brands, key=lambda b: b.name)
+
+_lock = threading.Lock()
+_snapshot = None
+_version = 0
+_stats = {'hits': 0, 'misses': 0, 'builds': 0, 'invalidations': 0, 'last_build_ms': 0.0}
+
+def _load_snapshot(version):
+    brands = [
+        BrandRef(*row) for row in db.session.query(
+            Brand.id, Brand.name, Brand.description, Brand.logo_color
+        ).order_by(Brand.id)
+    ]
+    amenities = [AmenityRef(*row) for row in db.session.query(Amenity.id, Amenity.name).order_by(Amenity.id)]
+    cities = [row[0] for row in db.session.query(Hotel.city).filter(Hotel.city.isnot(None)).distinct().order_by(Hotel.city)]
+    return ReferenceData(version, brands, amenities, cities)
+
+def get_reference_data():
+    """Return the current snapshot, building it on a miss"""
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is not None:
+        _stats['hits'] += 1
+        return snapshot
+
+    with _lock:
+        if _snapshot is not None:
+            _stats['hits'] += 1
+            return _snapshot
+        _stats['misses'] += 1
+        version = _version
+        started = time.perf_counter()
+        snapshot = _load_snapshot(version)
+        _stats['builds'] += 1
+        _stats['last_build_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        # An invalidation while we were loading means the data may already be stale
+        if version == _version:
+            _snapshot = snapshot
+        return snapshot
+
+def warm_reference_data():
+    """Build the snapshot ahead of the first request (call inside an app context)"""
+    invalidate_reference_data(count=False)
+    return get_reference_data()
+
+def invalidate_reference_data(count=True):
+    """Drop this worker's snapshot; the next reader rebuilds it"""
+    global _snapshot, _version
+    with _lock:
+        _version += 1
+        _snapshot = None
+        if count:
+            _stats['invalidations'] += 1
+
+def reference_cache_stats():
+    """Hit/miss counters for this worker"""
+    lookups = _stats['hits'] + _stats['misses']
+    return dict(
+        _stats,
+        version=_version,
+        hit_ratio=round(_stats['hits'] / lookups, 4) if lookups else None
+    )
+
+subscribe('refdata', lambda key: invalidate_reference_data())
+
+# Automatic invalidation: publish an event when a flush touches reference data.
+
+_REFERENCE_HOTEL_FIELDS = ('city', 'brand_id')
+
+def _touches_reference_data(obj, deleted_or_new):
+    if isinstance(obj, (Brand, Amenity)):
+        if deleted_or_new:
+            return True
+        # Linking an amenity to a room type only changes its room_types backref
+        state = inspect(obj)
+        return any(state.attrs[attr.key].history.has_changes() for attr in state.mapper.column_attrs)
+    if isinstance(obj, Hotel):
+        if deleted_or_new:
+            return True
+        state = inspect(obj)
+        return any(state.attrs[field].history.has_changes() for field in _REFERENCE_HOTEL_FIELDS)
+    return False
+
+@event.listens_for(Session, 'before_flush')
+def _track_reference_changes(session, flush_context, instances):
+    if any(_touches_reference_data(obj, True) for obj in list(session.new) + list(session.deleted)) or \
+            any(_touches_reference_data(obj, False) for obj in session.dirty):
+        publish_invalidation('refdata', session=session)
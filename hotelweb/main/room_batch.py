@@ -0,0 +1,220 @@
+"""
+Batch room type changes for the hotel editors (staff and admin).
+
+The edit pages handle one room per POST, each with its own queries, commit
+and redirect.  A changeset does any number of them in one request:
+
+    {
+        "upsert": [
+            {"id": 12, "price_per_night": "189.00", "inventory": 6},
+            {"name": "Garden Suite", "capacity": 3, "price_per_night": 320,
+             "inventory": 2, "description": "...", "image_url": "...", "amenities": [1, 4]}
+        ],
+        "delete": [14, 15],
+        "amenities": {"16": [1, 2, 3]}
+    }
+
+Upserts with an "id" update only the fields they give; without one they
+create a room type and need name, capacity, price_per_night and inventory.
+"amenities" replaces the amenities of rooms that are not otherwise changed.
+The same rules as the edit forms apply, and every problem in the changeset
+is reported at once.  Nothing is written unless all of it is valid: rooms,
+amenities and bookings are loaded with one IN query each, and the changes
+are committed in one transaction with a single mark_hotel_changed().
+"""
+import re
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+from ..extensions import db
+from ..models import Amenity, Booking, RoomType
+from .loaders import loader_profile
+from .page_cache import mark_hotel_changed
+
+MAX_CHANGES = 500  # Room upserts, deletes and amenity assignments per changeset
+
+ROOM_FIELDS = ('name', 'capacity', 'price_per_night', 'inventory', 'description', 'image_url')
+REQUIRED_FIELDS = ('name', 'capacity', 'price_per_night', 'inventory')
+
+INTEGER = re.compile(r'-?[0-9]+')  # ASCII only: str.isdigit() also accepts '²', which int() rejects
+
+RoomChangeset = namedtuple('RoomChangeset', ['creates', 'updates', 'deletes', 'image_urls'])
+
+def _int(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and INTEGER.fullmatch(value.strip()):
+        return int(value)
+    return None
+
+def _room_fields(item, where, errors):
+    """Validated column values from one upsert; errors use the same wording as the edit forms"""
+    fields = {}
+    if 'name' in item:
+        name = item['name'].strip() if isinstance(item['name'], str) else ''
+        if not name:
+            errors.append(f'{where}: Room name is required.')
+        fields['name'] = name
+    if 'capacity' in item:
+        capacity = _int(item['capacity'])
+        if capacity is None or capacity < 1:
+            errors.append(f'{where}: Capacity must be at least 1.')
+        fields['capacity'] = capacity
+    if 'price_per_night' in item:
+        try:
+            price = None if isinstance(item['price_per_night'], bool) else Decimal(str(item['price_per_night']))
+        except (ValueError, InvalidOperation):
+            price = None
+        if price is None or not price.is_finite() or price <= 0:
+            errors.append(f'{where}: Price per night must be greater than 0.')
+        fields['price_per_night'] = price
+    if 'inventory' in item:
+        inventory = _int(item['inventory'])
+        if inventory is None or inventory < 1:
+            errors.append(f'{where}: Inventory must be at least 1.')
+        fields['inventory'] = inventory
+    for name in ('description', 'image_url'):
+        if name in item:
+            value = item[name]
+            if value is not None and not isinstance(value, str):
+                errors.append(f'{where}: {name} must be text.')
+                value = ''
+            fields[name] = (value or '').strip()
+    unknown = set(item) - set(ROOM_FIELDS) - {'id', 'amenities'}
+    if unknown:
+        errors.append(f"{where}: Unknown field(s) {', '.join(sorted(unknown))}.")
+    return fields
+
+def _amenity_ids(value, where, errors):
+    if not isinstance(value, list) or any(_int(v) is None for v in value):
+        errors.append(f'{where}: Amenities must be a list of amenity ids.')
+        return []
+    return sorted({_int(v) for v in value})
+
+def validate_room_changeset(hotel_id, data):
+    """(RoomChangeset, []) for a valid changeset, otherwise (None, list of error messages)"""
+    if not isinstance(data, dict):
+        return None, ['The changeset must be a JSON object.']
+    upserts = data.get('upsert') or []
+    deletes = data.get('delete') or []
+    assignments = data.get('amenities') or {}
+    errors = []
+    if not isinstance(upserts, list) or not all(isinstance(item, dict) for item in upserts):
+        errors.append('"upsert" must be a list of room objects.')
+        upserts = []
+    if not isinstance(deletes, list):
+        errors.append('"delete" must be a list of room ids.')
+        deletes = []
+    if not isinstance(assignments, dict):
+        errors.append('"amenities" must map room ids to lists of amenity ids.')
+        assignments = {}
+    if len(upserts) + len(deletes) + len(assignments) > MAX_CHANGES:
+        return None, [f'A changeset can change at most {MAX_CHANGES} rooms.']
+
+    # Parse everything first, so the rows and amenities can be loaded in one go
+    room_ids, seen = [], set()
+    def claim(room_id, where):
+        if room_id is None:
+            errors.append(f'{where}: Room ID must be a number.')
+        elif room_id in seen:
+            errors.append(f'{where}: Room {room_id} is changed more than once.')
+        else:
+            seen.add(room_id)
+            room_ids.append(room_id)
+            return True
+        return False
+
+    parsed_upserts = []
+    for index, item in enumerate(upserts):
+        where = f'upsert[{index}]'
+        room_id = None
+        if 'id' in item:
+            room_id = _int(item['id'])
+            claim(room_id, where)
+        fields = _room_fields(item, where, errors)
+        if room_id is None and 'id' not in item:
+            missing = [name for name in REQUIRED_FIELDS if name not in fields]
+            if missing:
+                errors.append(f"{where}: New rooms need {', '.join(missing)}.")
+        amenity_ids = _amenity_ids(item['amenities'], where, errors) if 'amenities' in item else None
+        parsed_upserts.append((room_id, fields, amenity_ids))
+
+    delete_ids = []
+    for index, value in enumerate(deletes):
+        room_id = _int(value)
+        if claim(room_id, f'delete[{index}]'):
+            delete_ids.append(room_id)
+
+    parsed_assignments = []
+    for key, value in assignments.items():
+        where = f'amenities[{key}]'
+        room_id = _int(key)
+        claim(room_id, where)
+        parsed_assignments.append((room_id, _amenity_ids(value, where, errors)))
+
+    # One query each for the rooms (with their amenities), the amenities and the booked rooms
+    rooms = {}
+    if room_ids:
+        rooms = {room.id: room for room in RoomType.query.filter(
+            RoomType.hotel_id == hotel_id, RoomType.id.in_(room_ids)
+        ).options(*loader_profile('room_type_edit'))}
+    for room_id in room_ids:
+        if room_id not in rooms:
+            errors.append(f'Room {room_id} is not a room type of this hotel.')
+
+    wanted_amenities = {a for _, _, ids in parsed_upserts if ids for a in ids}
+    wanted_amenities.update(a for _, ids in parsed_assignments for a in ids)
+    amenities = {}
+    if wanted_amenities:
+        amenities = {a.id: a for a in Amenity.query.filter(Amenity.id.in_(wanted_amenities))}
+    for amenity_id in sorted(wanted_amenities - set(amenities)):
+        errors.append(f'Amenity {amenity_id} does not exist.')
+
+    if delete_ids:
+        booked = {room_id for (room_id,) in db.session.query(Booking.roomtype_id).filter(
+            Booking.roomtype_id.in_(delete_ids)).distinct()}
+        for room_id in delete_ids:
+            if room_id in booked:
+                errors.append(f'Room {room_id}: Cannot delete room type with existing bookings.')
+
+    if errors:
+        return None, errors
+
+    creates, updates = [], []
+    for room_id, fields, amenity_ids in parsed_upserts:
+        room_amenities = None if amenity_ids is None else [amenities[a] for a in amenity_ids]
+        if room_id is None:
+            creates.append((fields, room_amenities))
+        else:
+            updates.append((rooms[room_id], fields, room_amenities))
+    for room_id, amenity_ids in parsed_assignments:
+        updates.append((rooms[room_id], {}, [amenities[a] for a in amenity_ids]))
+    image_urls = [fields['image_url'] for _, fields, _ in parsed_upserts if fields.get('image_url')]
+    return RoomChangeset(creates, updates, [rooms[i] for i in delete_ids], image_urls), []
+
+def apply_room_changeset(hotel_id, changeset):
+    """Write a validated changeset in one transaction; returns the created, updated and deleted room ids"""
+    created = []
+    for fields, room_amenities in changeset.creates:
+        room = RoomType(hotel_id=hotel_id, **dict({'description': '', 'image_url': ''}, **fields))
+        room.amenities = room_amenities or []
+        db.session.add(room)
+        created.append(room)
+    for room, fields, room_amenities in changeset.updates:
+        for name, value in fields.items():
+            setattr(room, name, value)
+        if room_amenities is not None:
+            room.amenities = room_amenities
+    for room in changeset.deletes:
+        db.session.delete(room)
+    db.session.flush()
+    # Read the ids before commit expires the objects
+    summary = {
+        'created': [room.id for room in created],
+        'updated': sorted({room.id for room, _, _ in changeset.updates}),
+        'deleted': [room.id for room in changeset.deletes],
+    }
+    mark_hotel_changed(hotel_id)
+    db.session.commit()
+    return summary
@@ -2,9 +2,20 @@ from datetime import datetime, date
 from flask import render_template, request, url_for, redirect, flash, abort, session, jsonify
 from flask_login import login_required, current_user
 from ..extensions import db
-from ..models import Hotel, RoomType, Amenity, Booking, Brand, Review, PointsTransaction, MilestoneReward, UserEvent, PaymentMethod, FavoriteHotel, User, ContactMessage
+from ..utils.db_routing import replica_reads
+from ..utils.admission import cost_class
+from ..utils.streaming import stream_page
+from ..models import Hotel, RoomType, Booking, Brand, Review, PointsTransaction, MilestoneReward, UserEvent, PaymentMethod, FavoriteHotel, User, ContactMessage
 from . import bp
 from .services import search_available_roomtypes, sort_results
+from .points import credit_points_lot, consume_points_lots
+from .stats import record_booking_created, record_booking_cancelled, settle_booking_stats
+from .refdata import get_reference_data
+from .loaders import loader_profile
+from .page_cache import (
+    cached_page, mark_hotel_changed, has_search_dates, brands_validator, brand_validator,
+    destinations_validator, city_validator, hotel_validator, roomtype_validator
+)
 from .language import set_language, SUPPORTED_LANGUAGES, get_translation
 
 def get_favorite_hotel_ids():
@@ -23,6 +34,7 @@ def award_points_for_completed_stays(user):
     today = date.today()
     points_awarded_total = 0
     tier_upgraded = False
+    stays_settled = False
 
     # Find bookings that have ended and points haven't been awarded
     completed_bookings = Booking.query.filter(
@@ -34,6 +46,10 @@ def award_points_for_completed_stays(user):
     for booking in completed_bookings:
         nights = (booking.check_out - booking.check_in).days
         
+        # Roll the completed stay into the user's lifetime stats (once per booking)
+        if settle_booking_stats(booking):
+            stays_settled = True
+        
         # Check if nights have already been counted for this booking
         # We check if there's an EARNED transaction (for points bookings) or if booking has been processed
         existing_earned_transaction = PointsTransaction.query.filter_by(booking_id=booking.id, transaction_type='EARNED').first()
@@ -82,13 +98,14 @@ def award_points_for_completed_stays(user):
                     description=f'Stay at {booking.room_type.hotel.name} - {nights} night(s)'
                 )
                 db.session.add(transaction)
+                credit_points_lot(transaction)
                 
                 # Check for tier upgrade
                 if user.calculate_tier():
                     tier_upgraded = True
     
-    if points_awarded_total > 0:
-        db.session.commit() # Commit all changes for awarded points and tier updates
+    if points_awarded_total > 0 or stays_settled:
+        db.session.commit() # Commit all changes for awarded points, tier updates and settled stats
     return points_awarded_total, tier_upgraded
 
 @bp.route('/')
@@ -131,6 +148,7 @@ def index():
                     description=f"Birthday Bonus {current_year}"
                 )
                 db.session.add(transaction)
+                credit_points_lot(transaction)
                 db.session.commit()
                 
                 # Set Session for Modal
@@ -180,12 +198,12 @@ def index():
                 session['celebration_reward_type'] = 'breakfast'
                 session['celebration_reward_amount'] = 1
 
-    cities = db.session.query(Hotel.city).distinct().all()
-    cities = [c[0] for c in cities]
-    brands = Brand.query.all()
-    amenities = Amenity.query.all()
+    refdata = get_reference_data()
+    cities = list(refdata.cities)
+    brands = refdata.brands
+    amenities = refdata.amenities
     # Featured Hotels (random 3) using SQLAlchemy func.random if supported, else simple slice
-    featured_hotels = Hotel.query.limit(3).all()
+    featured_hotels = Hotel.query.options(*loader_profile('hotel_card')).limit(3).all()
     from datetime import timedelta
     tomorrow = date.today() + timedelta(days=1)
     return render_template('main/home.html', cities=cities, brands=brands, amenities=amenities, featured_hotels=featured_hotels, today=date.today(), tomorrow=tomorrow)
@@ -200,24 +218,29 @@ def clear_celebration():
     return '', 204
 
 @bp.route('/brands')
+@replica_reads
+@cached_page(brands_validator)
 def brands():
-    brands = Brand.query.all()
+    brands = get_reference_data().brands
     return render_template('main/brands.html', brands=brands)
 
 @bp.route('/brand/<int:brand_id>')
+@replica_reads
+@cached_page(brand_validator)
 def brand_detail(brand_id):
     brand = Brand.query.get_or_404(brand_id)
     favorite_hotel_ids = get_favorite_hotel_ids()
     return render_template('main/brand_detail.html', brand=brand, favorite_hotel_ids=favorite_hotel_ids)
 
 @bp.route('/destinations')
+@replica_reads
+@cached_page(destinations_validator)
 def destinations():
-    cities = db.session.query(Hotel.city).distinct().all()
-    cities_list = [c[0] for c in cities]
+    cities_list = get_reference_data().cities
     # Get hotels grouped by city - limit to 3 for display
     destinations_data = []
     for city_name in cities_list:
-        hotels = Hotel.query.filter_by(city=city_name).limit(3).all()
+        hotels = Hotel.query.filter_by(city=city_name).options(*loader_profile('hotel_card')).limit(3).all()
         destinations_data.append({
             'city': city_name,
             'hotels': hotels,
@@ -227,9 +250,12 @@ def destinations():
     return render_template('main/destinations.html', destinations=destinations_data, favorite_hotel_ids=favorite_hotel_ids)
 
 @bp.route('/city/<city_name>')
+@replica_reads
+@cached_page(city_validator)
+@cost_class('search')
 def city_hotels(city_name):
     """Display all hotels in a specific city"""
-    hotels = Hotel.query.filter_by(city=city_name).all()
+    hotels = Hotel.query.filter_by(city=city_name).options(*loader_profile('hotel_card')).all()
     if not hotels:
         flash(f'No hotels found in {city_name}.', 'warning')
         return redirect(url_for('main.destinations'))
@@ -287,6 +313,8 @@ def contact():
     return render_template('main/contact.html')
 
 @bp.route('/search')
+@replica_reads
+@cost_class('search')
 def search():
     print(f"DEBUG: Search params: {request.args}")
     city_input = request.args.get('city', '').strip()
@@ -308,8 +336,8 @@ def search():
     
     # Find matching city from database (case-insensitive and space-insensitive)
     normalized_input = normalize_city_name(city_input)
-    all_cities_query = db.session.query(Hotel.city).distinct().all()
-    all_cities = [city_tuple[0] for city_tuple in all_cities_query]
+    refdata = get_reference_data()
+    all_cities = refdata.cities
     
     city = None
     for db_city in all_cities:
@@ -322,7 +350,7 @@ def search():
         city = city_input
     
     # Store all_cities for template (to avoid duplicate query)
-    all_cities_for_template = sorted(set(all_cities))
+    all_cities_for_template = list(all_cities)
 
     try:
         check_in = datetime.strptime(check_in_str, '%Y-%m-%d').date()
@@ -386,30 +414,32 @@ def search():
     else: # best_match
         final_results.sort(key=lambda x: (-x['avg_rating'], x['min_price']))
     
-    all_amenities = Amenity.query.all()
-    all_brands = Brand.query.all()
+    all_amenities = refdata.amenities
+    all_brands = refdata.brands
     
     favorite_hotel_ids = get_favorite_hotel_ids()
     
-    return render_template('main/search.html', 
-                           results=final_results, 
-                           city=city, 
-                           check_in=check_in, 
-                           check_out=check_out, 
-                           guests=guests,
-                           rooms_needed=rooms_needed,
-                           required_amenities=required_amenities,
-                           selected_brands=selected_brands,
-                           all_amenities=all_amenities,
-                           all_brands=all_brands,
-                           sort_by=sort_by,
-                           today=date.today(),
-                           favorite_hotel_ids=favorite_hotel_ids,
-                           cities=all_cities_for_template)
+    return stream_page('main/search.html', 
+                       results=final_results, 
+                       city=city, 
+                       check_in=check_in, 
+                       check_out=check_out, 
+                       guests=guests,
+                       rooms_needed=rooms_needed,
+                       required_amenities=required_amenities,
+                       selected_brands=selected_brands,
+                       all_amenities=all_amenities,
+                       all_brands=all_brands,
+                       sort_by=sort_by,
+                       today=date.today(),
+                       favorite_hotel_ids=favorite_hotel_ids,
+                       cities=all_cities_for_template)
 
 @bp.route('/hotel/<int:hotel_id>')
+@replica_reads
+@cached_page(hotel_validator, vary_referrer=True, bypass=has_search_dates)
 def hotel_detail(hotel_id):
-    hotel = Hotel.query.get_or_404(hotel_id)
+    hotel = Hotel.query.options(*loader_profile('hotel_detail')).get_or_404(hotel_id)
     
     # Detect where user came from (via referrer or URL params)
     referrer = request.referrer
@@ -466,7 +496,7 @@ def hotel_detail(hotel_id):
     recommended_hotels = []
     
     # Priority 1: Same brand and same city
-    same_brand_city = Hotel.query.filter(
+    same_brand_city = Hotel.query.options(*loader_profile('hotel_card')).filter(
         Hotel.id != hotel_id,
         Hotel.brand_id == hotel.brand_id,
         Hotel.city == hotel.city
@@ -475,7 +505,7 @@ def hotel_detail(hotel_id):
     
     # Priority 2: Same city and same stars (if we don't have enough)
     if len(recommended_hotels) < 3:
-        same_city_stars = Hotel.query.filter(
+        same_city_stars = Hotel.query.options(*loader_profile('hotel_card')).filter(
             Hotel.id != hotel_id,
             Hotel.city == hotel.city,
             Hotel.stars == hotel.stars,
@@ -485,7 +515,7 @@ def hotel_detail(hotel_id):
     
     # Priority 3: Same city (if we still don't have enough)
     if len(recommended_hotels) < 3:
-        same_city = Hotel.query.filter(
+        same_city = Hotel.query.options(*loader_profile('hotel_card')).filter(
             Hotel.id != hotel_id,
             Hotel.city == hotel.city,
             ~Hotel.id.in_([h.id for h in recommended_hotels])
@@ -494,7 +524,7 @@ def hotel_detail(hotel_id):
     
     # Priority 4: Same brand (if we still don't have enough)
     if len(recommended_hotels) < 3:
-        same_brand = Hotel.query.filter(
+        same_brand = Hotel.query.options(*loader_profile('hotel_card')).filter(
             Hotel.id != hotel_id,
             Hotel.brand_id == hotel.brand_id,
             ~Hotel.id.in_([h.id for h in recommended_hotels])
@@ -539,6 +569,8 @@ def hotel_detail(hotel_id):
                           is_favorited=is_favorited)
 
 @bp.route('/roomtype/<int:roomtype_id>')
+@replica_reads
+@cached_page(roomtype_validator, vary_referrer=True, last_modified=False)
 def roomtype_detail(roomtype_id):
     rt = RoomType.query.get_or_404(roomtype_id)
     estimated_points_per_night = 0
@@ -661,6 +693,7 @@ def roomtype_detail(roomtype_id):
 
 @bp.route('/book/<int:roomtype_id>/confirm')
 @login_required
+@cost_class('booking')
 def booking_confirm(roomtype_id):
     """Display booking confirmation page with price breakdown and payment options"""
     rt = RoomType.query.get_or_404(roomtype_id)
@@ -778,6 +811,7 @@ def booking_confirm(roomtype_id):
 
 @bp.route('/book/<int:roomtype_id>', methods=['POST'])
 @login_required
+@cost_class('booking')
 def book_room(roomtype_id):
     rt = RoomType.query.get_or_404(roomtype_id)
     from ..utils.security import validate_date, validate_integer
@@ -906,6 +940,7 @@ def book_room(roomtype_id):
                                   rooms_needed=rooms_needed, breakfast_included='1' if breakfast_included else '0'))
         points_used = points_needed
         current_user.points -= points_used
+        consume_points_lots(current_user.id, points_used)
         payment_method_display = f'Points ({points_used:,} points)'
         # Record points transaction (will add booking_id after booking is created)
         points_transaction = PointsTransaction(
@@ -943,6 +978,7 @@ def book_room(roomtype_id):
         payment_method=payment_method_display if payment_method != 'points' else 'points',
         user_id=current_user.id,
         roomtype_id=rt.id,
+        hotel_id=rt.hotel_id,
         check_in=check_in,
         check_out=check_out,
         rooms_count=rooms_needed,
@@ -957,6 +993,7 @@ def book_room(roomtype_id):
     
     db.session.add(booking)
     db.session.flush()  # Get booking ID
+    record_booking_created(booking)
     
     # Update points transaction with booking_id if it was a points payment
     if points_used > 0:
@@ -978,6 +1015,7 @@ def book_room(roomtype_id):
 
 @bp.route('/my/stays')
 @login_required
+@cost_class('account')
 def my_stays():
     """Display user's stays categorized by status and dates"""
     # Award points for completed stays
@@ -987,7 +1025,9 @@ def my_stays():
     if tier_upgraded:
         flash(f'🎉 Congratulations! You\'ve been upgraded to {current_user.membership_level} status!', 'success')
     
-    all_bookings = Booking.query.filter_by(user_id=current_user.id).order_by(Booking.check_in.desc()).all()
+    all_bookings = Booking.query.filter_by(user_id=current_user.id).options(
+        *loader_profile('booking_list')
+    ).order_by(Booking.check_in.desc()).all()
     
     today = date.today()
     
@@ -1012,25 +1052,28 @@ def my_stays():
     
     # Check which bookings already have reviews
     reviewed_booking_ids = set()
-    for booking in past:
-        existing_review = Review.query.filter_by(booking_id=booking.id, user_id=current_user.id).first()
-        if existing_review:
-            reviewed_booking_ids.add(booking.id)
+    if past:
+        reviewed_booking_ids = {booking_id for (booking_id,) in db.session.query(Review.booking_id).filter(
+            Review.user_id == current_user.id,
+            Review.booking_id.in_([booking.id for booking in past])
+        )}
     
     # Get user's favorite hotels
     favorite_hotels = []
     if current_user.is_authenticated:
-        favorites = FavoriteHotel.query.filter_by(user_id=current_user.id).order_by(FavoriteHotel.created_at.desc()).all()
+        favorites = FavoriteHotel.query.filter_by(user_id=current_user.id).options(
+            *loader_profile('favorite_hotels')
+        ).order_by(FavoriteHotel.created_at.desc()).all()
         favorite_hotels = [fav.hotel for fav in favorites]
     
-    return render_template('main/my_stays.html', 
-                         upcoming=upcoming,
-                         current=current,
-                         past=past,
-                         cancelled=cancelled,
-                         today=today,
-                         reviewed_booking_ids=reviewed_booking_ids,
-                         favorite_hotels=favorite_hotels)
+    return stream_page('main/my_stays.html', 
+                       upcoming=upcoming,
+                       current=current,
+                       past=past,
+                       cancelled=cancelled,
+                       today=today,
+                       reviewed_booking_ids=reviewed_booking_ids,
+                       favorite_hotels=favorite_hotels)
 
 @bp.route('/booking/<int:booking_id>/review', methods=['GET', 'POST'])
 @login_required
@@ -1077,6 +1120,7 @@ def write_review(booking_id):
         if existing_review:
             existing_review.rating = rating
             existing_review.comment = comment
+            mark_hotel_changed(hotel.id)
             db.session.commit()
             flash('Your review has been updated!', 'success')
         else:
@@ -1089,6 +1133,7 @@ def write_review(booking_id):
                 comment=comment
             )
             db.session.add(review)
+            mark_hotel_changed(hotel.id)
             db.session.commit()
             flash('Thank you for your review!', 'success')
         
@@ -1098,6 +1143,7 @@ def write_review(booking_id):
 
 @bp.route('/cancel/<int:booking_id>', methods=['POST'])
 @login_required
+@cost_class('booking')
 def cancel_booking(booking_id):
     booking = Booking.query.get_or_404(booking_id)
     if booking.user_id != current_user.id:
@@ -1125,6 +1171,7 @@ def cancel_booking(booking_id):
             description=f'Refund for cancelled booking at {booking.room_type.hotel.name}'
         )
         db.session.add(refund_transaction)
+        credit_points_lot(refund_transaction)
     
     # Refund breakfast voucher if one was used
     if booking.breakfast_voucher_used:
@@ -1135,6 +1182,7 @@ def cancel_booking(booking_id):
             voucher.breakfasts_used = max(0, voucher.breakfasts_used - breakfasts_to_refund)
     
     # Mark booking as cancelled
+    record_booking_cancelled(booking)
     booking.status = 'CANCELLED'
     db.session.commit()
     
@@ -1191,10 +1239,10 @@ def set_language_route(lang_code):
     
 @bp.route('/account')
 @login_required
+@cost_class('account')
 def account():
     """Enhanced account page with tier info and statistics"""
     from datetime import datetime, date
-    from sqlalchemy import func
     import random
     
     # Check and process tier expiry (this will handle retention and downgrades)
@@ -1213,25 +1261,18 @@ def account():
         current_user.member_number = f"{random.randint(10000000, 99999999)}"
         db.session.commit()
     
-    # Calculate statistics
-    # Only count completed bookings (check_out <= today) for stays and spending
-    today = date.today()
-    total_bookings = Booking.query.filter(
-        Booking.user_id == current_user.id,
-        Booking.status == 'CONFIRMED',
-        Booking.check_out <= today
-    ).count()
-    total_spent = db.session.query(func.sum(Booking.total_cost)).filter(
-        Booking.user_id == current_user.id,
-        Booking.status == 'CONFIRMED',
-        Booking.check_out <= today
-    ).scalar() or 0
+    # Statistics come from the stats rollup: completed stays were settled into
+    # these columns by award_points_for_completed_stays() above
+    total_bookings = current_user.completed_stays or 0
+    total_spent = current_user.completed_spent or 0
     
     # All points transactions for Account Activity tab
     all_transactions = PointsTransaction.query.filter_by(user_id=current_user.id).order_by(PointsTransaction.created_at.desc()).all()
     
     # All bookings for Account Activity tab
-    all_bookings = Booking.query.filter_by(user_id=current_user.id).order_by(Booking.check_in.desc()).all()
+    all_bookings = Booking.query.filter_by(user_id=current_user.id).options(
+        *loader_profile('booking_list')
+    ).order_by(Booking.check_in.desc()).all()
     
     # Bookings with points redeemed for Rewards Wallet tab
     redeemed_transactions = PointsTransaction.query.filter_by(
@@ -1243,13 +1284,13 @@ def account():
     points_bookings = Booking.query.filter_by(
         user_id=current_user.id,
         payment_method='points'
-    ).order_by(Booking.created_at.desc()).all()
+    ).options(*loader_profile('booking_list')).order_by(Booking.created_at.desc()).all()
     
     # Bookings with breakfast vouchers
     breakfast_voucher_bookings = Booking.query.filter(
         Booking.user_id == current_user.id,
         Booking.breakfast_voucher_used.isnot(None)
-    ).order_by(Booking.created_at.desc()).all()
+    ).options(*loader_profile('booking_list')).order_by(Booking.created_at.desc()).all()
     
     # Milestone rewards
     milestone_rewards = MilestoneReward.query.filter_by(
@@ -1433,47 +1474,47 @@ def account():
     # User events (Birthday, New Year)
     user_events = UserEvent.query.filter_by(user_id=current_user.id).order_by(UserEvent.created_at.desc()).all()
     
-    return render_template('main/account.html',
-                         total_bookings=total_bookings,
-                         total_spent=total_spent,
-                         all_transactions=all_transactions,
-                         all_bookings=all_bookings,
-                         redeemed_transactions=redeemed_transactions,
-                         points_bookings=points_bookings,
-                         breakfast_voucher_bookings=breakfast_voucher_bookings,
-                         milestone_rewards=milestone_rewards,
-                         points_to_next=points_to_next,
-                         next_tier=next_tier,
-                         tier_benefits=tier_benefits,
-                         progress_percent=progress_percent,
-                         nights_to_next_milestone=nights_to_next_milestone,
-                         nights_progress_percent=nights_progress_percent,
-                         nights_next_tier=nights_next_tier or 'Platinum Elite',
-                         nights_progress_pct=nights_progress_pct,
-                         nights_bar_color=nights_bar_color,
-                         nights_marker_0_pct=nights_marker_0_pct,
-                         nights_marker_10_pct=nights_marker_10_pct,
-                         nights_marker_20_pct=nights_marker_20_pct,
-                         nights_marker_70_pct=nights_marker_70_pct,
-                         nights_marker_200_pct=nights_marker_200_pct,
-                         points_total_progress_pct=points_total_progress_pct,
-                         points_bar_color=points_bar_color,
-                         points_marker_0_pct=points_marker_0_pct,
-                         points_marker_50k_pct=points_marker_50k_pct,
-                         points_marker_100k_pct=points_marker_100k_pct,
-                         points_marker_500k_pct=points_marker_500k_pct,
-                         points_marker_1m_pct=points_marker_1m_pct,
-                         multipliers=multipliers,
-                         tier_retention=current_user.check_tier_retention_status(),
-                         tier_requirements=current_user.get_tier_retention_requirements(),
-                         year_nights=year_nights,
-                         next_milestone_year=next_milestone_year or 100,
-                         nights_to_milestone_year=nights_to_milestone_year,
-                         milestone_progress_percent=milestone_progress_percent,
-                         current_year=current_year,
-                         unclaimed_milestones=unclaimed_milestones,
-                         payment_methods=payment_methods,
-                         user_events=user_events)
+    return stream_page('main/account.html',
+                       total_bookings=total_bookings,
+                       total_spent=total_spent,
+                       all_transactions=all_transactions,
+                       all_bookings=all_bookings,
+                       redeemed_transactions=redeemed_transactions,
+                       points_bookings=points_bookings,
+                       breakfast_voucher_bookings=breakfast_voucher_bookings,
+                       milestone_rewards=milestone_rewards,
+                       points_to_next=points_to_next,
+                       next_tier=next_tier,
+                       tier_benefits=tier_benefits,
+                       progress_percent=progress_percent,
+                       nights_to_next_milestone=nights_to_next_milestone,
+                       nights_progress_percent=nights_progress_percent,
+                       nights_next_tier=nights_next_tier or 'Platinum Elite',
+                       nights_progress_pct=nights_progress_pct,
+                       nights_bar_color=nights_bar_color,
+                       nights_marker_0_pct=nights_marker_0_pct,
+                       nights_marker_10_pct=nights_marker_10_pct,
+                       nights_marker_20_pct=nights_marker_20_pct,
+                       nights_marker_70_pct=nights_marker_70_pct,
+                       nights_marker_200_pct=nights_marker_200_pct,
+                       points_total_progress_pct=points_total_progress_pct,
+                       points_bar_color=points_bar_color,
+                       points_marker_0_pct=points_marker_0_pct,
+                       points_marker_50k_pct=points_marker_50k_pct,
+                       points_marker_100k_pct=points_marker_100k_pct,
+                       points_marker_500k_pct=points_marker_500k_pct,
+                       points_marker_1m_pct=points_marker_1m_pct,
+                       multipliers=multipliers,
+                       tier_retention=current_user.check_tier_retention_status(),
+                       tier_requirements=current_user.get_tier_retention_requirements(),
+                       year_nights=year_nights,
+                       next_milestone_year=next_milestone_year or 100,
+                       nights_to_milestone_year=nights_to_milestone_year,
+                       milestone_progress_percent=milestone_progress_percent,
+                       current_year=current_year,
+                       unclaimed_milestones=unclaimed_milestones,
+                       payment_methods=payment_methods,
+                       user_events=user_events)
 
 @bp.route('/milestone-rewards/<int:milestone_nights>', methods=['GET', 'POST'])
 @login_required
@@ -1525,6 +1566,7 @@ def claim_milestone_reward(milestone_nights):
                 description=f'Milestone reward: {milestone_nights} nights - {reward_value} bonus points'
             )
             db.session.add(transaction)
+            credit_points_lot(transaction)
             flash(f'Congratulations! {reward_value:,} bonus points have been added to your account.', 'success')
         elif reward_type == 'breakfast':
             # Store breakfast reward (will be applied on next booking)
@@ -1548,6 +1590,7 @@ def claim_milestone_reward(milestone_nights):
 
 @bp.route('/account/milestone-progress')
 @login_required
+@cost_class('account')
 def milestone_progress():
     """Display milestone rewards progress page with rules and claimed rewards"""
     from datetime import datetime, date
@@ -2,6 +2,7 @@ from datetime import date, timedelta
 from sqlalchemy import and_, or_, func, desc
 from ..extensions import db
 from ..models import RoomType, Booking, Hotel, Amenity, Brand, Review
+from .loaders import loader_profile
 
 def search_available_roomtypes(city, check_in, check_out, guests, rooms_needed=1, required_amenity_ids=None, brand_ids=None):
     """
@@ -21,7 +22,7 @@ def search_available_roomtypes(city, check_in, check_out, guests, rooms_needed=1
 
     # 1. Base Query
     # Note: City matching (case-insensitive and space-insensitive) is handled in routes.py
-    query = RoomType.query.join(Hotel).filter(
+    query = RoomType.query.join(Hotel).options(*loader_profile('search')).filter(
         Hotel.city == city,
         RoomType.capacity >= guests
     )
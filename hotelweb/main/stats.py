@@ -0,0 +1,176 @@
+"""
+Counters rollup for account and dashboard statistics.
+
+Per-user booking stats live on ``User`` (active_bookings, completed_stays,
+completed_spent) and platform totals live in the single ``SiteStats`` row.
+Write paths bump them with ``col = col + delta`` UPDATEs inside their own
+transaction, so the account page and admin dashboard read them in O(1).
+``recompute_user_stats`` / ``recompute_site_stats`` rebuild everything in bulk
+and ``check_stats_consistency`` reports drift without changing anything.
+"""
+from datetime import datetime
+from sqlalchemy import select, update, func, or_
+from sqlalchemy.orm.attributes import set_committed_value
+from ..extensions import db
+from ..models import User, Hotel, Booking, SiteStats
+
+SITE_STATS_ID = 1
+
+def _increment(column, delta):
+    return func.coalesce(column, 0) + delta
+
+def bump_user_stats(user_id, **deltas):
+    """Atomically add deltas to a user's stats columns"""
+    values = {name: _increment(getattr(User, name), delta) for name, delta in deltas.items() if delta}
+    if values:
+        db.session.execute(
+            update(User).where(User.id == user_id).values(**values),
+            execution_options={'synchronize_session': False}
+        )
+
+def bump_site_stats(**deltas):
+    """Atomically add deltas to the platform counters row (no-op until it exists)"""
+    values = {name: _increment(getattr(SiteStats, name), delta) for name, delta in deltas.items() if delta}
+    if values:
+        values['updated_at'] = datetime.utcnow()
+        db.session.execute(
+            update(SiteStats).where(SiteStats.id == SITE_STATS_ID).values(**values),
+            execution_options={'synchronize_session': False}
+        )
+
+def record_booking_created(booking):
+    bump_user_stats(booking.user_id, active_bookings=1)
+    bump_site_stats(total_bookings=1)
+
+def settle_booking_stats(booking):
+    """Move a completed confirmed booking from active into the completed stay totals"""
+    if booking.stats_settled:
+        return False
+    # Claim the booking with a conditional UPDATE, so two concurrent requests
+    # (e.g. two tabs) can't both count the same stay
+    claimed = db.session.execute(
+        update(Booking).where(
+            Booking.id == booking.id,
+            or_(Booking.stats_settled.is_(None), Booking.stats_settled == False)
+        ).values(stats_settled=True),
+        execution_options={'synchronize_session': False}
+    ).rowcount == 1
+    set_committed_value(booking, 'stats_settled', True)
+    if not claimed:
+        return False
+    bump_user_stats(
+        booking.user_id,
+        active_bookings=-1,
+        completed_stays=1,
+        completed_spent=booking.total_cost or 0
+    )
+    return True
+
+def record_booking_cancelled(booking):
+    """Call before marking a confirmed booking CANCELLED"""
+    if booking.status != 'CONFIRMED':
+        return
+    if booking.stats_settled:
+        bump_user_stats(booking.user_id, completed_stays=-1, completed_spent=-(booking.total_cost or 0))
+        booking.stats_settled = False
+    else:
+        bump_user_stats(booking.user_id, active_bookings=-1)
+
+def record_booking_reconfirmed(booking):
+    """Call before marking a cancelled booking CONFIRMED again"""
+    if booking.status != 'CONFIRMED':
+        bump_user_stats(booking.user_id, active_bookings=1)
+
+def record_user_created(role):
+    bump_site_stats(
+        total_users=1,
+        total_customers=1 if role == 'customer' else 0,
+        total_staff=1 if role == 'staff' else 0
+    )
+
+def record_role_changed(old_role, new_role):
+    if old_role == new_role:
+        return
+    bump_site_stats(
+        total_customers=(new_role == 'customer') - (old_role == 'customer'),
+        total_staff=(new_role == 'staff') - (old_role == 'staff')
+    )
+
+def _computed_user_stats():
+    """Correlated subqueries computing each user's stats from the bookings table"""
+    confirmed = (Booking.user_id == User.id, Booking.status == 'CONFIRMED')
+    active = select(func.count(Booking.id)).where(
+        *confirmed, or_(Booking.stats_settled.is_(None), Booking.stats_settled == False)
+    ).scalar_subquery()
+    completed = select(func.count(Booking.id)).where(*confirmed, Booking.stats_settled == True).scalar_subquery()
+    spent = select(func.coalesce(func.sum(Booking.total_cost), 0)).where(
+        *confirmed, Booking.stats_settled == True
+    ).scalar_subquery()
+    return active, completed, spent
+
+def _computed_site_stats():
+    return {
+        'total_users': db.session.query(func.count(User.id)).scalar(),
+        'total_customers': db.session.query(func.count(User.id)).filter(User.role == 'customer').scalar(),
+        'total_staff': db.session.query(func.count(User.id)).filter(User.role == 'staff').scalar(),
+        'total_hotels': db.session.query(func.count(Hotel.id)).scalar(),
+        'total_bookings': db.session.query(func.count(Booking.id)).scalar(),
+    }
+
+def recompute_user_stats():
+    """Rebuild every user's stats columns with a single set-based UPDATE"""
+    active, completed, spent = _computed_user_stats()
+    result = db.session.execute(
+        update(User).values(active_bookings=active, completed_stays=completed, completed_spent=spent),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.commit()
+    return result.rowcount
+
+def recompute_site_stats():
+    """Rebuild the platform counters row from COUNT(*) queries"""
+    stats = SiteStats.query.get(SITE_STATS_ID)
+    if stats is None:
+        stats = SiteStats(id=SITE_STATS_ID)
+        db.session.add(stats)
+    for name, value in _computed_site_stats().items():
+        setattr(stats, name, value)
+    stats.updated_at = datetime.utcnow()
+    db.session.commit()
+    return stats
+
+def get_site_stats():
+    """Platform counters for the dashboard; built on first use"""
+    stats = SiteStats.query.get(SITE_STATS_ID)
+    if stats is None:
+        stats = recompute_site_stats()
+    return stats
+
+def check_stats_consistency():
+    """
+    Compare stored counters with freshly computed values.
+    Returns (user_mismatches, site_mismatches): a list of
+    (user_id, stored, computed) tuples and a dict of name -> (stored, computed).
+    """
+    active, completed, spent = _computed_user_stats()
+    rows = db.session.execute(
+        select(
+            User.id,
+            func.coalesce(User.active_bookings, 0), active,
+            func.coalesce(User.completed_stays, 0), completed,
+            func.coalesce(User.completed_spent, 0), spent
+        ).where(or_(
+            func.coalesce(User.active_bookings, 0) != active,
+            func.coalesce(User.completed_stays, 0) != completed,
+            func.abs(func.coalesce(User.completed_spent, 0) - spent) > 0.005
+        ))
+    ).all()
+    user_mismatches = [(row[0], row[1::2], row[2::2]) for row in rows]
+
+    site_mismatches = {}
+    stats = SiteStats.query.get(SITE_STATS_ID)
+    for name, value in _computed_site_stats().items():
+        stored = getattr(stats, name) if stats else None
+        if stored != value:
+            site_mismatches[name] = (stored, value)
+    return user_mismatches, site_mismatches
@@ -1,5 +1,6 @@
 from datetime import datetime
 from flask_login import UserMixin
+from sqlalchemy import event, select
 from werkzeug.security import generate_password_hash, check_password_hash
 from .extensions import db, login_manager
 
@@ -53,6 +54,11 @@ class User(UserMixin, db.Model):
     current_year_nights = db.Column(db.Integer, default=0)  # Nights stayed in current tier year
     current_year_points = db.Column(db.Integer, default=0)  # Points earned in current tier year
     
+    # Lifetime booking stats, rolled up incrementally (see main/stats.py)
+    active_bookings = db.Column(db.Integer, default=0)  # Confirmed bookings not yet settled
+    completed_stays = db.Column(db.Integer, default=0)  # Confirmed bookings settled after check-out
+    completed_spent = db.Column(db.Numeric(12, 2), default=0)  # Sum of total_cost over completed stays
+    
     # Profile Information
     phone = db.Column(db.String(20))
     address = db.Column(db.String(200))
@@ -372,6 +378,14 @@ class Hotel(db.Model):
     # Breakfast pricing (varies by hotel star rating: 5-star=$50, 4-star=$40, 3-star=$30, 2-star=$20, 1-star=$10)
     breakfast_price = db.Column(db.Numeric(10, 2), default=25.00)
     
+    # Bumped whenever anything shown on the hotel's public pages changes
+    # (hotel details, room types, prices, reviews); drives ETags (see main/page_cache.py)
+    content_version = db.Column(db.Integer, default=1)
+    content_updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Search, destinations and city pages filter by city (and brand)
+    __table_args__ = (db.Index('ix_hotel_city_brand', 'city', 'brand_id'),)
+    
     room_types = db.relationship('RoomType', backref='hotel', lazy=True)
     reviews = db.relationship('Review', backref='hotel', lazy=True, cascade="all, delete-orphan")
 
@@ -384,6 +398,12 @@ class Review(db.Model):
     comment = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Hotel pages and the admin review list go by hotel; My Stays looks reviews up by booking
+    __table_args__ = (
+        db.Index('ix_review_hotel_created', 'hotel_id', 'created_at'),
+        db.Index('ix_review_booking', 'booking_id'),
+    )
+    
     booking = db.relationship('Booking', backref='review', lazy=True)
 
 class RoomType(db.Model):
@@ -397,7 +417,10 @@ class RoomType(db.Model):
     description = db.Column(db.Text)
     image_url = db.Column(db.String(200))
 
-    amenities = db.relationship('Amenity', secondary=roomtype_amenity, lazy='subquery',
+    # Search joins room types to hotels; staff views list them per hotel
+    __table_args__ = (db.Index('ix_room_type_hotel', 'hotel_id'),)
+
+    amenities = db.relationship('Amenity', secondary=roomtype_amenity, lazy=True,
         backref=db.backref('room_types', lazy=True))
     
     bookings = db.relationship('Booking', backref='room_type', lazy=True)
@@ -435,6 +458,9 @@ class Booking(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     roomtype_id = db.Column(db.Integer, db.ForeignKey('room_type.id'), nullable=False)
+    # Copy of room_type.hotel_id so staff views filter by hotel without the room type
+    # subquery; set on insert (below) and backfilled by scripts/tools/migrate_schema.py
+    hotel_id = db.Column(db.Integer, db.ForeignKey('hotel.id'), nullable=True)
     check_in = db.Column(db.Date, nullable=False)
     check_out = db.Column(db.Date, nullable=False)
     rooms_count = db.Column(db.Integer, default=1, nullable=False)
@@ -460,8 +486,29 @@ class Booking(db.Model):
     # Payment method
     payment_method = db.Column(db.String(20), default='pay_now')  # pay_now, pay_at_hotel, points
     
+    # Set once the completed stay has been counted into the guest's stats rollup
+    stats_settled = db.Column(db.Boolean, default=False)
+    
+    # Availability checks filter by room type, status and date overlap; rooms_count
+    # makes the index covering for the booked-rooms sum. Guest pages list a user's
+    # bookings by check-in date, staff pages a hotel's by check-in date, with or
+    # without a status filter
+    __table_args__ = (
+        db.Index('ix_booking_availability', 'roomtype_id', 'status', 'check_in', 'check_out', 'rooms_count'),
+        db.Index('ix_booking_user_check_in', 'user_id', 'check_in'),
+        db.Index('ix_booking_hotel_status_check_in', 'hotel_id', 'status', 'check_in'),
+        db.Index('ix_booking_hotel_check_in', 'hotel_id', 'check_in', 'id'),
+    )
+    
     user = db.relationship('User', backref='bookings', lazy=True)
 
+@event.listens_for(Booking, 'before_insert')
+def _set_booking_hotel(mapper, connection, booking):
+    """Fill in hotel_id from the room type for bookings created without it"""
+    if booking.hotel_id is None and booking.roomtype_id is not None:
+        booking.hotel_id = connection.scalar(
+            select(RoomType.hotel_id).where(RoomType.id == booking.roomtype_id))
+
 class PointsTransaction(db.Model):
     """Track all points activity for transparency"""
     id = db.Column(db.Integer, primary_key=True)
@@ -472,9 +519,37 @@ class PointsTransaction(db.Model):
     description = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Per-booking award checks and the account activity feed
+    __table_args__ = (
+        db.Index('ix_points_transaction_booking_type', 'booking_id', 'transaction_type'),
+        db.Index('ix_points_transaction_user_created', 'user_id', 'created_at'),
+    )
+    
     user = db.relationship('User', backref='points_transactions', lazy=True)
     booking = db.relationship('Booking', backref='points_transaction', lazy=True)
 
+class PointsLot(db.Model):
+    """Earned points tracked as a dated lot, consumed FIFO on redemption and expired by age"""
+    __tablename__ = 'points_lot'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    transaction_id = db.Column(db.Integer, db.ForeignKey('points_transaction.id'), nullable=True)  # Ledger row that credited this lot
+    points = db.Column(db.Integer, nullable=False)  # Points originally credited
+    remaining = db.Column(db.Integer, nullable=False)  # Points still redeemable from this lot
+    earned_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expired_at = db.Column(db.DateTime)  # Set by the expiry job when the remainder is written off
+
+    # (user_id, earned_at) drives FIFO consumption. The expiry job walks open lots
+    # in id order; the partial index leaves out the expired ones (remaining = 0)
+    __table_args__ = (
+        db.Index('ix_points_lot_user_earned', 'user_id', 'earned_at'),
+        db.Index('ix_points_lot_earned_at', 'earned_at'),
+        db.Index('ix_points_lot_open', 'id', 'earned_at',
+                 sqlite_where=db.text('remaining > 0'), postgresql_where=db.text('remaining > 0')),
+    )
+
+    transaction = db.relationship('PointsTransaction', lazy=True)
+
 class MilestoneReward(db.Model):
     """Track milestone rewards earned by users"""
     id = db.Column(db.Integer, primary_key=True)
@@ -488,6 +563,9 @@ class MilestoneReward(db.Model):
     claimed_at = db.Column(db.DateTime)  # When user selected their reward
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # "Already claimed this milestone?" checks on the account pages
+    __table_args__ = (db.Index('ix_milestone_reward_user_nights', 'user_id', 'milestone_nights'),)
+    
     user = db.relationship('User', backref='milestone_rewards', lazy=True)
     
     def get_available_breakfasts(self):
@@ -507,6 +585,9 @@ class UserEvent(db.Model):
     reward_amount = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # "Already awarded this year?" checks for birthday and holiday rewards
+    __table_args__ = (db.Index('ix_user_event_user_type_year', 'user_id', 'event_type', 'event_year'),)
+    
     user = db.relationship('User', backref='events', lazy=True)
 
 class FavoriteHotel(db.Model):
@@ -540,6 +621,34 @@ class PaymentMethod(db.Model):
     
     user = db.relationship('User', backref='payment_methods', lazy=True)
 
+class SiteStats(db.Model):
+    """Single-row platform counters for the admin dashboard (see main/stats.py)"""
+    __tablename__ = 'site_stats'
+    id = db.Column(db.Integer, primary_key=True)
+    total_users = db.Column(db.Integer, default=0)
+    total_customers = db.Column(db.Integer, default=0)
+    total_staff = db.Column(db.Integer, default=0)
+    total_hotels = db.Column(db.Integer, default=0)
+    total_bookings = db.Column(db.Integer, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class CacheEvent(db.Model):
+    """Cross-worker cache invalidation log, polled by every worker (see main/invalidation.py)"""
+    __tablename__ = 'cache_event'
+    __table_args__ = {'sqlite_autoincrement': True}  # Ids must never be reused; workers track the last id seen
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(30), nullable=False)  # refdata, hotel
+    key = db.Column(db.String(100))  # e.g. hotel id; NULL invalidates every entry of that kind
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+class LoginAttempt(db.Model):
+    """Failed login, shared by all workers when LOGIN_ATTEMPT_STORE=database (see utils/login_throttle.py)"""
+    __tablename__ = 'login_attempt'
+    __table_args__ = (db.Index('ix_login_attempt_key_failed', 'key', 'failed_at'),)
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(200), nullable=False)  # 'account:<email>' or 'ip:<address>'
+    failed_at = db.Column(db.Float, nullable=False, index=True)  # Unix time
+
 class ContactMessage(db.Model):
     """Store contact form messages from customers"""
     id = db.Column(db.Integer, primary_key=True)
@@ -17,6 +17,7 @@ CREATE TABLE booking (
   id INTEGER PRIMARY KEY,
   user_id INTEGER NOT NULL,
   roomtype_id INTEGER NOT NULL,
+  hotel_id INTEGER,
   check_in DATE NOT NULL,
   check_out DATE NOT NULL,
   rooms_count INTEGER NOT NULL,
@@ -32,8 +33,13 @@ CREATE TABLE booking (
   breakfast_included BOOLEAN,
   breakfast_price_per_room NUMERIC(10, 2),
   breakfast_voucher_used INTEGER,
-  payment_method VARCHAR(20)
+  payment_method VARCHAR(20),
+  stats_settled BOOLEAN
 );
+CREATE INDEX ix_booking_availability ON booking (roomtype_id, status, check_in, check_out, rooms_count);
+CREATE INDEX ix_booking_user_check_in ON booking (user_id, check_in);
+CREATE INDEX ix_booking_hotel_status_check_in ON booking (hotel_id, status, check_in);
+CREATE INDEX ix_booking_hotel_check_in ON booking (hotel_id, check_in, id);
 
 -- Table: brand
 CREATE TABLE brand (
@@ -43,6 +49,15 @@ CREATE TABLE brand (
   logo_color VARCHAR(20)
 );
 
+-- Table: cache_event
+CREATE TABLE cache_event (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  kind VARCHAR(30) NOT NULL,
+  key VARCHAR(100),
+  created_at DATETIME
+);
+CREATE INDEX ix_cache_event_created_at ON cache_event (created_at);
+
 -- Table: contact_message
 CREATE TABLE contact_message (
   id INTEGER PRIMARY KEY,
@@ -75,8 +90,20 @@ CREATE TABLE hotel (
   stars INTEGER,
   latitude FLOAT,
   longitude FLOAT,
-  breakfast_price NUMERIC(10, 2)
+  breakfast_price NUMERIC(10, 2),
+  content_version INTEGER,
+  content_updated_at DATETIME
 );
+CREATE INDEX ix_hotel_city_brand ON hotel (city, brand_id);
+
+-- Table: login_attempt
+CREATE TABLE login_attempt (
+  id INTEGER PRIMARY KEY,
+  key VARCHAR(200) NOT NULL,
+  failed_at FLOAT NOT NULL
+);
+CREATE INDEX ix_login_attempt_key_failed ON login_attempt (key, failed_at);
+CREATE INDEX ix_login_attempt_failed_at ON login_attempt (failed_at);
 
 -- Table: milestone_reward
 CREATE TABLE milestone_reward (
@@ -91,6 +118,7 @@ CREATE TABLE milestone_reward (
   claimed_at DATETIME,
   created_at DATETIME
 );
+CREATE INDEX ix_milestone_reward_user_nights ON milestone_reward (user_id, milestone_nights);
 
 -- Table: payment_method
 CREATE TABLE payment_method (
@@ -105,6 +133,20 @@ CREATE TABLE payment_method (
   created_at DATETIME
 );
 
+-- Table: points_lot
+CREATE TABLE points_lot (
+  id INTEGER PRIMARY KEY,
+  user_id INTEGER NOT NULL,
+  transaction_id INTEGER,
+  points INTEGER NOT NULL,
+  remaining INTEGER NOT NULL,
+  earned_at DATETIME NOT NULL,
+  expired_at DATETIME
+);
+CREATE INDEX ix_points_lot_user_earned ON points_lot (user_id, earned_at);
+CREATE INDEX ix_points_lot_earned_at ON points_lot (earned_at);
+CREATE INDEX ix_points_lot_open ON points_lot (id, earned_at) WHERE remaining > 0;
+
 -- Table: points_transaction
 CREATE TABLE points_transaction (
   id INTEGER PRIMARY KEY,
@@ -115,6 +157,8 @@ CREATE TABLE points_transaction (
   description VARCHAR(200),
   created_at DATETIME
 );
+CREATE INDEX ix_points_transaction_booking_type ON points_transaction (booking_id, transaction_type);
+CREATE INDEX ix_points_transaction_user_created ON points_transaction (user_id, created_at);
 
 -- Table: review
 CREATE TABLE review (
@@ -126,6 +170,8 @@ CREATE TABLE review (
   comment TEXT,
   created_at DATETIME
 );
+CREATE INDEX ix_review_hotel_created ON review (hotel_id, created_at);
+CREATE INDEX ix_review_booking ON review (booking_id);
 
 -- Table: room_type
 CREATE TABLE room_type (
@@ -138,6 +184,7 @@ CREATE TABLE room_type (
   description TEXT,
   image_url VARCHAR(200)
 );
+CREATE INDEX ix_room_type_hotel ON room_type (hotel_id);
 
 -- Table: roomtype_amenity
 CREATE TABLE roomtype_amenity (
@@ -145,6 +192,17 @@ CREATE TABLE roomtype_amenity (
   amenity_id INTEGER PRIMARY KEY
 );
 
+-- Table: site_stats
+CREATE TABLE site_stats (
+  id INTEGER PRIMARY KEY,
+  total_users INTEGER,
+  total_customers INTEGER,
+  total_staff INTEGER,
+  total_hotels INTEGER,
+  total_bookings INTEGER,
+  updated_at DATETIME
+);
+
 -- Table: staff_hotel
 CREATE TABLE staff_hotel (
   user_id INTEGER PRIMARY KEY,
@@ -168,6 +226,9 @@ CREATE TABLE user (
   tier_expiry_date DATE,
   current_year_nights INTEGER,
   current_year_points INTEGER,
+  active_bookings INTEGER,
+  completed_stays INTEGER,
+  completed_spent NUMERIC(12, 2),
   phone VARCHAR(20),
   address VARCHAR(200),
   city VARCHAR(100),
@@ -187,3 +248,4 @@ CREATE TABLE user_event (
   reward_amount INTEGER,
   created_at DATETIME
 );
+CREATE INDEX ix_user_event_user_type_year ON user_event (user_id, event_type, event_year);
@@ -27,6 +27,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 from hotelweb.app import create_app
 from hotelweb.extensions import db
 from hotelweb.models import User, Hotel, RoomType, Amenity, Booking, Brand, Review, PointsTransaction
+from hotelweb.main.points import credit_points_lot
+from hotelweb.main.stats import recompute_user_stats, recompute_site_stats
 
 app = create_app()
 
@@ -380,6 +382,7 @@ def seed():
                 created_at=booking.created_at
             )
             db.session.add(transaction)
+            credit_points_lot(transaction)
             
             return booking
         
@@ -564,6 +567,11 @@ def seed():
         else:
             print("  Staff already exists")
         
+        # Seeded bookings bypass the booking routes, so rebuild the stats rollup
+        print("Rebuilding stats rollup...")
+        recompute_user_stats()
+        recompute_site_stats()
+        
         print("Done!")
 
 if __name__ == '__main__':
@@ -0,0 +1,141 @@
+"""
+Benchmark SQLite read/write concurrency with and without the production profile
+
+Runs the same mixed workload twice, each time on a fresh copy of the database:
+reader threads repeat the availability query behind search and room pages while
+writer threads insert bookings, one transaction each. The first run uses plain
+SQLite defaults, the second applies the DATABASE_PROFILE=production pragmas.
+It reports throughput, latency and "database is locked" errors for each run.
+The original database is never modified.
+
+    python hotelweb/scripts/tools/benchmark_sqlite_concurrency.py
+    python hotelweb/scripts/tools/benchmark_sqlite_concurrency.py --readers 8 --writers 4 --seconds 10
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from hotelweb.app import create_app, sqlite_pragmas, apply_sqlite_pragmas
+
+AVAILABILITY_SQL = text(
+    "SELECT rt.inventory - COALESCE(SUM(b.rooms_count), 0) FROM room_type rt "
+    "LEFT JOIN booking b ON b.roomtype_id = rt.id AND b.status = 'CONFIRMED' "
+    "AND b.check_in < :check_out AND b.check_out > :check_in "
+    "WHERE rt.id = :roomtype_id GROUP BY rt.id"
+)
+INSERT_SQL = text(
+    "INSERT INTO booking (user_id, roomtype_id, check_in, check_out, rooms_count, status, created_at, total_cost) "
+    "VALUES (:user_id, :roomtype_id, :check_in, :check_out, 1, 'CONFIRMED', :created_at, 100)"
+)
+
+def run_workload(path, pragmas, readers, writers, seconds, pool_size):
+    engine = create_engine(f'sqlite:///{path}', pool_size=pool_size, max_overflow=0)
+    if pragmas:
+        apply_sqlite_pragmas(engine, pragmas)
+    with engine.connect() as conn:
+        roomtype_ids = [row[0] for row in conn.execute(text('SELECT id FROM room_type'))]
+        user_id = conn.execute(text('SELECT MIN(id) FROM user')).scalar()
+    if not roomtype_ids or user_id is None:
+        raise SystemExit('The database has no room types or users; seed it first (scripts/seed_data.py).')
+
+    results = {'reads': [], 'writes': [], 'read_errors': 0, 'write_errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def reader(n):
+        check_in = date.today() + timedelta(days=7)
+        i = n
+        while time.perf_counter() < deadline:
+            i += 1
+            started = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(AVAILABILITY_SQL, {
+                        'roomtype_id': roomtype_ids[i % len(roomtype_ids)],
+                        'check_in': check_in, 'check_out': check_in + timedelta(days=2)
+                    }).scalar()
+                with lock:
+                    results['reads'].append(time.perf_counter() - started)
+            except OperationalError:
+                with lock:
+                    results['read_errors'] += 1
+
+    def writer(n):
+        i = n
+        while time.perf_counter() < deadline:
+            i += 1
+            check_in = date.today() + timedelta(days=30 + i % 300)
+            started = time.perf_counter()
+            try:
+                with engine.begin() as conn:
+                    conn.execute(INSERT_SQL, {
+                        'user_id': user_id, 'roomtype_id': roomtype_ids[i % len(roomtype_ids)],
+                        'check_in': check_in, 'check_out': check_in + timedelta(days=1),
+                        'created_at': datetime.utcnow()
+                    })
+                with lock:
+                    results['writes'].append(time.perf_counter() - started)
+            except OperationalError:
+                with lock:
+                    results['write_errors'] += 1
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n * 1000,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return results
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def report(label, results, seconds):
+    print(f"\n{label}")
+    for kind in ('reads', 'writes'):
+        timings = results[kind]
+        errors = results[f'{kind[:-1]}_errors']
+        print(f"  {kind:<6} {len(timings) / seconds:9.1f}/s   p50 {_percentile(timings, 0.5) * 1000:7.2f} ms"
+              f"   p99 {_percentile(timings, 0.99) * 1000:7.2f} ms   locked errors: {errors}")
+
+def benchmark_sqlite_concurrency():
+    parser = argparse.ArgumentParser(description='Compare SQLite concurrency with default and production settings.')
+    parser.add_argument('--readers', type=int, default=8, help='Reader threads (default: 8)')
+    parser.add_argument('--writers', type=int, default=2, help='Writer threads (default: 2)')
+    parser.add_argument('--seconds', type=float, default=5, help='Duration of each run (default: 5)')
+    args = parser.parse_args()
+
+    app = create_app()
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if not uri.startswith('sqlite:///'):
+        raise SystemExit(f'This benchmark needs a file-based SQLite database, got {uri}')
+    source = uri[len('sqlite:///'):]
+    pool_size = args.readers + args.writers
+
+    print(f"Database: {source}")
+    print(f"Workload: {args.readers} readers, {args.writers} writers, {args.seconds:g}s per run")
+    with tempfile.TemporaryDirectory() as workdir:
+        # The copy inherits the source's journal mode, so reset it for the baseline
+        runs = [('SQLite defaults', [('journal_mode', 'DELETE')]), ('Production profile', sqlite_pragmas(app.config))]
+        for n, (label, pragmas) in enumerate(runs):
+            path = os.path.join(workdir, f'run{n}.db')
+            shutil.copyfile(source, path)
+            results = run_workload(path, pragmas, args.readers, args.writers, args.seconds, pool_size)
+            report(label, results, args.seconds)
+
+if __name__ == '__main__':
+    benchmark_sqlite_concurrency()
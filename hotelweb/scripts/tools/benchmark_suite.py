@@ -0,0 +1,293 @@
+"""
+Benchmark the hot request paths against a synthetic dataset
+
+Build a deterministic dataset once (scales: tiny, small, medium, production;
+see synthetic_data.py), then time search, hotel detail, booking confirm and
+book, My Stays, Account and the staff/admin list pages through the Flask test
+client. Each run works on a copy of the dataset, so bookings made by one run
+do not change the next.
+
+Results are saved as JSON (p50/p95/mean/max in ms and queries per request).
+Pass --baseline to compare with an earlier run: the command exits with status
+1 if a scenario's p50 grew by more than --threshold (default 20%) or it runs
+more queries than before.
+
+    python hotelweb/scripts/tools/benchmark_suite.py build --scale small --output /tmp/bench.db
+    python hotelweb/scripts/tools/benchmark_suite.py run --database /tmp/bench.db --output baseline.json
+    python hotelweb/scripts/tools/benchmark_suite.py run --database /tmp/bench.db --output new.json --baseline baseline.json
+"""
+import io
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import random
+import platform
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from datetime import date, datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from sqlalchemy import create_engine, func, select
+from hotelweb.config import Config
+from hotelweb.models import Hotel, RoomType, User, Booking
+from hotelweb.scripts.tools.synthetic_data import (
+    SCALES, CITIES, BENCH_GUEST_ID, build_dataset, finish_dataset, scale_counts, staff_user_id, admin_user_id
+)
+
+QUERY_COUNT = re.compile(r'desc="(\d+) queries"')
+MIN_REGRESSION_MS = 1.0  # Ignore p50 changes smaller than this, they are noise
+
+def bench_config(path, page_cache=False):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_BINDS = {}
+        TESTING = True
+        PAGE_CACHE_ENABLED = page_cache
+        SQL_INSTRUMENTATION = True  # For the Server-Timing query count
+        STREAM_TEMPLATES = False  # Render inside the view, so the count includes template queries
+        SQL_BUDGET_QUERIES = 10 ** 9
+        SQL_BUDGET_MS = 10 ** 9
+        SQL_N_PLUS_ONE_THRESHOLD = 10 ** 9
+        METRICS_ENABLED = False
+        PROFILING_ENABLED = False
+        ADMISSION_CONTROL = False  # Every request comes from one client
+    return BenchConfig
+
+def dataset_counts(path):
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.connect() as conn:
+        counts = {
+            'hotels': conn.execute(select(func.count(Hotel.id))).scalar(),
+            'room_types': conn.execute(select(func.count(RoomType.id))).scalar(),
+            'users': conn.execute(select(func.count(User.id)).where(User.role == 'customer')).scalar(),
+            'bookings': conn.execute(select(func.count(Booking.id))).scalar(),
+        }
+    engine.dispose()
+    return counts
+
+def scenarios(counts, seed):
+    """(name, method, url or (url, form), user id or None) for every timed request"""
+    rng = random.Random(seed)
+    today = date.today()
+    cities = CITIES[:min(len(CITIES), counts['hotels'])]
+    staff, admin = staff_user_id(counts), admin_user_id(counts)
+
+    def dates():
+        check_in = today + timedelta(days=rng.randint(1, 120))
+        return check_in.isoformat(), (check_in + timedelta(days=rng.randint(1, 5))).isoformat()
+
+    def search():
+        check_in, check_out = dates()
+        return f'/search?city={rng.choice(cities)}&check_in={check_in}&check_out={check_out}&guests={rng.randint(1, 2)}'
+
+    def hotel():
+        return f'/hotel/{rng.randint(1, counts["hotels"])}'
+
+    def confirm():
+        check_in, check_out = dates()
+        return f'/book/{rng.randint(1, counts["room_types"])}/confirm?check_in={check_in}&check_out={check_out}&rooms_needed=1'
+
+    def book():
+        check_in, check_out = dates()
+        form = dict(check_in=check_in, check_out=check_out, rooms_needed='1', payment_method='pay_by_card',
+                    card_selection='new_card', csrf_token='benchmark')
+        return f'/book/{rng.randint(1, counts["room_types"])}', form
+
+    return [
+        ('search', 'GET', search, None),
+        ('hotel_detail', 'GET', hotel, None),
+        ('booking_confirm', 'GET', confirm, BENCH_GUEST_ID),
+        ('book_room', 'POST', book, BENCH_GUEST_ID),
+        ('my_stays', 'GET', lambda: '/my/stays', BENCH_GUEST_ID),
+        ('account', 'GET', lambda: '/account', BENCH_GUEST_ID),
+        ('staff_bookings', 'GET', lambda: '/staff/bookings', staff),
+        ('staff_hotels', 'GET', lambda: '/staff/hotels', staff),
+        ('staff_rooms', 'GET', lambda: '/staff/rooms', staff),
+        ('admin_dashboard', 'GET', lambda: '/admin/dashboard', admin),
+        ('admin_users', 'GET', lambda: '/admin/users', admin),
+        ('admin_hotels', 'GET', lambda: '/admin/hotels', admin),
+    ]
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def run_scenario(client, method, make_request, user_id, iterations, warmup):
+    with client.session_transaction() as session:
+        session.clear()
+        session['csrf_token'] = 'benchmark'
+        if user_id is not None:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+
+    timings, queries, statuses = [], [], {}
+    for i in range(warmup + iterations):
+        target = make_request()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # Some views print debug output
+            if method == 'POST':
+                url, form = target
+                response = client.post(url, data=form)
+            else:
+                response = client.get(target)
+        elapsed = (time.perf_counter() - started) * 1000
+        if i < warmup:
+            continue
+        timings.append(elapsed)
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+        match = QUERY_COUNT.search(response.headers.get('Server-Timing', ''))
+        if match:
+            queries.append(int(match.group(1)))
+
+    return {
+        'p50_ms': round(percentile(timings, 0.5), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'mean_ms': round(sum(timings) / len(timings), 2),
+        'max_ms': round(max(timings), 2),
+        'queries': round(sum(queries) / len(queries), 1) if queries else None,
+        'statuses': statuses,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def run_benchmarks(database, iterations, warmup, seed, page_cache, only=None):
+    from hotelweb.app import create_app
+    from hotelweb.extensions import db
+
+    counts = dataset_counts(database)
+    workdir = tempfile.mkdtemp(prefix='hotelweb-bench-')
+    path = os.path.join(workdir, 'bench.db')
+    shutil.copyfile(database, path)
+    try:
+        app = create_app(bench_config(path, page_cache))
+        client = app.test_client()
+        results = {}
+        for name, method, make_request, user_id in scenarios(counts, seed):
+            if only and name not in only:
+                continue
+            results[name] = run_scenario(client, method, make_request, user_id, iterations, warmup)
+            print(f"  {name:<18} p50 {results[name]['p50_ms']:>8.1f} ms  p95 {results[name]['p95_ms']:>8.1f} ms  "
+                  f"queries {results[name]['queries']}")
+        with app.app_context():
+            db.engine.dispose()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'database': os.path.abspath(database),
+            'dataset': counts,
+            'iterations': iterations,
+            'warmup': warmup,
+            'seed': seed,
+            'page_cache': page_cache,
+        },
+        'results': results,
+    }
+
+def compare(current, baseline, threshold):
+    """Print a comparison table; returns the names of regressed scenarios"""
+    regressions = []
+    print(f"\n{'scenario':<18} {'base p50':>10} {'new p50':>10} {'change':>8} {'queries':>12}")
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"{name:<18} {'-':>10} {result['p50_ms']:>10.1f} {'new':>8}")
+            continue
+        change = (result['p50_ms'] - base['p50_ms']) / base['p50_ms'] if base['p50_ms'] else 0.0
+        slower = change > threshold and result['p50_ms'] - base['p50_ms'] > MIN_REGRESSION_MS
+        more_queries = (result['queries'] or 0) > (base['queries'] or 0)
+        flag = '  REGRESSION' if slower or more_queries else ''
+        print(f"{name:<18} {base['p50_ms']:>10.1f} {result['p50_ms']:>10.1f} {change:>+8.0%} "
+              f"{str(base['queries']) + ' -> ' + str(result['queries']):>12}{flag}")
+        if flag:
+            regressions.append(name)
+    if baseline['meta'].get('dataset') != current['meta'].get('dataset'):
+        print("\nWarning: the baseline was recorded on a different dataset")
+    return regressions
+
+def build_command(args):
+    if os.path.exists(args.output):
+        if not args.force:
+            raise SystemExit(f'{args.output} exists; pass --force to replace it')
+        os.remove(args.output)
+    overrides = {name: getattr(args, name) for name in SCALES['tiny']}
+    counts = scale_counts(args.scale, **overrides)
+    print(f"Building {args.scale} dataset in {args.output} (seed {args.seed}): "
+          + ', '.join(f'{value:,} {name}' for name, value in counts.items()))
+    started = time.perf_counter()
+    build_dataset(args.output, args.scale, args.seed, workers=args.workers, **overrides)
+
+    from hotelweb.app import create_app
+    from hotelweb.extensions import db
+    print("  stats and points lots...")
+    app = create_app(bench_config(args.output))
+    finish_dataset(app)
+    with app.app_context():
+        db.engine.dispose()
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+def run_command(args):
+    if not os.path.exists(args.database):
+        raise SystemExit(f'{args.database} not found; create it with the build command first')
+    print(f"Benchmarking {args.database} ({args.iterations} iterations, {args.warmup} warm-up)")
+    report = run_benchmarks(args.database, args.iterations, args.warmup, args.seed, args.page_cache, args.only)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} scenario(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the hot paths on a synthetic dataset.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='Generate a dataset')
+    build.add_argument('--scale', choices=SCALES, default='small')
+    build.add_argument('--seed', type=int, default=42)
+    build.add_argument('--output', default='bench.db', help='SQLite file to create')
+    build.add_argument('--force', action='store_true', help='Replace the output file if it exists')
+    build.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Generator processes')
+    for name in SCALES['tiny']:
+        build.add_argument(f'--{name.replace("_", "-")}', dest=name, type=int, help=f'Override the number of {name}')
+    build.set_defaults(handler=build_command)
+
+    run = commands.add_parser('run', help='Time the scenarios on a dataset')
+    run.add_argument('--database', default='bench.db')
+    run.add_argument('--output', help='Write the results to this JSON file')
+    run.add_argument('--baseline', help='Compare with the results of an earlier run')
+    run.add_argument('--threshold', type=float, default=0.2, help='Allowed p50 slowdown (0.2 = 20%%)')
+    run.add_argument('--iterations', type=int, default=20)
+    run.add_argument('--warmup', type=int, default=3)
+    run.add_argument('--seed', type=int, default=42, help='Seed for the request mix (cities, dates, ids)')
+    run.add_argument('--page-cache', action='store_true', help='Leave the page cache on')
+    run.add_argument('--only', nargs='+', help='Run only these scenarios')
+    run.set_defaults(handler=run_command)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+if __name__ == '__main__':
+    main()
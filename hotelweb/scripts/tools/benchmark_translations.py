@@ -0,0 +1,56 @@
+"""
+Benchmark translation lookups and the render cost of a translation-heavy page
+
+Renders /account (account.html, a few hundred t() calls) for a logged-in test
+user in every supported language and reports the mean time per render, plus
+the cost of a single lookup through the per-request bound translator versus
+the session-based get_translation().
+
+    python hotelweb/scripts/tools/benchmark_translations.py
+    python hotelweb/scripts/tools/benchmark_translations.py --renders 200 --email gold01@test.com
+"""
+import os
+import sys
+import time
+import argparse
+import timeit
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from hotelweb.app import create_app
+from hotelweb.main.language import SUPPORTED_LANGUAGES, get_translator, get_translation
+
+def benchmark_translations():
+    parser = argparse.ArgumentParser(description='Benchmark translation lookups and account page rendering.')
+    parser.add_argument('--renders', type=int, default=100, help='Renders per language (default: 100)')
+    parser.add_argument('--email', default='gold01@test.com', help='Account to render the page for')
+    parser.add_argument('--password', default='testuser123')
+    args = parser.parse_args()
+
+    app = create_app()
+    session = {'language': 'zh'}
+    bound = get_translator('zh')
+    lookups = 100000
+    bound_time = timeit.timeit(lambda: bound('my_account'), number=lookups)
+    session_time = timeit.timeit(lambda: get_translation(session, 'my_account'), number=lookups)
+    print(f"Lookup (bound translator):  {bound_time / lookups * 1e9:7.0f} ns")
+    print(f"Lookup (get_translation):   {session_time / lookups * 1e9:7.0f} ns")
+
+    client = app.test_client()
+    client.post('/auth/login', data={'email': args.email, 'password': args.password})
+    if client.get('/account').status_code != 200:
+        print(f"Could not log in as {args.email}; seed the database first (scripts/seed_data.py).")
+        sys.exit(1)
+
+    for lang_code in SUPPORTED_LANGUAGES:
+        client.get(f'/set_language/{lang_code}')
+        client.get('/account')  # Warm templates and the catalog
+        started = time.perf_counter()
+        for _ in range(args.renders):
+            client.get('/account')
+        elapsed = time.perf_counter() - started
+        print(f"/account [{lang_code}]: {elapsed / args.renders * 1000:.2f} ms per render ({args.renders} renders)")
+
+if __name__ == '__main__':
+    benchmark_translations()
@@ -0,0 +1,111 @@
+"""
+Build fingerprinted, minified and precompressed static assets
+
+Writes every bundle in utils/assets.py and every file under static/js and
+static/css to static/dist/<name>.<hash>.<ext>, with .gz and (when the brotli
+package is installed) .br variants, and a manifest.json that static_url() and
+asset_tags() read at startup. Run it on deploy, before starting the app:
+
+    python hotelweb/scripts/tools/build_assets.py
+
+CSS is minified here; JS is minified with rjsmin when it is installed and
+otherwise only concatenated (compression still removes most of the
+whitespace). Files from earlier builds are deleted unless --keep-old is given,
+which lets pages rendered by still-running workers load the old names.
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from hotelweb.utils.assets import BUNDLES, DIST_DIR, MANIFEST_NAME
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+STATIC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'static'))
+SOURCE_DIRS = ('js', 'css')
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_SPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+
+def minify_css(source):
+    source = _CSS_COMMENT.sub('', source)
+    source = _CSS_SPACE.sub(' ', source)
+    source = _CSS_PUNCTUATION.sub(r'\1', source)
+    return source.replace(';}', '}').strip()
+
+def minify_js(source):
+    return rjsmin.jsmin(source) if rjsmin else source
+
+def _read(relative_path):
+    with open(os.path.join(STATIC_DIR, relative_path), encoding='utf-8') as f:
+        return f.read()
+
+def build(sources):
+    """Minified content of a bundle or single file"""
+    if sources[0].endswith('.css'):
+        return minify_css('\n'.join(_read(path) for path in sources))
+    # A semicolon between files keeps one file's last statement from running into the next
+    return minify_js('\n;\n'.join(_read(path) for path in sources))
+
+def write_asset(dist_dir, logical_name, content):
+    """Write name.<hash>.ext plus compressed variants; returns the path under static/"""
+    data = content.encode('utf-8')
+    stem, ext = os.path.splitext(os.path.basename(logical_name))
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    filename = f'{stem}.{digest}{ext}'
+    path = os.path.join(dist_dir, filename)
+    with open(path, 'wb') as f:
+        f.write(data)
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(data, quality=11))
+    return f'{DIST_DIR}/{filename}', len(data)
+
+def build_assets():
+    parser = argparse.ArgumentParser(description='Build fingerprinted static assets.')
+    parser.add_argument('--keep-old', action='store_true', help='Keep files from earlier builds')
+    args = parser.parse_args()
+
+    dist_dir = os.path.join(STATIC_DIR, DIST_DIR)
+    if os.path.isdir(dist_dir) and not args.keep_old:
+        shutil.rmtree(dist_dir)
+    os.makedirs(dist_dir, exist_ok=True)
+
+    targets = {name: sources for name, sources in BUNDLES.items()}
+    for directory in SOURCE_DIRS:
+        for filename in sorted(os.listdir(os.path.join(STATIC_DIR, directory))):
+            targets[f'{directory}/{filename}'] = [f'{directory}/{filename}']
+
+    manifest, original, built = {}, 0, 0
+    for name, sources in targets.items():
+        manifest[name], size = write_asset(dist_dir, name, build(sources))
+        original += sum(os.path.getsize(os.path.join(STATIC_DIR, path)) for path in sources)
+        built += size
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"Built {len(manifest)} assets into static/{DIST_DIR}: {original / 1024:.0f} KB of sources -> "
+          f"{built / 1024:.0f} KB minified (brotli {'on' if brotli else 'not installed'}, "
+          f"JS minifier {'rjsmin' if rjsmin else 'not installed'})")
+
+if __name__ == '__main__':
+    build_assets()
@@ -0,0 +1,106 @@
+"""
+Build resized WebP/JPEG variants of the site's photos
+
+Resizes every .jpg/.jpeg/.png under static/img (except the logos and
+static/img/variants itself) to the widths in utils/images.py and writes
+static/img/variants/manifest.json, which responsive_img() and
+background_style() read. Run it on deploy, after seeding or adding photos:
+
+    python hotelweb/scripts/tools/build_image_variants.py --workers 4
+
+Images whose content is unchanged since the last build are skipped, so a
+rebuild only does the new ones; variants no longer listed are deleted unless
+--keep-old is given. --database also includes hotel and room type image_url
+values that point elsewhere under static/. Needs Pillow (pip install Pillow).
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from hotelweb.utils.images import (
+    FORMATS, MANIFEST_NAME, SOURCE_DIR, SOURCE_EXTENSIONS, VARIANT_DIR, Image, generate_variants, static_filename,
+    update_manifest,
+)
+
+STATIC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'static'))
+SKIPPED_PREFIXES = ('logo_',)  # Small PNG logos gain nothing from resizing
+
+def source_images():
+    """Paths under static/ of every photo to build variants for"""
+    filenames = []
+    for root, dirs, files in os.walk(os.path.join(STATIC_DIR, SOURCE_DIR)):
+        relative_root = os.path.relpath(root, STATIC_DIR).replace(os.sep, '/')
+        if relative_root == VARIANT_DIR or relative_root.startswith(VARIANT_DIR + '/'):
+            dirs[:] = []
+            continue
+        for name in files:
+            if name.lower().endswith(SOURCE_EXTENSIONS) and not name.startswith(SKIPPED_PREFIXES):
+                filenames.append(f'{relative_root}/{name}')
+    return sorted(filenames)
+
+def database_images():
+    """Local image URLs stored on hotels and room types"""
+    from hotelweb.app import create_app
+    from hotelweb.models import Hotel, RoomType
+    app = create_app()
+    with app.app_context():
+        urls = [url for (url,) in Hotel.query.with_entities(Hotel.image_url)]
+        urls += [url for (url,) in RoomType.query.with_entities(RoomType.image_url)]
+    filenames = {static_filename(url) for url in urls}
+    return sorted(f for f in filenames if f and os.path.isfile(os.path.join(STATIC_DIR, f)))
+
+def _build(filename):
+    return filename, generate_variants(STATIC_DIR, filename)
+
+def remove_unlisted(entries):
+    """Delete variant files that no manifest entry refers to; returns how many"""
+    listed = {path for entry in entries.values() for fmt in FORMATS for path in entry[fmt].values()}
+    listed.add(f'{VARIANT_DIR}/{MANIFEST_NAME}')
+    removed = 0
+    for root, _, files in os.walk(os.path.join(STATIC_DIR, VARIANT_DIR)):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.relpath(path, STATIC_DIR).replace(os.sep, '/') not in listed:
+                os.remove(path)
+                removed += 1
+    return removed
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+
+def build_image_variants():
+    parser = argparse.ArgumentParser(description='Build responsive image variants.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Processes resizing in parallel')
+    parser.add_argument('--database', action='store_true', help='Also include image URLs stored in the database')
+    parser.add_argument('--keep-old', action='store_true', help='Keep variants no longer in the manifest')
+    args = parser.parse_args()
+
+    if Image is None:
+        sys.exit('Pillow is not installed: pip install Pillow')
+
+    filenames = source_images()
+    if args.database:
+        filenames = sorted(set(filenames) | set(database_images()))
+
+    started = time.perf_counter()
+    entries = {}
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for filename, entry in pool.map(_build, filenames, chunksize=4):
+            entries[filename] = entry
+    # Replace the manifest so removed photos drop out of it
+    update_manifest(STATIC_DIR, entries, replace=True)
+    removed = 0 if args.keep_old else remove_unlisted(entries)
+
+    original = sum(os.path.getsize(os.path.join(STATIC_DIR, f)) for f in filenames)
+    variants = directory_size(os.path.join(STATIC_DIR, VARIANT_DIR))
+    print(f'Built variants of {len(entries)} images in {time.perf_counter() - started:.1f}s: '
+          f'{original / 1024 / 1024:.1f} MB of originals, {variants / 1024 / 1024:.1f} MB in static/{VARIANT_DIR} '
+          f'({removed} old variants removed)')
+
+if __name__ == '__main__':
+    build_image_variants()
@@ -0,0 +1,127 @@
+"""
+Check that the hot pages only load what their loader profiles plan for
+
+Renders search, hotel and room pages, the guest account pages and the staff
+and admin lists with LOADER_RAISELOAD=true (main/loaders.py), so touching a
+relationship that a page's profile neither eager-loads nor marks as lazy
+raises instead of running one query per row. Exits with status 1 if any page
+fails. Pages run as the first guest with bookings, the first staff member with
+an assigned hotel and the first admin, on a copy of the database.
+
+    python hotelweb/scripts/tools/check_lazy_loads.py --database instance/hotel.db
+    python hotelweb/scripts/tools/check_lazy_loads.py --database /tmp/bench.db --verbose
+"""
+import io
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import traceback
+import contextlib
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from sqlalchemy import exc as sa_exc
+from hotelweb.config import Config
+
+def check_config(path):
+    class CheckConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_BINDS = {}
+        TESTING = True  # Let view errors propagate to the test client
+        LOADER_RAISELOAD = True
+        STREAM_TEMPLATES = False  # Render inside the view, where errors can be caught
+        PAGE_CACHE_ENABLED = False
+        ADMISSION_CONTROL = False
+        METRICS_ENABLED = False
+        PROFILING_ENABLED = False
+    return CheckConfig
+
+def pages(app):
+    """(role, user id or None, url) for every page the check renders"""
+    from hotelweb.models import Booking, Hotel, RoomType, User, staff_hotel
+    from hotelweb.extensions import db
+    with app.app_context():
+        hotel = Hotel.query.order_by(Hotel.id).first()
+        roomtype = RoomType.query.filter_by(hotel_id=hotel.id).order_by(RoomType.id).first()
+        guest_id = db.session.query(Booking.user_id).order_by(Booking.id).limit(1).scalar()
+        staff_id = db.session.query(staff_hotel.c.user_id).limit(1).scalar()
+        admin_id = db.session.query(User.id).filter(User.role == 'admin').order_by(User.id).limit(1).scalar()
+        city = hotel.city
+
+    check_in = date.today() + timedelta(days=7)
+    dates = f'check_in={check_in.isoformat()}&check_out={(check_in + timedelta(days=2)).isoformat()}'
+    result = [('anonymous', None, url) for url in (
+        '/', '/destinations', f'/city/{city}', f'/brand/{hotel.brand_id}', f'/hotel/{hotel.id}',
+        f'/roomtype/{roomtype.id}', f'/search?city={city}&{dates}&guests=1',
+    )]
+    if guest_id:
+        result += [('guest', guest_id, url) for url in (
+            '/my/stays', '/account', f'/book/{roomtype.id}/confirm?{dates}&rooms_needed=1',
+        )]
+    if staff_id:
+        result += [('staff', staff_id, url) for url in (
+            '/staff/dashboard', '/staff/bookings', '/staff/hotels', '/staff/rooms', '/staff/pricing',
+        )]
+    if admin_id:
+        result += [('admin', admin_id, url) for url in (
+            '/admin/dashboard', '/admin/users', '/admin/hotels', f'/admin/hotels/{hotel.id}/edit',
+            f'/admin/hotels/{hotel.id}/reviews', '/admin/messages',
+        )]
+    return result
+
+def run_checks(app, verbose):
+    client = app.test_client()
+    failures = 0
+    for role, user_id, url in pages(app):
+        with client.session_transaction() as session:
+            session.clear()
+            if user_id is not None:
+                session['_user_id'] = str(user_id)
+                session['_fresh'] = True
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):  # Some views print debug output
+                response = client.get(url)
+            status = 'ok' if response.status_code < 500 else f'HTTP {response.status_code}'
+            error = None
+        except sa_exc.InvalidRequestError as e:  # Raised by raiseload
+            status, error = 'UNPLANNED LAZY LOAD', e
+        except Exception as e:
+            status, error = f'ERROR {type(e).__name__}', e
+        failures += status != 'ok'
+        print(f"  {role:<10} {url:<60} {status}")
+        if error is not None:
+            print(f"      {str(error).splitlines()[0]}")
+            if verbose:
+                print(''.join('      ' + line for line in traceback.format_exception(error)[-6:]))
+    return failures
+
+def check_lazy_loads():
+    parser = argparse.ArgumentParser(description='Fail if a hot page lazy loads outside its loader profile.')
+    parser.add_argument('--database', required=True, help='SQLite database to check (a copy is used)')
+    parser.add_argument('--verbose', action='store_true', help='Print where each failure happened')
+    args = parser.parse_args()
+
+    from hotelweb.app import create_app
+    from hotelweb.extensions import db
+    workdir = tempfile.mkdtemp(prefix='hotelweb-lazy-')
+    try:
+        path = os.path.join(workdir, 'check.db')
+        shutil.copyfile(args.database, path)
+        app = create_app(check_config(path))
+        failures = run_checks(app, args.verbose)
+        with app.app_context():
+            db.engine.dispose()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if failures:
+        print(f"\n{failures} page{'' if failures == 1 else 's'} failed with LOADER_RAISELOAD on")
+        sys.exit(1)
+    print("\nEvery page stayed within its loader profiles")
+
+if __name__ == '__main__':
+    check_lazy_loads()
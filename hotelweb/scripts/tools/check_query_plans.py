@@ -0,0 +1,136 @@
+"""
+Check that the hot queries use indexes instead of full table scans
+
+Runs EXPLAIN QUERY PLAN on each query behind search, availability, the guest
+account pages and the staff booking lists, and exits with status 1 if any of
+them scans a whole table or sorts its rows in a temporary B-tree (an ORDER BY
+no index provides, which reads every matching row before the first one can be
+returned). By default the schema is built from the models in a
+throwaway in-memory database, so this checks the declared indexes; pass
+--database to check a deployed database (run migrate_schema.py first).
+
+    python hotelweb/scripts/tools/check_query_plans.py
+    python hotelweb/scripts/tools/check_query_plans.py --database --verbose
+"""
+import os
+import re
+import sys
+import argparse
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from sqlalchemy import create_engine, select, func, text, tuple_
+from hotelweb.extensions import db
+from hotelweb.models import (
+    Hotel, RoomType, Booking, Review, PointsTransaction, PointsLot, MilestoneReward, UserEvent, FavoriteHotel
+)
+
+# "SCAN booking" is a full table scan; "SCAN booking USING INDEX ..." walks an
+# index and "SEARCH booking USING ..." seeks into one
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+TEMP_SORT = re.compile(r'^USE TEMP B-TREE FOR (.+)$')
+
+def hot_queries():
+    """(name, statement) for each query the plan check covers"""
+    today = date.today()
+    check_in, check_out = today + timedelta(days=7), today + timedelta(days=9)
+    user_id, hotel_id, roomtype_id, booking_id = 1, 1, 1, 1
+    return [
+        ('search: room types in a city', select(RoomType).join(Hotel).where(
+            Hotel.city == 'London', RoomType.capacity >= 2)),
+        ('search: room types in a city and brand', select(RoomType).join(Hotel).where(
+            Hotel.city == 'London', Hotel.brand_id.in_([1, 2]), RoomType.capacity >= 2)),
+        ('availability: overlapping bookings', select(Booking).where(
+            Booking.roomtype_id == roomtype_id, Booking.status == 'CONFIRMED',
+            Booking.check_in < check_out, Booking.check_out > check_in)),
+        ('availability: booked rooms', select(func.coalesce(func.sum(Booking.rooms_count), 0)).where(
+            Booking.roomtype_id == roomtype_id, Booking.status == 'CONFIRMED',
+            Booking.check_in < check_out, Booking.check_out > check_in)),
+        ('room type page: booking fingerprint', select(func.count(Booking.id), func.max(Booking.id)).where(
+            Booking.roomtype_id == roomtype_id, Booking.status == 'CONFIRMED')),
+        ('city page: hotels in a city', select(Hotel).where(Hotel.city == 'London')),
+        ('hotel page: room types', select(RoomType).where(RoomType.hotel_id == hotel_id)),
+        ('hotel page: reviews', select(Review).where(Review.hotel_id == hotel_id).order_by(Review.created_at.desc())),
+        ('my stays: bookings', select(Booking).where(Booking.user_id == user_id).order_by(Booking.check_in.desc())),
+        ('my stays: review of a booking', select(Review).where(
+            Review.booking_id == booking_id, Review.user_id == user_id)),
+        ('completed stays to award', select(Booking).where(
+            Booking.user_id == user_id, Booking.check_out <= today, Booking.status == 'CONFIRMED')),
+        ('points awarded for a booking', select(PointsTransaction).where(
+            PointsTransaction.booking_id == booking_id, PointsTransaction.transaction_type == 'EARNED')),
+        ('account: points activity', select(PointsTransaction).where(
+            PointsTransaction.user_id == user_id).order_by(PointsTransaction.created_at.desc())),
+        ('account: milestone claimed', select(MilestoneReward).where(
+            MilestoneReward.user_id == user_id, MilestoneReward.milestone_nights == 20)),
+        ('account: breakfast vouchers', select(MilestoneReward).where(
+            MilestoneReward.user_id == user_id, MilestoneReward.reward_type == 'breakfast')),
+        ('index: event awarded this year', select(UserEvent).where(
+            UserEvent.user_id == user_id, UserEvent.event_type == 'birthday', UserEvent.event_year == today.year)),
+        ('points expiry: next chunk bound', select(PointsLot.id).where(
+            PointsLot.remaining > 0, PointsLot.earned_at < today - timedelta(days=730), PointsLot.id > 1000)
+            .order_by(PointsLot.id).offset(4999).limit(1)),
+        ('favorites of a user', select(FavoriteHotel).where(FavoriteHotel.user_id == user_id)),
+        ('staff: bookings by status', select(Booking).where(
+            Booking.hotel_id.in_([1, 2]), Booking.status == 'CANCELLED')),
+        # The dashboard and bookings list read each of a staff member's hotels
+        # with its own seek and merge them (see pagination.py)
+        ('staff: upcoming bookings', select(Booking).where(
+            Booking.hotel_id == hotel_id, Booking.status == 'CONFIRMED',
+            Booking.check_in >= today).order_by(Booking.check_in, Booking.id).limit(10)),
+        ('staff: bookings page', select(Booking).where(
+            Booking.hotel_id == hotel_id).order_by(Booking.check_in.desc(), Booking.id.desc()).limit(11)),
+        ('staff: bookings page after a cursor', select(Booking).where(
+            Booking.hotel_id == hotel_id, tuple_(Booking.check_in, Booking.id) < tuple_(today, 1000))
+            .order_by(Booking.check_in.desc(), Booking.id.desc()).limit(11)),
+        ('staff: bookings page by status', select(Booking).where(
+            Booking.hotel_id == hotel_id, Booking.status == 'CONFIRMED',
+            Booking.check_in < today).order_by(Booking.check_in.desc(), Booking.id.desc()).limit(11)),
+    ]
+
+def query_plan(conn, statement):
+    sql = statement.compile(dialect=conn.dialect, compile_kwargs={'literal_binds': True})
+    return [row[-1] for row in conn.execute(text(f'EXPLAIN QUERY PLAN {sql}'))]
+
+def run_checks(engine, verbose):
+    if engine.dialect.name != 'sqlite':
+        raise SystemExit(f'EXPLAIN QUERY PLAN checks need SQLite, got {engine.dialect.name}')
+    failures = 0
+    with engine.connect() as conn:
+        for name, statement in hot_queries():
+            plan = query_plan(conn, statement)
+            problems = [f'FULL SCAN of {m.group(1)}' for m in map(FULL_SCAN.match, plan) if m]
+            problems += [f'TEMP B-TREE for {m.group(1)}' for m in map(TEMP_SORT.match, plan) if m]
+            failures += bool(problems)
+            status = ', '.join(problems) or 'ok'
+            print(f"  {name:<42} {status}")
+            if verbose or problems:
+                for step in plan:
+                    print(f"      {step}")
+    return failures
+
+def check_query_plans():
+    parser = argparse.ArgumentParser(description='Fail if a hot query plans a full table scan or sort.')
+    parser.add_argument('--database', action='store_true', help='Check the configured database instead of the models')
+    parser.add_argument('--verbose', action='store_true', help='Print every query plan')
+    args = parser.parse_args()
+
+    if args.database:
+        from hotelweb.app import create_app
+        app = create_app()
+        with app.app_context():
+            engine = db.engine
+            failures = run_checks(engine, args.verbose)
+    else:
+        engine = create_engine('sqlite://')
+        db.metadata.create_all(engine)
+        failures = run_checks(engine, args.verbose)
+
+    if failures:
+        print(f"\n{failures} hot quer{'y' if failures == 1 else 'ies'} regressed to a full table scan or sort")
+        sys.exit(1)
+    print("\nAll hot queries use indexes")
+
+if __name__ == '__main__':
+    check_query_plans()
@@ -0,0 +1,43 @@
+"""
+Check the stats rollup (per-user booking stats and platform counters)
+against the bookings and users tables
+
+    python hotelweb/scripts/tools/check_stats.py          # report drift only
+    python hotelweb/scripts/tools/check_stats.py --fix    # report, then rebuild in bulk
+"""
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from hotelweb.app import create_app
+from hotelweb.main.stats import check_stats_consistency, recompute_user_stats, recompute_site_stats
+
+def check_stats():
+    fix = '--fix' in sys.argv[1:]
+    app = create_app()
+    with app.app_context():
+        user_mismatches, site_mismatches = check_stats_consistency()
+
+        for user_id, stored, computed in user_mismatches[:20]:
+            print(f"  User {user_id}: stored (active, completed, spent)={tuple(stored)} computed={tuple(computed)}")
+        if len(user_mismatches) > 20:
+            print(f"  ... and {len(user_mismatches) - 20} more")
+        for name, (stored, computed) in site_mismatches.items():
+            print(f"  Site {name}: stored={stored} computed={computed}")
+
+        if not user_mismatches and not site_mismatches:
+            print("Stats rollup is consistent.")
+            return
+        print(f"Found {len(user_mismatches)} user(s) and {len(site_mismatches)} site counter(s) out of sync.")
+
+        if fix:
+            recompute_user_stats()
+            recompute_site_stats()
+            print("Stats rollup rebuilt.")
+        else:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    check_stats()
@@ -0,0 +1,27 @@
+"""
+Compile translation sources (hotelweb/translations/<lang>.json) into the
+gettext catalogs loaded at runtime (hotelweb/translations/<lang>/LC_MESSAGES/messages.mo)
+
+Run after editing any translation file:
+    python hotelweb/scripts/tools/compile_translations.py
+"""
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from hotelweb.main.language import SUPPORTED_LANGUAGES, load_source, compile_catalog
+
+def compile_translations():
+    reference = set(load_source('en'))
+    for lang_code in SUPPORTED_LANGUAGES:
+        keys = set(load_source(lang_code))
+        path = compile_catalog(lang_code)
+        print(f"{lang_code}: {len(keys)} messages -> {os.path.relpath(path)}")
+        missing = sorted(reference - keys)
+        if missing:
+            print(f"  Missing {len(missing)} key(s): {', '.join(missing[:10])}{' ...' if len(missing) > 10 else ''}")
+
+if __name__ == '__main__':
+    compile_translations()
@@ -15,7 +15,9 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from hotelweb.app import create_app
 from hotelweb.extensions import db
-from hotelweb.models import User, Hotel, RoomType, Booking, Review, PointsTransaction
+from hotelweb.models import User, Hotel, RoomType, Booking, Review, PointsTransaction, PointsLot
+from hotelweb.main.points import credit_points_lot
+from hotelweb.main.stats import recompute_user_stats, recompute_site_stats
 
 # Sample review comments
 REVIEW_COMMENTS = [
@@ -89,6 +91,7 @@ def create_test_accounts():
                 print(f"  Clearing existing data for {username}...")
                 Booking.query.filter_by(user_id=user.id).delete()
                 Review.query.filter_by(user_id=user.id).delete()
+                PointsLot.query.filter_by(user_id=user.id).delete()
                 PointsTransaction.query.filter_by(user_id=user.id).delete()
                 user.points = 0
                 user.lifetime_points = 0
@@ -209,6 +212,10 @@ def create_test_accounts():
             print(f"    Lifetime Points: {user.lifetime_points:,}")
             print(f"    Membership Tier: {user.membership_level}")
         
+        # Bookings above bypass the booking routes, so rebuild the stats rollup
+        recompute_user_stats()
+        recompute_site_stats()
+        
         print(f"\n{'='*60}")
         print(f"All test accounts created successfully!")
         print(f"{'='*60}")
@@ -274,6 +281,7 @@ def create_booking(user, room_type, check_in, check_out, nights):
         created_at=booking.created_at
     )
     db.session.add(transaction)
+    credit_points_lot(transaction)
     
     return booking
 
@@ -0,0 +1,42 @@
+"""
+Expire loyalty points older than the configured age
+
+Run periodically (e.g. nightly from cron):
+    python hotelweb/scripts/tools/expire_points.py
+    python hotelweb/scripts/tools/expire_points.py --days 365 --batch-size 10000
+
+Use --backfill once after upgrading to open lots for balances earned before
+points lots were tracked.
+"""
+import os
+import sys
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from hotelweb.app import create_app
+from hotelweb.main.points import backfill_points_lots, expire_points_lots
+
+def expire_points():
+    parser = argparse.ArgumentParser(description='Expire loyalty points lots older than a given age.')
+    parser.add_argument('--days', type=int, help='Maximum lot age in days (default: POINTS_EXPIRY_DAYS)')
+    parser.add_argument('--batch-size', type=int, help='Lots per transaction (default: POINTS_EXPIRY_BATCH_SIZE)')
+    parser.add_argument('--backfill', action='store_true', help='Open lots for balances not yet covered by lots, then exit')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if args.backfill:
+            created = backfill_points_lots()
+            print(f"Backfilled {created:,} points lot(s)")
+            return
+
+        days = args.days or app.config['POINTS_EXPIRY_DAYS']
+        batch_size = args.batch_size or app.config['POINTS_EXPIRY_BATCH_SIZE']
+        print(f"Expiring points lots older than {days} days (batch size {batch_size:,})...")
+        lots_expired, points_expired = expire_points_lots(days, batch_size=batch_size)
+        print(f"Expired {points_expired:,} points across {lots_expired:,} lot(s)")
+
+if __name__ == '__main__':
+    expire_points()
@@ -0,0 +1,81 @@
+"""
+Generate a large synthetic database for load tests
+
+The seeding scripts (seed_data.py, generate_test_bookings.py,
+generate_reviews.py) create one ORM object per row and are fine for a demo
+database; this builds millions of rows in minutes. Bookings are generated in
+parallel worker processes from a fixed seed and written in bulk; the same seed
+and scale give the same database whatever --workers is.
+
+    python hotelweb/scripts/tools/generate_bulk_data.py --scale medium --workers 8 --output /tmp/load.db --check
+    python hotelweb/scripts/tools/generate_bulk_data.py --scale small --bookings 2000000 --output /tmp/load.db
+
+All generated accounts use the password "benchmark123": guests are
+guest<N>@bench.test, plus staff@bench.test and admin@bench.test. Point
+DATABASE_URL at the file to run the app on it.
+"""
+import os
+import sys
+import time
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from sqlalchemy import create_engine
+from hotelweb.config import Config
+from hotelweb.extensions import db
+from hotelweb.scripts.tools.synthetic_data import SCALES, build_dataset, check_invariants, finish_dataset, scale_counts
+
+def generate_bulk_data():
+    parser = argparse.ArgumentParser(description='Generate a large synthetic database for load tests.')
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Generator processes (default: CPU count)')
+    parser.add_argument('--output', required=True, help='SQLite file to create')
+    parser.add_argument('--force', action='store_true', help='Replace the output file if it exists')
+    parser.add_argument('--check', action='store_true', help='Verify the invariants afterwards (slow on large data)')
+    for name in SCALES['tiny']:
+        parser.add_argument(f'--{name.replace("_", "-")}', dest=name, type=int, help=f'Override the number of {name}')
+    args = parser.parse_args()
+
+    if os.path.exists(args.output):
+        if not args.force:
+            raise SystemExit(f'{args.output} exists; pass --force to replace it')
+        os.remove(args.output)
+
+    overrides = {name: getattr(args, name) for name in SCALES['tiny']}
+    counts = scale_counts(args.scale, **overrides)
+    print(f"Generating {args.scale} dataset in {args.output} (seed {args.seed}): "
+          + ', '.join(f'{value:,} {name}' for name, value in counts.items()))
+    started = time.perf_counter()
+    written = build_dataset(args.output, args.scale, args.seed, workers=args.workers, **overrides)
+
+    from hotelweb.app import create_app
+    class BulkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.abspath(args.output)}'
+        SQLALCHEMY_BINDS = {}
+        METRICS_ENABLED = False
+    print("  stats and points lots...")
+    app = create_app(BulkConfig)
+    finish_dataset(app)
+    with app.app_context():
+        db.engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    rows = sum(written.values())
+    print(f"Wrote {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s): "
+          + ', '.join(f'{value:,} {name}' for name, value in written.items()))
+
+    if args.check:
+        engine = create_engine(f'sqlite:///{args.output}')
+        with engine.connect() as conn:
+            problems = check_invariants(conn)
+        engine.dispose()
+        if problems:
+            print("Invariant check failed:\n  " + '\n  '.join(problems))
+            sys.exit(1)
+        print("Invariants hold: no oversold nights, points and nights match the bookings and ledger")
+
+if __name__ == '__main__':
+    generate_bulk_data()
@@ -11,7 +11,9 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from hotelweb.app import create_app
 from hotelweb.extensions import db
-from hotelweb.models import User, Hotel, RoomType, Booking, PointsTransaction
+from hotelweb.models import User, Hotel, RoomType, Booking, PointsTransaction, PointsLot
+from hotelweb.main.points import credit_points_lot
+from hotelweb.main.stats import recompute_user_stats, recompute_site_stats
 
 def generate_test_bookings():
     app = create_app()
@@ -50,6 +52,7 @@ def generate_test_bookings():
         
         # Clear existing bookings for test user
         Booking.query.filter_by(user_id=test_user.id).delete()
+        PointsLot.query.filter_by(user_id=test_user.id).delete()
         PointsTransaction.query.filter_by(user_id=test_user.id).delete()
         test_user.points = 0
         test_user.lifetime_points = 0
@@ -130,6 +133,10 @@ def generate_test_bookings():
         test_user.calculate_tier()
         db.session.commit()
         
+        # Bookings above bypass the booking routes, so rebuild the stats rollup
+        recompute_user_stats()
+        recompute_site_stats()
+        
         print(f"\n{'='*60}")
         print(f"Test data generation complete!")
         print(f"{'='*60}")
@@ -207,6 +214,7 @@ def create_booking(user, room_type, check_in, check_out, nights, cancelled=False
             created_at=booking.created_at
         )
         db.session.add(transaction)
+        credit_points_lot(transaction)
     
     return booking
 
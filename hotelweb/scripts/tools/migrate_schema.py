@@ -0,0 +1,85 @@
+"""
+Bring an existing database up to date with the current models
+
+db.create_all() creates missing tables but never alters existing ones. This
+script adds any model columns and indexes missing from existing tables, then
+rebuilds derived data so new columns start consistent: booking.hotel_id
+(copied from the room type) and the stats rollup.
+
+    python hotelweb/scripts/tools/migrate_schema.py
+"""
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from sqlalchemy import inspect, text
+from hotelweb.app import create_app
+from hotelweb.extensions import db
+from hotelweb.models import Booking, RoomType
+from hotelweb.main.stats import recompute_user_stats, recompute_site_stats
+
+def _column_ddl(column, dialect):
+    """ADD COLUMN clause for a model column; scalar Python defaults become SQL defaults"""
+    ddl = f"{dialect.identifier_preparer.quote(column.name)} {column.type.compile(dialect=dialect)}"
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if isinstance(default, bool):
+        ddl += f" DEFAULT {int(default)}"
+    elif isinstance(default, (int, float)):
+        ddl += f" DEFAULT {default}"
+    elif isinstance(default, str):
+        ddl += f" DEFAULT '{default}'"
+    return ddl
+
+def backfill_booking_hotels():
+    """Set booking.hotel_id from the room type where it is missing; returns rows updated"""
+    hotel_of_room_type = (db.select(RoomType.hotel_id)
+                          .where(RoomType.id == Booking.roomtype_id).scalar_subquery())
+    result = db.session.execute(
+        db.update(Booking).where(Booking.hotel_id.is_(None)).values(hotel_id=hotel_of_room_type),
+        execution_options={'synchronize_session': False})
+    db.session.commit()
+    return result.rowcount
+
+def migrate_schema():
+    app = create_app()  # create_app() already runs db.create_all() for new tables
+    with app.app_context():
+        engine = db.engine
+        inspector = inspect(engine)
+        changes = 0
+
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing_columns = {c['name'] for c in inspector.get_columns(table.name)}
+            table_name = engine.dialect.identifier_preparer.quote(table.name)
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                ddl = f"ALTER TABLE {table_name} ADD COLUMN {_column_ddl(column, engine.dialect)}"
+                print(f"  {ddl}")
+                with engine.begin() as conn:
+                    conn.execute(text(ddl))
+                changes += 1
+
+            existing_indexes = {i['name'] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+                print(f"  CREATE INDEX {index.name} ON {table.name}")
+                index.create(bind=engine)
+                changes += 1
+
+        print(f"Applied {changes} schema change(s)")
+
+        print("Backfilling booking hotels...")
+        print(f"  Set hotel_id on {backfill_booking_hotels()} booking(s)")
+
+        print("Rebuilding stats rollup...")
+        users = recompute_user_stats()
+        recompute_site_stats()
+        print(f"  Recomputed stats for {users} user(s)")
+
+if __name__ == '__main__':
+    migrate_schema()
@@ -0,0 +1,310 @@
+"""
+Replay captured traffic against a local app and compare latency between builds
+
+Capture traffic with REQUEST_CAPTURE=true (utils/request_capture.py), then
+replay the log on a copy of a database. Each request runs as a user of the
+captured role (the first user with that role in the database unless --user
+says otherwise). POST requests are skipped unless --writes is given; their
+form values were never captured, so they replay with empty fields and mostly
+exercise validation.
+
+Run it once per build (from each checkout) or per configuration (--set), then
+compare the two result files side by side:
+
+    python hotelweb/scripts/tools/replay_requests.py run --log 'instance/capture/*.jsonl*' \\
+        --database instance/hotel.db --concurrency 4 --output before.json
+    python hotelweb/scripts/tools/replay_requests.py run ... --set PAGE_CACHE_ENABLED=false --output after.json
+    python hotelweb/scripts/tools/replay_requests.py compare before.json after.json
+
+--server replays over HTTP against a local threaded WSGI server instead of the
+Flask test client, which includes request parsing and socket overhead.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import http.client
+from datetime import datetime
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from sqlalchemy import create_engine, func, select
+from werkzeug.serving import make_server
+from hotelweb.config import Config
+from hotelweb.models import User
+from hotelweb.scripts.tools.benchmark_suite import percentile, git_commit
+
+REPLAY_CSRF_TOKEN = 'replay'
+
+def load_log(patterns, include_writes, limit=None):
+    """Captured requests from the files matching the patterns, oldest first"""
+    entries = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue  # Partly written line at the end of a live file
+    entries.sort(key=lambda entry: entry['ts'])
+    skipped = 0
+    if not include_writes:
+        kept = [entry for entry in entries if entry['method'] == 'GET']
+        skipped = len(entries) - len(kept)
+        entries = kept
+    return entries[:limit] if limit else entries, skipped
+
+def request_target(entry):
+    """URL and form data for a captured request; redacted args are left out"""
+    args = {name: values for name, values in entry.get('args', {}).items() if '[redacted]' not in values}
+    url = entry['path'] + ('?' + urlencode(args, doseq=True) if args else '')
+    form = None
+    if entry['method'] != 'GET':
+        form = {key: '' for key in entry.get('form_keys', [])}
+        form['csrf_token'] = REPLAY_CSRF_TOKEN
+    return url, form
+
+def role_users(database, overrides):
+    """{role: user id} for the roles requests are replayed as"""
+    engine = create_engine(f'sqlite:///{database}')
+    users = {}
+    with engine.connect() as conn:
+        for role in ('customer', 'staff', 'admin'):
+            users[role] = conn.execute(select(func.min(User.id)).where(User.role == role)).scalar()
+    engine.dispose()
+    users.update(overrides)
+    return users
+
+def _parse_value(value):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+def replay_config(path, settings):
+    class ReplayConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_BINDS = {}
+        REQUEST_CAPTURE = False  # Don't capture the replay itself
+        PROFILING_ENABLED = False
+        METRICS_ENABLED = False
+        ADMISSION_CONTROL = False  # The whole log replays as one client
+        STREAM_TEMPLATES = False  # Render inside the view, so the timing includes the template
+    for name, value in settings.items():
+        setattr(ReplayConfig, name, value)
+    return ReplayConfig
+
+class TestClientReplayer:
+    """One Flask test client per thread and role"""
+    def __init__(self, app, users):
+        self.app = app
+        self.users = users
+        self._local = threading.local()
+
+    def _client(self, role):
+        clients = self._local.__dict__.setdefault('clients', {})
+        if role not in clients:
+            client = self.app.test_client()
+            with client.session_transaction() as session:
+                session['csrf_token'] = REPLAY_CSRF_TOKEN
+                if self.users.get(role):
+                    session['_user_id'] = str(self.users[role])
+                    session['_fresh'] = True
+            clients[role] = client
+        return clients[role]
+
+    def send(self, entry, url, form):
+        client = self._client(entry.get('role', 'anonymous'))
+        if form is None:
+            return client.get(url).status_code
+        return client.open(url, method=entry['method'], data=form).status_code
+
+    def close(self):
+        pass
+
+class ServerReplayer:
+    """HTTP requests to a threaded WSGI server on a free local port"""
+    def __init__(self, app, users):
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        serializer = app.session_interface.get_signing_serializer(app)
+        cookie_name = app.config.get('SESSION_COOKIE_NAME', 'session')
+        self.cookies = {}
+        for role, user_id in list(users.items()) + [('anonymous', None)]:
+            session = {'csrf_token': REPLAY_CSRF_TOKEN}
+            if user_id:
+                session.update(_user_id=str(user_id), _fresh=True)
+            self.cookies[role] = f'{cookie_name}={serializer.dumps(session)}'
+
+    def send(self, entry, url, form):
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.server_port, timeout=60)
+        headers = {'Cookie': self.cookies.get(entry.get('role'), self.cookies['anonymous'])}
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        try:
+            connection.request(entry['method'], url, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        finally:
+            connection.close()
+
+    def close(self):
+        self.server.shutdown()
+
+def summarize(samples):
+    """Latency distribution per endpoint from (endpoint, ms, status, captured status) samples"""
+    by_endpoint = {}
+    for endpoint, elapsed, status, captured in samples:
+        by_endpoint.setdefault(endpoint, []).append((elapsed, status, captured))
+    summary = {}
+    for endpoint, rows in sorted(by_endpoint.items()):
+        timings = [elapsed for elapsed, _, _ in rows]
+        summary[endpoint] = {
+            'count': len(rows),
+            'p50_ms': round(percentile(timings, 0.5), 2),
+            'p90_ms': round(percentile(timings, 0.9), 2),
+            'p99_ms': round(percentile(timings, 0.99), 2),
+            'mean_ms': round(sum(timings) / len(timings), 2),
+            'errors': sum(1 for _, status, _ in rows if status >= 500),
+            'status_changed': sum(1 for _, status, captured in rows if captured and status != captured),
+        }
+    return summary
+
+def replay(entries, app, users, concurrency, server, warmup=False):
+    replayer = (ServerReplayer if server else TestClientReplayer)(app, users)
+
+    def run(entry):
+        url, form = request_target(entry)
+        started = time.perf_counter()
+        try:
+            status = replayer.send(entry, url, form)
+        except Exception:
+            status = 599  # Connection failure or an exception the client re-raised
+        elapsed = (time.perf_counter() - started) * 1000
+        endpoint = entry.get('endpoint') or f"{entry['method']} {entry['path']}"
+        return endpoint, elapsed, status, entry.get('status')
+
+    try:
+        with ThreadPoolExecutor(concurrency) as executor:
+            if warmup:
+                list(executor.map(run, entries))
+            started = time.perf_counter()
+            samples = list(executor.map(run, entries))
+    finally:
+        replayer.close()
+    return samples, time.perf_counter() - started
+
+def print_summary(summary):
+    print(f"\n{'endpoint':<32} {'count':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'errors':>7}")
+    for endpoint, stats in summary.items():
+        print(f"{endpoint:<32} {stats['count']:>6} {stats['p50_ms']:>8.1f} {stats['p90_ms']:>8.1f} "
+              f"{stats['p99_ms']:>8.1f} {stats['errors']:>7}")
+
+def run_command(args):
+    from hotelweb.app import create_app
+    from hotelweb.extensions import db
+
+    entries, skipped = load_log(args.log, args.writes, args.limit)
+    if not entries:
+        raise SystemExit('No requests to replay; check --log')
+    settings = dict((item.split('=', 1)[0], _parse_value(item.split('=', 1)[1])) for item in args.set)
+    overrides = dict((item.split('=', 1)[0], int(item.split('=', 1)[1])) for item in args.user)
+    users = role_users(args.database, overrides)
+    print(f"Replaying {len(entries):,} requests ({skipped:,} writes skipped) with concurrency {args.concurrency} "
+          f"via {'a local WSGI server' if args.server else 'the test client'}")
+
+    workdir = tempfile.mkdtemp(prefix='hotelweb-replay-')
+    path = os.path.join(workdir, 'replay.db')
+    shutil.copyfile(args.database, path)
+    try:
+        app = create_app(replay_config(path, settings))
+        samples, elapsed = replay(entries, app, users, args.concurrency, args.server, args.warmup)
+        with app.app_context():
+            db.engine.dispose()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    summary = summarize(samples)
+    print_summary(summary)
+    print(f"\n{len(samples):,} requests in {elapsed:.1f}s ({len(samples) / elapsed:,.1f} req/s)")
+    if args.output:
+        report = {
+            'meta': {
+                'label': args.label or git_commit(),
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'commit': git_commit(),
+                'settings': settings,
+                'concurrency': args.concurrency,
+                'mode': 'server' if args.server else 'test_client',
+                'warmup': args.warmup,
+                'requests': len(samples),
+                'seconds': round(elapsed, 2),
+            },
+            'endpoints': summary,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+def compare_command(args):
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    names = (before['meta'].get('label') or 'before', after['meta'].get('label') or 'after')
+    print(f"{'':<32} {names[0][:23]:>23}   {names[1][:23]:>23}")
+    print(f"{'endpoint':<32} {'count':>6} {'p50':>8} {'p99':>8}   {'count':>6} {'p50':>8} {'p99':>8} {'p50 change':>11}")
+    for endpoint in sorted(set(before['endpoints']) | set(after['endpoints'])):
+        a, b = before['endpoints'].get(endpoint), after['endpoints'].get(endpoint)
+        left = f"{a['count']:>6} {a['p50_ms']:>8.1f} {a['p99_ms']:>8.1f}" if a else f"{'-':>6} {'-':>8} {'-':>8}"
+        right = f"{b['count']:>6} {b['p50_ms']:>8.1f} {b['p99_ms']:>8.1f}" if b else f"{'-':>6} {'-':>8} {'-':>8}"
+        change = ''
+        if a and b and a['p50_ms']:
+            change = f"{(b['p50_ms'] - a['p50_ms']) / a['p50_ms']:+.0%}"
+        print(f"{endpoint[:32]:<32} {left}   {right} {change:>11}")
+    for name, report in zip(names, (before, after)):
+        meta = report['meta']
+        print(f"\n{name}: {meta['requests']:,} requests in {meta['seconds']}s, concurrency {meta['concurrency']}, "
+              f"{meta['mode']}, settings {meta['settings'] or 'default'}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay captured requests and compare latency between builds.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Replay a capture log')
+    run.add_argument('--log', nargs='+', required=True, help='Capture files or glob patterns')
+    run.add_argument('--database', required=True, help='SQLite database to replay against (a copy is used)')
+    run.add_argument('--output', help='Write the per-endpoint results to this JSON file')
+    run.add_argument('--label', help='Name for this run in comparisons (default: the git commit)')
+    run.add_argument('--concurrency', type=int, default=1)
+    run.add_argument('--server', action='store_true', help='Replay over HTTP to a local WSGI server')
+    run.add_argument('--warmup', action='store_true', help='Replay the log once untimed first (caches, templates)')
+    run.add_argument('--writes', action='store_true', help='Also replay POST requests')
+    run.add_argument('--limit', type=int, help='Replay only the first N requests')
+    run.add_argument('--set', action='append', default=[], metavar='KEY=VALUE', help='Override a config setting')
+    run.add_argument('--user', action='append', default=[], metavar='ROLE=ID', help='User to replay a role as')
+    run.set_defaults(handler=run_command)
+
+    compare = commands.add_parser('compare', help='Compare two replay results side by side')
+    compare.add_argument('before')
+    compare.add_argument('after')
+    compare.set_defaults(handler=compare_command)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Copy the primary SQLite database onto the read replica file
+
+For local testing of read/write splitting. Point the app at two files:
+    DATABASE_URL=sqlite:////tmp/hotel.db REPLICA_DATABASE_URL=sqlite:////tmp/hotel-replica.db
+
+then keep the replica in sync with a copy job, once or in a loop:
+    python hotelweb/scripts/tools/sync_replica.py
+    python hotelweb/scripts/tools/sync_replica.py --interval 5
+
+The copy uses SQLite's online backup API, so the primary stays writable and
+the replica is updated in place (open replica connections see the new data).
+A longer interval simulates more replication lag.
+"""
+import os
+import sys
+import time
+import sqlite3
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from sqlalchemy.engine import make_url
+from hotelweb.config import Config
+
+def sqlite_path(uri):
+    url = make_url(uri)
+    if url.get_backend_name() != 'sqlite' or not url.database:
+        raise SystemExit(f'Only file-based SQLite databases can be copied, got {uri}')
+    path = url.database
+    return path[len('file:'):] if path.startswith('file:') else path  # uri=true form
+
+def copy_database(primary, replica):
+    started = time.perf_counter()
+    source = sqlite3.connect(primary)
+    target = sqlite3.connect(replica, timeout=30)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    return time.perf_counter() - started
+
+def sync_replica():
+    parser = argparse.ArgumentParser(description='Copy the primary SQLite database to the read replica.')
+    parser.add_argument('--primary', help='Primary database file (default: from DATABASE_URL)')
+    parser.add_argument('--replica', help='Replica database file (default: from REPLICA_DATABASE_URL)')
+    parser.add_argument('--interval', type=float, default=0, help='Repeat every N seconds (default: copy once)')
+    args = parser.parse_args()
+
+    primary = args.primary or sqlite_path(Config.SQLALCHEMY_DATABASE_URI)
+    if args.replica:
+        replica = args.replica
+    elif 'replica' in Config.SQLALCHEMY_BINDS:
+        replica = sqlite_path(Config.SQLALCHEMY_BINDS['replica'])
+    else:
+        raise SystemExit('No replica configured; set REPLICA_DATABASE_URL or pass --replica.')
+    if os.path.abspath(primary) == os.path.abspath(replica):
+        raise SystemExit('The primary and the replica are the same file.')
+
+    while True:
+        elapsed = copy_database(primary, replica)
+        print(f"Copied {primary} -> {replica} in {elapsed * 1000:.0f} ms")
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+if __name__ == '__main__':
+    sync_replica()
@@ -0,0 +1,359 @@
+"""
+Deterministic synthetic datasets for benchmarks and load tests
+
+build_dataset() fills an empty SQLite database with brands, amenities, hotels,
+room types, guests, bookings, points transactions and reviews at a chosen
+scale. The same seed and scale always give the same rows, whatever the number
+of workers: bookings are generated in fixed partitions of rooms, each with its
+own seed, in worker processes, while the parent writes the finished batches
+with executemany (SQLite has a single writer). Indexes are created after the
+data.
+
+Bookings never oversell: each room of a room type gets its own sequence of
+non-overlapping stays. Completed stays are settled and earn points (one EARNED
+transaction each), and the user counters (points, lifetime points, nights,
+tier, stats rollup) are derived from the generated rows at the end;
+check_invariants() verifies all of this on a finished database.
+
+Used by benchmark_suite.py and generate_bulk_data.py.
+"""
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from sqlalchemy import case, create_engine, event, func, or_, select, text, update
+from sqlalchemy.schema import CreateTable
+from werkzeug.security import generate_password_hash
+from hotelweb.extensions import db
+from hotelweb.models import (
+    Brand, Amenity, Hotel, RoomType, User, Booking, PointsTransaction, Review, roomtype_amenity, staff_hotel
+)
+
+SCALES = {
+    'tiny': dict(hotels=20, room_types=100, users=500, bookings=5_000, transactions=10_000, reviews=500),
+    'small': dict(hotels=200, room_types=2_000, users=10_000, bookings=100_000, transactions=300_000, reviews=10_000),
+    'medium': dict(hotels=1_000, room_types=10_000, users=100_000, bookings=1_000_000, transactions=4_000_000, reviews=100_000),
+    'production': dict(hotels=5_000, room_types=50_000, users=500_000, bookings=5_000_000, transactions=20_000_000, reviews=500_000),
+}
+
+BRANDS = [
+    ('Grand Apex', '#b45309'), ('Urban Pulse', '#1e40af'), ('Family Haven', '#047857'), ('Metro Express', '#b91c1c'),
+]
+AMENITIES = [
+    'Free Wi-Fi', 'Swimming Pool', 'Gym', 'Spa', 'Restaurant', 'Bar', 'Room Service', 'Parking', 'Airport Shuttle',
+    'Pet Friendly', 'Business Center', 'Concierge', 'Laundry', 'Kids Club', 'Balcony', 'Ocean View', 'Kitchenette', 'Bathtub',
+]
+CITIES = [
+    'London', 'Paris', 'New York', 'Tokyo', 'Shanghai', 'Singapore', 'Sydney', 'Dubai', 'Rome', 'Barcelona',
+    'Berlin', 'Amsterdam', 'Hong Kong', 'Bangkok', 'Seoul', 'Toronto', 'Chicago', 'Los Angeles', 'Miami', 'Vienna',
+    'Prague', 'Lisbon', 'Madrid', 'Istanbul', 'Cairo', 'Cape Town', 'Mumbai', 'Delhi', 'Beijing', 'Osaka',
+    'Kyoto', 'Melbourne', 'Auckland', 'Vancouver', 'San Francisco', 'Boston', 'Zurich', 'Munich', 'Milan', 'Dublin',
+]
+ROOM_NAMES = ['Standard Room', 'Deluxe Room', 'Executive Suite', 'Family Room', 'Twin Room', 'Junior Suite']
+
+BENCH_PASSWORD = 'benchmark123'
+BENCH_GUEST_ID = 1  # Gets a steady share of all bookings, for the My Stays / Account benchmarks
+BATCH_SIZE = 10_000
+PARTITION_UNITS = 2_000  # Rooms per booking partition (a unit of work for one worker)
+BONUS_PARTITION = 100_000
+HISTORY_DAYS = 730  # Stays start up to two years back...
+FUTURE_DAYS = 180  # ...and run up to six months ahead
+
+BOOKING_COLUMNS = (
+    'id', 'user_id', 'roomtype_id', 'hotel_id', 'check_in', 'check_out', 'rooms_count', 'status', 'created_at',
+    'base_rate', 'subtotal', 'taxes', 'fees', 'total_cost', 'points_earned', 'points_used', 'breakfast_included',
+    'breakfast_price_per_room', 'payment_method', 'stats_settled',
+)
+REVIEW_COLUMNS = ('user_id', 'hotel_id', 'booking_id', 'rating', 'comment', 'created_at')
+TRANSACTION_COLUMNS = ('user_id', 'booking_id', 'points', 'transaction_type', 'description', 'created_at')
+
+def scale_counts(scale, **overrides):
+    counts = dict(SCALES[scale])
+    counts.update({name: value for name, value in overrides.items() if value is not None})
+    return counts
+
+def staff_user_id(counts):
+    return counts['users'] + 1
+
+def admin_user_id(counts):
+    return counts['users'] + 2
+
+def _insert(conn, table, rows):
+    """Insert rows (an iterable of dicts) in executemany batches; returns the row count"""
+    batch, total = [], 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.execute(table.insert(), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        conn.execute(table.insert(), batch)
+        total += len(batch)
+    return total
+
+def _reference_rows(rng, counts):
+    """Brands, amenities, hotels and room types, plus per-room-type facts the bookings need"""
+    brands = [dict(id=i + 1, name=name, description=f'{name} hotels', logo_color=color)
+              for i, (name, color) in enumerate(BRANDS)]
+    amenities = [dict(id=i + 1, name=name) for i, name in enumerate(AMENITIES)]
+
+    hotels, room_types, links = [], [], []
+    per_hotel = max(1, counts['room_types'] // counts['hotels'])
+    for hotel_id in range(1, counts['hotels'] + 1):
+        stars = rng.randint(2, 5)
+        city = CITIES[(hotel_id - 1) % len(CITIES)]
+        hotels.append(dict(
+            id=hotel_id, brand_id=rng.randint(1, len(BRANDS)), name=f'Hotel {hotel_id} {city}', city=city,
+            address=f'{rng.randint(1, 999)} Benchmark Street', description='Synthetic benchmark hotel.',
+            image_url=None, stars=stars, latitude=rng.uniform(-60, 60), longitude=rng.uniform(-180, 180),
+            breakfast_price=stars * 10, content_version=1, content_updated_at=datetime(2024, 1, 1)
+        ))
+        for n in range(per_hotel):
+            roomtype_id = len(room_types) + 1
+            room_types.append(dict(
+                id=roomtype_id, hotel_id=hotel_id, name=ROOM_NAMES[n % len(ROOM_NAMES)], capacity=rng.randint(1, 4),
+                price_per_night=rng.randint(60, 600), inventory=rng.randint(1, 10), description='Synthetic room type.',
+                image_url=None
+            ))
+            for amenity_id in rng.sample(range(1, len(AMENITIES) + 1), rng.randint(3, 8)):
+                links.append(dict(roomtype_id=roomtype_id, amenity_id=amenity_id))
+    return brands, amenities, hotels, room_types, links
+
+def _user_rows(counts, password_hash):
+    for user_id in range(1, counts['users'] + 1):
+        yield dict(
+            id=user_id, username=f'guest{user_id}', email=f'guest{user_id}@bench.test', password_hash=password_hash,
+            created_at=datetime(2023, 1, 1), role='customer', points=0, lifetime_points=0, nights_stayed=0,
+            membership_level='Club Member', member_number=f'B{user_id:09d}'
+        )
+    for user_id, role in ((staff_user_id(counts), 'staff'), (admin_user_id(counts), 'admin')):
+        yield dict(
+            id=user_id, username=f'bench-{role}', email=f'{role}@bench.test', password_hash=password_hash,
+            created_at=datetime(2023, 1, 1), role=role, points=0, lifetime_points=0, nights_stayed=0,
+            membership_level='Club Member', member_number=f'B{user_id:09d}'
+        )
+
+def _timestamp(day):
+    """SQLAlchemy's SQLite DATETIME storage format"""
+    return f'{day.isoformat()} 00:00:00.000000'
+
+def _stay_partitions(room_types, counts, seed, today):
+    """
+    Split the rooms (one unit of a room type's inventory each) into fixed-size
+    partitions. Booking ids and seeds depend only on the partition, so the
+    output is the same whatever the number of workers.
+    """
+    units = [(rt['id'], rt['hotel_id'], rt['price_per_night']) for rt in room_types for _ in range(rt['inventory'])]
+    per_unit, extra = divmod(counts['bookings'], len(units))
+    first_id = 1
+    for index, start in enumerate(range(0, len(units), PARTITION_UNITS)):
+        chunk = units[start:start + PARTITION_UNITS]
+        yield dict(seed=f'{seed}:stays:{index}', units=chunk, first_id=first_id, per_unit=per_unit,
+                   extra=max(0, min(len(chunk), extra - start)), users=counts['users'], today=today,
+                   bench_every=max(1, counts['bookings'] // 200),
+                   review_rate=counts['reviews'] / max(1, counts['bookings']))
+        first_id += len(chunk) * per_unit + max(0, min(len(chunk), extra - start))
+
+def _generate_stays(task):
+    """
+    Bookings, reviews and EARNED transactions (tuples in *_COLUMNS order) for
+    one partition. Each room gets its own back-to-back sequence of stays, so no
+    night is ever sold twice.
+    """
+    rng = random.Random(task['seed'])
+    today = task['today']
+    start = today - timedelta(days=HISTORY_DAYS)
+    # Spread each room's stays over the whole window (average stay is 3.5 nights)
+    slot = (HISTORY_DAYS + FUTURE_DAYS) / (task['per_unit'] + 1)
+    max_gap = max(0, int(2 * (slot - 3.5)))
+
+    bookings, reviews, transactions = [], [], []
+    booking_id = task['first_id'] - 1
+    for index, (roomtype_id, hotel_id, price) in enumerate(task['units']):
+        day = start + timedelta(days=rng.randint(0, 20))
+        for _ in range(task['per_unit'] + (1 if index < task['extra'] else 0)):
+            booking_id += 1
+            nights = rng.randint(1, 6)
+            check_in, check_out = day, day + timedelta(days=nights)
+            day = check_out + timedelta(days=rng.randint(0, max_gap))
+            user_id = BENCH_GUEST_ID if booking_id % task['bench_every'] == 0 else rng.randint(1, task['users'])
+            cancelled = rng.random() < 0.08
+            completed = not cancelled and check_out <= today
+            subtotal = price * nights
+            taxes = round(subtotal * 0.1, 2)
+            total = subtotal + taxes
+            points = int(total * 10) if completed else 0
+            booked_at = _timestamp(check_in - timedelta(days=rng.randint(1, 60)))
+            bookings.append((
+                booking_id, user_id, roomtype_id, hotel_id, check_in.isoformat(), check_out.isoformat(), 1,
+                'CANCELLED' if cancelled else 'CONFIRMED', booked_at, price, subtotal, taxes, 0, total,
+                points, 0, 0, 0, 'pay_by_card', int(completed)
+            ))
+            if points:
+                transactions.append((user_id, booking_id, points, 'EARNED',
+                                     f'Points earned for booking #{booking_id}', _timestamp(check_out)))
+            if completed and rng.random() < task['review_rate']:
+                reviews.append((user_id, hotel_id, booking_id, rng.randint(1, 5), 'Synthetic review.',
+                                _timestamp(check_out)))
+    return bookings, reviews, transactions
+
+def _generate_bonus(task):
+    """BONUS transactions that top the ledger up to the requested size"""
+    rng = random.Random(task['seed'])
+    return [
+        (rng.randint(1, task['users']), None, rng.randint(50, 500), 'BONUS', 'Promotional bonus',
+         (datetime(2024, 1, 1) + timedelta(minutes=rng.randint(0, 900_000))).strftime('%Y-%m-%d %H:%M:%S.%f'))
+        for _ in range(task['count'])
+    ]
+
+def _parallel(function, tasks, workers):
+    """Yield function(task) for each task in order, computed in worker processes"""
+    if workers <= 1:
+        yield from map(function, tasks)
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(function, task))
+            if len(pending) >= workers * 2:  # Don't let results pile up faster than SQLite writes them
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _insert_tuples(conn, table, columns, rows):
+    """SQLite bulk insert of pre-built tuples, bypassing per-row parameter processing"""
+    if rows:
+        placeholders = ', '.join('?' * len(columns))
+        conn.exec_driver_sql(f'INSERT INTO {table.name} ({", ".join(columns)}) VALUES ({placeholders})', rows)
+    return len(rows)
+
+def _create_tables(engine):
+    """Tables only; indexes are built after the bulk load"""
+    with engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            conn.execute(CreateTable(table))
+
+def _create_indexes(engine):
+    with engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn)
+
+def _bulk_load_pragmas(engine):
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in ('journal_mode=OFF', 'synchronous=OFF', 'cache_size=-262144', 'temp_store=MEMORY'):
+            cursor.execute(f'PRAGMA {pragma}')
+        cursor.close()
+
+def derive_user_counters(conn, today):
+    """Set points, lifetime points, nights and tier from the generated transactions and stays"""
+    points = select(func.coalesce(func.sum(PointsTransaction.points), 0)).where(
+        PointsTransaction.user_id == User.id).scalar_subquery()
+    earned = select(func.coalesce(func.sum(PointsTransaction.points), 0)).where(
+        PointsTransaction.user_id == User.id, PointsTransaction.points > 0).scalar_subquery()
+    nights = select(func.coalesce(func.sum(func.julianday(Booking.check_out) - func.julianday(Booking.check_in)), 0)).where(
+        Booking.user_id == User.id, Booking.status == 'CONFIRMED', Booking.check_out <= today).scalar_subquery()
+    conn.execute(update(User).values(points=points, lifetime_points=earned, nights_stayed=func.cast(nights, db.Integer)))
+    # Same thresholds as User.calculate_tier, highest of the points and nights tiers
+    tier = case(
+        (or_(User.lifetime_points >= 1_000_000, User.nights_stayed >= 200), 'Platinum Elite'),
+        (or_(User.lifetime_points >= 500_000, User.nights_stayed >= 70), 'Diamond Elite'),
+        (or_(User.lifetime_points >= 100_000, User.nights_stayed >= 20), 'Gold Elite'),
+        (or_(User.lifetime_points >= 50_000, User.nights_stayed >= 10), 'Silver Elite'),
+        else_='Club Member'
+    )
+    conn.execute(update(User).values(membership_level=tier))
+
+def build_dataset(path, scale='small', seed=42, workers=1, log=print, **overrides):
+    """Create the dataset in a new SQLite file; returns the row counts"""
+    counts = scale_counts(scale, **overrides)
+    rng = random.Random(seed)
+    today = date.today()
+    engine = create_engine(f'sqlite:///{path}')
+    _bulk_load_pragmas(engine)
+    _create_tables(engine)
+
+    brands, amenities, hotels, room_types, links = _reference_rows(rng, counts)
+    password_hash = generate_password_hash(BENCH_PASSWORD)
+    written = dict(bookings=0, reviews=0, transactions=0)
+    with engine.begin() as conn:
+        log(f"  reference data: {len(hotels):,} hotels, {len(room_types):,} room types")
+        _insert(conn, Brand.__table__, brands)
+        _insert(conn, Amenity.__table__, amenities)
+        written['hotels'] = _insert(conn, Hotel.__table__, hotels)
+        written['room_types'] = _insert(conn, RoomType.__table__, room_types)
+        _insert(conn, roomtype_amenity, links)
+        written['users'] = _insert(conn, User.__table__, _user_rows(counts, password_hash))
+        staff_hotels = range(1, min(20, counts['hotels']) + 1)
+        _insert(conn, staff_hotel, (dict(user_id=staff_user_id(counts), hotel_id=h) for h in staff_hotels))
+
+    log(f"  bookings, reviews and earned points ({workers} worker{'s' if workers != 1 else ''})...")
+    partitions = _stay_partitions(room_types, counts, seed, today)
+    with engine.begin() as conn:
+        for bookings, reviews, transactions in _parallel(_generate_stays, partitions, workers):
+            written['bookings'] += _insert_tuples(conn, Booking.__table__, BOOKING_COLUMNS, bookings)
+            written['reviews'] += _insert_tuples(conn, Review.__table__, REVIEW_COLUMNS, reviews)
+            written['transactions'] += _insert_tuples(conn, PointsTransaction.__table__, TRANSACTION_COLUMNS,
+                                                      transactions)
+
+    bonus = max(0, counts['transactions'] - written['transactions'])
+    if bonus:
+        log(f"  {bonus:,} bonus transactions...")
+        tasks = (dict(seed=f'{seed}:bonus:{start}', users=counts['users'], count=min(BONUS_PARTITION, bonus - start))
+                 for start in range(0, bonus, BONUS_PARTITION))
+        with engine.begin() as conn:
+            for transactions in _parallel(_generate_bonus, tasks, workers):
+                written['transactions'] += _insert_tuples(conn, PointsTransaction.__table__, TRANSACTION_COLUMNS,
+                                                          transactions)
+
+    log(f"  indexes and user counters...")
+    _create_indexes(engine)
+    with engine.begin() as conn:
+        derive_user_counters(conn, today)
+    engine.dispose()
+    return written
+
+def check_invariants(conn, today=None):
+    """Problems found in a generated database, as a list of messages (empty when consistent)"""
+    today = today or date.today()
+    checks = [
+        ('room nights sold beyond inventory', """
+            SELECT COUNT(*) FROM booking b JOIN room_type rt ON rt.id = b.roomtype_id
+            WHERE b.status != 'CANCELLED' AND (
+                SELECT SUM(o.rooms_count) FROM booking o
+                WHERE o.roomtype_id = b.roomtype_id AND o.status != 'CANCELLED'
+                  AND o.check_in <= b.check_in AND o.check_out > b.check_in
+            ) > rt.inventory"""),
+        ('bookings whose points_earned differs from their EARNED transactions', """
+            SELECT COUNT(*) FROM booking b
+            WHERE b.points_earned != COALESCE((
+                SELECT SUM(t.points) FROM points_transaction t
+                WHERE t.booking_id = b.id AND t.transaction_type = 'EARNED'), 0)"""),
+        ('users whose points differ from their ledger', """
+            SELECT COUNT(*) FROM user u
+            WHERE u.points != COALESCE((SELECT SUM(t.points) FROM points_transaction t WHERE t.user_id = u.id), 0)"""),
+        ('users whose nights differ from their completed stays', """
+            SELECT COUNT(*) FROM user u
+            WHERE u.nights_stayed != COALESCE((
+                SELECT SUM(julianday(b.check_out) - julianday(b.check_in)) FROM booking b
+                WHERE b.user_id = u.id AND b.status = 'CONFIRMED' AND b.check_out <= :today), 0)"""),
+    ]
+    problems = []
+    for description, sql in checks:
+        found = conn.execute(text(sql), {'today': today.isoformat()}).scalar()
+        if found:
+            problems.append(f'{found:,} {description}')
+    return problems
+
+def finish_dataset(app):
+    """Steps that need the app: stats rollup and points lots"""
+    from hotelweb.main.stats import recompute_user_stats, recompute_site_stats
+    from hotelweb.main.points import backfill_points_lots
+    with app.app_context():
+        recompute_user_stats()
+        recompute_site_stats()
+        backfill_points_lots()
+        db.session.commit()
@@ -9,18 +9,34 @@ from sqlalchemy import or_
 from ..extensions import db
 from ..models import User, Hotel, RoomType, Booking, Amenity
 from ..utils.decorators import staff_required
-from ..utils.security import validate_csrf_token, get_client_ip, check_login_attempts, record_login_attempt
+from ..utils.admission import cost_class
+from ..utils.streaming import stream_page
+from ..utils.pagination import keyset_paginate, rows_in_key_order
+from ..main.stats import record_booking_cancelled, record_booking_reconfirmed
+from ..main.refdata import get_reference_data
+from ..main.loaders import loader_profile
+from ..main.page_cache import mark_hotel_changed
+from ..main.room_batch import validate_room_changeset, apply_room_changeset
+from ..main.permissions import assigned_hotel_ids, can_access_hotel
+from ..utils.images import schedule_variants
+from ..utils.security import validate_csrf_token, get_client_ip, check_login_allowed, record_login_result
 from werkzeug.security import generate_password_hash
 from . import bp
 
 def verify_hotel_access(hotel_id):
     """Verify that the current staff user has access to this hotel"""
-    if current_user.role == 'admin':
-        return True  # Admins have access to all hotels
-    hotel = Hotel.query.get_or_404(hotel_id)
-    if hotel not in current_user.assigned_hotels.all():
-        abort(403)
-    return True
+    if can_access_hotel(hotel_id):
+        return True  # Admins have access to all hotels, staff to their cached assignments
+    if hotel_id is None or db.session.get(Hotel, hotel_id) is None:
+        abort(404)
+    abort(403)
+
+def assigned_hotels():
+    """The current staff user's hotels, for pages that list them"""
+    hotel_ids = assigned_hotel_ids()
+    if not hotel_ids:
+        return []
+    return Hotel.query.filter(Hotel.id.in_(hotel_ids)).order_by(Hotel.id).all()
 
 @bp.route('/login', methods=['GET', 'POST'])
 def login():
@@ -38,10 +54,8 @@ def login():
         password = request.form.get('password', '')
         client_ip = get_client_ip()
         
-        identifier = email if email else client_ip
-        
-        # Check login attempts
-        allowed, remaining, lockout_until = check_login_attempts(identifier, max_attempts=5, lockout_duration=900)
+        # Check login attempts (per account and per IP)
+        allowed, remaining, lockout_until = check_login_allowed(email, client_ip)
         if not allowed:
             if lockout_until:
                 now = datetime.now()
@@ -55,7 +69,7 @@ def login():
             return render_template('staff/login.html')
         
         if not email or not password:
-            record_login_attempt(identifier, False)
+            record_login_result(email, client_ip, False)
             flash('Email and password are required.', 'danger')
             return render_template('staff/login.html')
         
@@ -68,16 +82,16 @@ def login():
         
         if user and password_valid:
             if user.role != 'staff':
-                record_login_attempt(identifier, False)
+                record_login_result(email, client_ip, False)
                 flash('Access denied. This is a staff-only area.', 'danger')
                 return render_template('staff/login.html')
             
-            record_login_attempt(identifier, True)
+            record_login_result(email, client_ip, True)
             login_user(user)
             flash('You have been logged in successfully.', 'success')
             return redirect(url_for('staff.dashboard'))
         else:
-            record_login_attempt(identifier, False)
+            record_login_result(email, client_ip, False)
             flash('Invalid email or password. Please try again.', 'danger')
             if remaining and remaining < 5:
                 flash(f'Warning: {remaining} attempt(s) remaining before account lockout.', 'warning')
@@ -86,30 +100,28 @@ def login():
 
 @bp.route('/dashboard')
 @staff_required
+@cost_class('admin')
 def dashboard():
     """Staff dashboard showing assigned hotels and recent bookings"""
-    assigned_hotels = current_user.assigned_hotels.all()
+    hotels = assigned_hotels()
     
     # Get recent bookings for assigned hotels
-    hotel_ids = [h.id for h in assigned_hotels]
+    hotel_ids = assigned_hotel_ids()
     recent_bookings = Booking.query.filter(
-        Booking.roomtype_id.in_(
-            db.session.query(RoomType.id).filter(RoomType.hotel_id.in_(hotel_ids))
-        )
-    ).order_by(Booking.created_at.desc()).limit(10).all()
+        Booking.hotel_id.in_(hotel_ids)
+    ).options(*loader_profile('booking_admin_list')).order_by(Booking.created_at.desc()).limit(10).all()
     
     # Get pending bookings (upcoming, not cancelled)
     today = date.today()
-    pending_bookings = Booking.query.filter(
-        Booking.roomtype_id.in_(
-            db.session.query(RoomType.id).filter(RoomType.hotel_id.in_(hotel_ids))
-        ),
+    pending_bookings = rows_in_key_order(Booking.query.filter(
+        Booking.hotel_id.in_(hotel_ids),
         Booking.status == 'CONFIRMED',
         Booking.check_in >= today
-    ).order_by(Booking.check_in.asc()).limit(10).all()
+    ).options(*loader_profile('booking_admin_list')), [Booking.check_in, Booking.id], 10,
+        descending=False, partition=(Booking.hotel_id, sorted(hotel_ids)))
     
     return render_template('staff/dashboard.html',
-                         hotels=assigned_hotels,
+                         hotels=hotels,
                          recent_bookings=recent_bookings,
                          pending_bookings=pending_bookings)
 
@@ -124,10 +136,10 @@ def hotels():
     per_page = 10
     
     # Get assigned hotel IDs
-    assigned_hotel_ids = [h.id for h in current_user.assigned_hotels.all()]
+    hotel_ids = assigned_hotel_ids()
     
     # Build query
-    query = Hotel.query.filter(Hotel.id.in_(assigned_hotel_ids))
+    query = Hotel.query.filter(Hotel.id.in_(hotel_ids))
     
     if city_filter:
         query = query.filter(Hotel.city.ilike(f'%{city_filter}%'))
@@ -152,13 +164,12 @@ def hotels():
     hotels = pagination.items
     
     # Get unique cities for filter (from assigned hotels only)
-    assigned_hotels = Hotel.query.filter(Hotel.id.in_(assigned_hotel_ids)).all()
-    cities = sorted(list(set([h.city for h in assigned_hotels if h.city])))
+    all_hotels = assigned_hotels()
+    cities = sorted(list(set([h.city for h in all_hotels if h.city])))
     
     # Get brands for filter (from assigned hotels only)
-    from ..models import Brand
-    brand_ids = list(set([h.brand_id for h in assigned_hotels if h.brand_id]))
-    brands = Brand.query.filter(Brand.id.in_(brand_ids)).order_by(Brand.name).all() if brand_ids else []
+    brand_ids = set([h.brand_id for h in all_hotels if h.brand_id])
+    brands = [b for b in get_reference_data().brands_sorted_by_name() if b.id in brand_ids]
     
     return render_template('staff/hotels.html', 
                          hotels=hotels,
@@ -208,7 +219,9 @@ def edit_hotel(hotel_id):
                     except (ValueError, InvalidOperation):
                         flash('Invalid breakfast price format.', 'danger')
                 
+                mark_hotel_changed(hotel_id)
                 db.session.commit()
+                schedule_variants(image_url)
                 flash('Hotel details updated successfully.', 'success')
         
         # Add new room
@@ -249,7 +262,9 @@ def edit_hotel(hotel_id):
                     pass
                 
                 db.session.add(room)
+                mark_hotel_changed(hotel_id)
                 db.session.commit()
+                schedule_variants(image_url)
                 flash('Room added successfully.', 'success')
         
         # Update room details
@@ -294,7 +309,9 @@ def edit_hotel(hotel_id):
                         except (ValueError, TypeError):
                             pass
                         
+                        mark_hotel_changed(hotel_id)
                         db.session.commit()
+                        schedule_variants(image_url)
                         flash('Room updated successfully.', 'success')
         
         # Delete room
@@ -313,20 +330,43 @@ def edit_hotel(hotel_id):
                         flash('Cannot delete room type with existing bookings.', 'danger')
                     else:
                         db.session.delete(room)
+                        mark_hotel_changed(hotel_id)
                         db.session.commit()
                         flash('Room deleted successfully.', 'success')
         
         return redirect(url_for('staff.edit_hotel', hotel_id=hotel_id))
     
     # GET request - display hotel management page
-    room_types = RoomType.query.filter_by(hotel_id=hotel_id).all()
-    all_amenities = Amenity.query.all()
+    room_types = RoomType.query.filter_by(hotel_id=hotel_id).options(*loader_profile('room_type_edit')).all()
+    all_amenities = get_reference_data().amenities
     
     return render_template('staff/edit_hotel.html', 
                          hotel=hotel, 
                          room_types=room_types,
                          all_amenities=all_amenities)
 
+@bp.route('/hotels/<int:hotel_id>/rooms/batch', methods=['POST'])
+@staff_required
+def batch_edit_rooms(hotel_id):
+    """Apply a JSON changeset of room type upserts, deletes and amenities (see main/room_batch.py)"""
+    verify_hotel_access(hotel_id)
+    if not request.is_json:
+        return jsonify({'success': False, 'message': 'Invalid request format.'}), 400
+    
+    data = request.get_json(silent=True)
+    csrf_token = data.get('csrf_token') if isinstance(data, dict) else None
+    if not validate_csrf_token(csrf_token or request.headers.get('X-CSRFToken')):
+        return jsonify({'success': False, 'message': 'Invalid request. Please try again.'}), 400
+    
+    changeset, errors = validate_room_changeset(hotel_id, data)
+    if errors:
+        return jsonify({'success': False, 'message': 'No changes were saved.', 'errors': errors}), 400
+    
+    summary = apply_room_changeset(hotel_id, changeset)
+    for image_url in changeset.image_urls:
+        schedule_variants(image_url)
+    return jsonify({'success': True, 'message': 'Rooms updated successfully.', **summary})
+
 @bp.route('/rooms')
 @staff_required
 def rooms():
@@ -336,8 +376,8 @@ def rooms():
     page = request.args.get('page', 1, type=int)
     per_page = 10
     
-    assigned_hotels = current_user.assigned_hotels.all()
-    hotel_ids = [h.id for h in assigned_hotels]
+    hotels = assigned_hotels()
+    hotel_ids = assigned_hotel_ids()
     
     query = RoomType.query.filter(RoomType.hotel_id.in_(hotel_ids))
     
@@ -363,7 +403,7 @@ def rooms():
         rooms_by_hotel[rt.hotel_id].append(rt)
     
     return render_template('staff/rooms.html',
-                         hotels=assigned_hotels,
+                         hotels=hotels,
                          rooms_by_hotel=rooms_by_hotel,
                          pagination=pagination,
                          search=search,
@@ -391,11 +431,11 @@ def edit_room(room_id):
         
         if not name:
             flash('Room name is required.', 'danger')
-            return render_template('staff/edit_room.html', room=room, all_amenities=Amenity.query.all())
+            return render_template('staff/edit_room.html', room=room, all_amenities=get_reference_data().amenities)
         
         if not capacity or capacity < 1:
             flash('Capacity must be at least 1.', 'danger')
-            return render_template('staff/edit_room.html', room=room, all_amenities=Amenity.query.all())
+            return render_template('staff/edit_room.html', room=room, all_amenities=get_reference_data().amenities)
         
         room.name = name
         room.capacity = capacity
@@ -411,18 +451,20 @@ def edit_room(room_id):
         except (ValueError, TypeError):
             pass
         
+        mark_hotel_changed(room.hotel_id)
         db.session.commit()
+        schedule_variants(image_url)
         flash('Room details updated successfully.', 'success')
         return redirect(url_for('staff.rooms'))
     
-    all_amenities = Amenity.query.all()
+    all_amenities = get_reference_data().amenities
     return render_template('staff/edit_room.html', room=room, all_amenities=all_amenities)
 
 @bp.route('/rooms/add', methods=['GET', 'POST'])
 @staff_required
 def add_room():
     """Add new room type"""
-    assigned_hotels = current_user.assigned_hotels.all()
+    hotels = assigned_hotels()
     
     if request.method == 'POST':
         # Validate CSRF token
@@ -444,19 +486,19 @@ def add_room():
         # Validation
         if not name:
             flash('Room name is required.', 'danger')
-            return render_template('staff/add_room.html', hotels=assigned_hotels, all_amenities=Amenity.query.all())
+            return render_template('staff/add_room.html', hotels=hotels, all_amenities=get_reference_data().amenities)
         
         if not capacity or capacity < 1:
             flash('Capacity must be at least 1.', 'danger')
-            return render_template('staff/add_room.html', hotels=assigned_hotels, all_amenities=Amenity.query.all())
+            return render_template('staff/add_room.html', hotels=hotels, all_amenities=get_reference_data().amenities)
         
         if not price_per_night or price_per_night <= 0:
             flash('Price per night must be greater than 0.', 'danger')
-            return render_template('staff/add_room.html', hotels=assigned_hotels, all_amenities=Amenity.query.all())
+            return render_template('staff/add_room.html', hotels=hotels, all_amenities=get_reference_data().amenities)
         
         if not inventory or inventory < 1:
             flash('Inventory must be at least 1.', 'danger')
-            return render_template('staff/add_room.html', hotels=assigned_hotels, all_amenities=Amenity.query.all())
+            return render_template('staff/add_room.html', hotels=hotels, all_amenities=get_reference_data().amenities)
         
         # Create room
         room = RoomType(
@@ -479,12 +521,14 @@ def add_room():
             pass
         
         db.session.add(room)
+        mark_hotel_changed(hotel_id)
         db.session.commit()
+        schedule_variants(image_url)
         flash('Room added successfully.', 'success')
         return redirect(url_for('staff.rooms'))
     
-    all_amenities = Amenity.query.all()
-    return render_template('staff/add_room.html', hotels=assigned_hotels, all_amenities=all_amenities)
+    all_amenities = get_reference_data().amenities
+    return render_template('staff/add_room.html', hotels=hotels, all_amenities=all_amenities)
 
 @bp.route('/pricing')
 @staff_required
@@ -495,8 +539,8 @@ def pricing():
     page = request.args.get('page', 1, type=int)
     per_page = 10
     
-    assigned_hotels = current_user.assigned_hotels.all()
-    hotel_ids = [h.id for h in assigned_hotels]
+    hotels = assigned_hotels()
+    hotel_ids = assigned_hotel_ids()
     
     query = RoomType.query.filter(RoomType.hotel_id.in_(hotel_ids))
     
@@ -516,7 +560,7 @@ def pricing():
     
     return render_template('staff/pricing.html', 
                          room_types=room_types,
-                         hotels=assigned_hotels,
+                         hotels=hotels,
                          pagination=pagination,
                          search=search,
                          hotel_filter=hotel_filter)
@@ -559,6 +603,7 @@ def update_pricing():
         except (ValueError, TypeError):
             return jsonify({'success': False, 'message': 'Invalid inventory format.'}), 400
     
+    mark_hotel_changed(room.hotel_id)
     db.session.commit()
     return jsonify({'success': True, 'message': 'Pricing updated successfully.'})
 
@@ -583,6 +628,7 @@ def update_breakfast_price(hotel_id):
         if breakfast_price_decimal < 0:
             return jsonify({'success': False, 'message': 'Breakfast price cannot be negative.'}), 400
         hotel.breakfast_price = breakfast_price_decimal
+        mark_hotel_changed(hotel_id)
         db.session.commit()
         return jsonify({'success': True, 'message': 'Breakfast price updated successfully.'})
     except (ValueError, InvalidOperation):
@@ -590,22 +636,17 @@ def update_breakfast_price(hotel_id):
 
 @bp.route('/bookings')
 @staff_required
+@cost_class('admin')
 def bookings():
     """View bookings for assigned hotels with search and pagination"""
     search = request.args.get('search', '').strip()
     status_filter = request.args.get('status', '').strip()
-    page = request.args.get('page', 1, type=int)
     per_page = 10
     
-    assigned_hotels = current_user.assigned_hotels.all()
-    hotel_ids = [h.id for h in assigned_hotels]
+    hotel_ids = assigned_hotel_ids()
     
     # Get all bookings for assigned hotels
-    query = Booking.query.filter(
-        Booking.roomtype_id.in_(
-            db.session.query(RoomType.id).filter(RoomType.hotel_id.in_(hotel_ids))
-        )
-    )
+    query = Booking.query.filter(Booking.hotel_id.in_(hotel_ids))
     
     if status_filter:
         query = query.filter(Booking.status == status_filter)
@@ -618,27 +659,31 @@ def bookings():
             )
         )
     
-    query = query.order_by(Booking.check_in.desc())
-    
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Newest check-in first, paged by (check_in, id) cursors rather than OFFSET, with
+    # an index seek per hotel. No total count: it would read every matching row
+    pagination = keyset_paginate(query.options(*loader_profile('booking_admin_list')),
+                                 [Booking.check_in, Booking.id], per_page,
+                                 after=request.args.get('after'), before=request.args.get('before'),
+                                 partition=(Booking.hotel_id, sorted(hotel_ids)))
     bookings = pagination.items
     
-    return render_template('staff/bookings.html', 
-                         bookings=bookings,
-                         pagination=pagination,
-                         search=search,
-                         status_filter=status_filter)
+    return stream_page('staff/bookings.html', 
+                       bookings=bookings,
+                       pagination=pagination,
+                       search=search,
+                       status_filter=status_filter)
 
 @bp.route('/bookings/<int:booking_id>/confirm', methods=['POST'])
 @staff_required
 def confirm_booking(booking_id):
     """Confirm a booking (mark as confirmed)"""
     booking = Booking.query.get_or_404(booking_id)
-    verify_hotel_access(booking.room_type.hotel_id)
+    verify_hotel_access(booking.hotel_id)
     
     if booking.status == 'CONFIRMED':
         return jsonify({'success': False, 'message': 'Booking is already confirmed.'}), 400
     
+    record_booking_reconfirmed(booking)
     booking.status = 'CONFIRMED'
     db.session.commit()
     
@@ -649,11 +694,12 @@ def confirm_booking(booking_id):
 def cancel_booking(booking_id):
     """Cancel a booking (mark as cancelled)"""
     booking = Booking.query.get_or_404(booking_id)
-    verify_hotel_access(booking.room_type.hotel_id)
+    verify_hotel_access(booking.hotel_id)
     
     if booking.status == 'CANCELLED':
         return jsonify({'success': False, 'message': 'Booking is already cancelled.'}), 400
     
+    record_booking_cancelled(booking)
     booking.status = 'CANCELLED'
     db.session.commit()
     
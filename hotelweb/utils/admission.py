@@ -0,0 +1,150 @@
+"""
+Admission control for expensive endpoints (ADMISSION_CONTROL=true)
+
+Routes declare a cost class with @cost_class('search'). Each class has:
+  - token buckets per client IP and, for logged-in users, per user
+    (ADMISSION_RATE_LIMITS: requests per second and burst). A client that runs
+    out gets 429 Too Many Requests with Retry-After set to when a token is back;
+  - a cap on requests of that class running at once in this worker
+    (ADMISSION_CONCURRENCY). Past the cap a request gets 503 Service
+    Unavailable with Retry-After: 1 straight away instead of queueing for the
+    database behind the others. A streamed page keeps its slot until its
+    template has rendered.
+
+Buckets and caps are per worker: with N workers a client can get up to N
+times the configured rate, and the database sees up to N times the cap.
+Buckets are kept in an LRU of ADMISSION_MAX_CLIENTS entries.
+
+The client IP is request.remote_addr. Behind reverse proxies, set
+TRUSTED_PROXY_COUNT so ProxyFix resolves it. X-Forwarded-For sent by a
+client is never read, so rotating it doesn't get a client fresh buckets.
+"""
+import time
+import math
+import threading
+from collections import OrderedDict
+from functools import partial, wraps
+from flask import current_app, g, request
+from flask_login import current_user
+from werkzeug.exceptions import ServiceUnavailable, TooManyRequests
+
+class TokenBuckets:
+    """Token buckets by key in a bounded, thread-safe LRU"""
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._buckets = OrderedDict()  # key -> [tokens, last refill time]
+        self._lock = threading.Lock()
+
+    def take(self, keys, rate, burst):
+        """Take a token from every key's bucket, or none; returns seconds to wait (0 if admitted)"""
+        now = time.monotonic()
+        with self._lock:
+            buckets = []
+            for key in keys:
+                bucket = self._buckets.pop(key, None) or [float(burst), now]
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                self._buckets[key] = bucket
+                buckets.append(bucket)
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+            short = max((1 - bucket[0] for bucket in buckets), default=0)
+            if short > 0:
+                return short / rate
+            for bucket in buckets:
+                bucket[0] -= 1
+            return 0
+
+class ConcurrencyLimits:
+    """Requests of each cost class in flight in this worker"""
+    def __init__(self):
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, name, limit):
+        with self._lock:
+            if self._active.get(name, 0) >= limit:
+                return False
+            self._active[name] = self._active.get(name, 0) + 1
+            return True
+
+    def release(self, name):
+        with self._lock:
+            self._active[name] -= 1
+
+    def active(self):
+        with self._lock:
+            return dict(self._active)
+
+_stats = {'admitted': 0, 'rate_limited': 0, 'overloaded': 0}
+
+def _limiter():
+    state = current_app.extensions.get('admission')
+    if state is None:
+        state = current_app.extensions['admission'] = (
+            TokenBuckets(current_app.config.get('ADMISSION_MAX_CLIENTS', 10000)), ConcurrencyLimits()
+        )
+    return state
+
+def _client_keys(name):
+    keys = [(name, 'ip', request.remote_addr)]
+    if current_user.is_authenticated:
+        keys.append((name, 'user', current_user.id))
+    return keys
+
+def admission_stats():
+    return dict(_stats)
+
+def cost_class(name):
+    """Declare a view's cost class; place it under @bp.route and any auth decorators"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            config = current_app.config
+            if not config.get('ADMISSION_CONTROL'):
+                return f(*args, **kwargs)
+            buckets, concurrency = _limiter()
+
+            rate_limit = config.get('ADMISSION_RATE_LIMITS', {}).get(name)
+            if rate_limit:
+                rate, burst = rate_limit
+                wait = buckets.take(_client_keys(name), rate, burst)
+                if wait:
+                    _stats['rate_limited'] += 1
+                    current_app.logger.info('Rate limited %s (%s) for %.1fs', request.path, request.remote_addr, wait)
+                    raise TooManyRequests(retry_after=math.ceil(wait))
+
+            limit = config.get('ADMISSION_CONCURRENCY', {}).get(name)
+            if limit is None:
+                _stats['admitted'] += 1
+                return f(*args, **kwargs)
+            if not concurrency.acquire(name, limit):
+                _stats['overloaded'] += 1
+                current_app.logger.warning('Shed %s: %d %s requests already running', request.path, limit, name)
+                raise ServiceUnavailable(retry_after=1)
+            held = False
+            try:
+                _stats['admitted'] += 1
+                rv = f(*args, **kwargs)
+                if isinstance(rv, current_app.response_class) and rv.is_streamed:
+                    # A streamed page (utils/streaming.py) renders while it is sent
+                    g.admission_slot = partial(concurrency.release, name)
+                    held = True
+                return rv
+            finally:
+                if not held:
+                    concurrency.release(name)
+        decorated_function.cost_class = name
+        return decorated_function
+    return decorator
+
+def init_admission(app):
+    if not app.config.get('ADMISSION_CONTROL'):
+        return
+
+    # teardown_request of a streamed page runs after its last chunk is rendered
+    @app.teardown_request
+    def release_streamed_slot(exc):
+        release = g.pop('admission_slot', None)
+        if release is not None:
+            release()
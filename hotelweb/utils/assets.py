@@ -0,0 +1,99 @@
+"""
+Fingerprinted, precompressed static assets
+
+scripts/tools/build_assets.py concatenates and minifies the BUNDLES below
+and every file under static/js and static/css into static/dist, named by
+content hash (site.3f9a2c1b.js), with .gz (and .br when the brotli package
+is installed) next to each, and writes static/dist/manifest.json.
+
+Templates refer to assets by their logical name:
+    {{ asset_tags('site.js') }}           script/link tags for a bundle
+    {{ static_url('css/portal.css') }}    URL of a single file
+
+With a manifest these resolve to the fingerprinted files, served with
+"Cache-Control: public, max-age=31536000, immutable" and the precompressed
+variant the browser accepts. Without one (no build yet, or
+STATIC_ASSETS_MANIFEST=false while editing JS/CSS) they fall back to the
+source files, so development needs no build step.
+"""
+import os
+import json
+import mimetypes
+from flask import current_app, request, send_from_directory, url_for
+from markupsafe import Markup, escape
+
+DIST_DIR = 'dist'  # Under the static folder
+MANIFEST_NAME = 'manifest.json'
+IMMUTABLE_MAX_AGE = 31536000  # One year; a changed file gets a new name
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))  # Preferred first
+
+# Bundle name -> source files (relative to static/), concatenated in order
+BUNDLES = {
+    'site.js': ['js/main.js', 'js/celebration.js', 'js/tour_guide.js', 'js/keyboard_shortcuts.js',
+                'js/keyboard_navigation.js', 'js/language.js'],
+    'site.css': ['css/main.css'],
+    'portal.css': ['css/portal.css'],
+    'login.js': ['js/validation.js', 'js/login.js'],
+    'register.js': ['js/validation.js', 'js/register.js'],
+    'search.js': ['js/search_results.js', 'js/favorites.js'],
+    'hotel_detail.js': ['js/hotel_detail.js', 'js/favorites.js'],
+    'my_stays.js': ['js/my_stays.js', 'js/favorites.js'],
+}
+
+def manifest_path(static_folder):
+    return os.path.join(static_folder, DIST_DIR, MANIFEST_NAME)
+
+def load_manifest(app):
+    """Logical name -> fingerprinted path, or {} when assets aren't built or are turned off"""
+    if not app.config.get('STATIC_ASSETS_MANIFEST', True):
+        return {}
+    try:
+        with open(manifest_path(app.static_folder)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _manifest():
+    return current_app.extensions.get('asset_manifest', {})
+
+def static_url(filename):
+    """URL of a static file, fingerprinted when it has been built"""
+    return url_for('static', filename=_manifest().get(filename, filename))
+
+def asset_tags(bundle):
+    """<script> or <link> tags for a bundle: the built file, or its sources"""
+    manifest = _manifest()
+    filenames = [manifest[bundle]] if bundle in manifest else BUNDLES[bundle]
+    if bundle.endswith('.css'):
+        tag = '<link rel="stylesheet" href="{}">'
+    else:
+        tag = '<script src="{}"></script>'
+    return Markup('\n'.join(tag.format(escape(url_for('static', filename=name))) for name in filenames))
+
+def serve_static(filename):
+    """Static files; built assets get immutable caching and a precompressed body"""
+    if filename not in current_app.extensions.get('asset_files', ()):
+        return current_app.send_static_file(filename)
+    mimetype = mimetypes.guess_type(filename)[0]
+    for encoding, suffix in PRECOMPRESSED:
+        if encoding in request.accept_encodings and \
+                os.path.exists(os.path.join(current_app.static_folder, filename + suffix)):
+            response = send_from_directory(current_app.static_folder, filename + suffix,
+                                           mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(current_app.static_folder, filename,
+                                       mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.vary.add('Accept-Encoding')
+    return response
+
+def init_assets(app):
+    manifest = load_manifest(app)
+    app.extensions['asset_manifest'] = manifest
+    app.extensions['asset_files'] = frozenset(manifest.values())
+    app.jinja_env.globals.update(static_url=static_url, asset_tags=asset_tags)
+    if manifest:
+        app.view_functions['static'] = serve_static
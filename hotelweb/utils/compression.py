@@ -0,0 +1,110 @@
+"""
+Response compression (COMPRESSION_ENABLED=true)
+
+Text responses (COMPRESSION_MIMETYPES) are compressed with brotli when the
+brotli package is installed and the client accepts it, otherwise gzip.
+Skipped are:
+  - responses under COMPRESSION_MIN_SIZE bytes, or that compression would grow;
+  - responses that already have a Content-Encoding, such as the precompressed
+    built assets (utils/assets.py), and files sent with send_file;
+  - HEAD requests, 204/206/304 responses and Cache-Control: no-transform.
+
+Streamed responses (utils/streaming.py) are compressed as they are sent,
+flushing the compressor after every chunk so the browser gets each part of
+the page as soon as it is rendered.
+
+A compressed response gets Vary: Accept-Encoding and a weak ETag, since its
+bytes differ from the uncompressed representation's.
+"""
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ENCODINGS = ('br', 'gzip')  # Preferred first when the client rates them equally
+SKIPPED_STATUSES = (204, 206, 304)
+
+def choose_encoding(accept_encodings):
+    """'br', 'gzip' or None for the request's Accept-Encoding"""
+    best, best_quality = None, 0
+    for encoding in ENCODINGS:
+        if encoding == 'br' and brotli is None:
+            continue
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def _compressor(encoding, config):
+    """(compress(chunk) -> bytes flushed for sending, finish() -> bytes)"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config.get('COMPRESSION_BROTLI_QUALITY', 4))
+        return lambda chunk: compressor.process(chunk) + compressor.flush(), compressor.finish
+    compressor = zlib.compressobj(config.get('COMPRESSION_GZIP_LEVEL', 6), zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+def compress(data, encoding, config):
+    if encoding == 'br':
+        return brotli.compress(data, quality=config.get('COMPRESSION_BROTLI_QUALITY', 4))
+    compressor = zlib.compressobj(config.get('COMPRESSION_GZIP_LEVEL', 6), zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+def _compress_stream(chunks, encoding, config):
+    process, finish = _compressor(encoding, config)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                yield process(chunk)
+        yield finish()
+    finally:
+        # Ends the wrapped generator (and the request context it holds) if the client went away
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+def _compressible(response, config):
+    return (
+        request.method != 'HEAD'
+        and 200 <= response.status_code and response.status_code not in SKIPPED_STATUSES
+        and 'Content-Encoding' not in response.headers
+        and not response.direct_passthrough
+        and response.mimetype in config.get('COMPRESSION_MIMETYPES', ())
+        and not response.cache_control.no_transform
+    )
+
+def compress_response(response):
+    config = current_app.config
+    if not _compressible(response, config):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding, config)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config.get('COMPRESSION_MIN_SIZE', 1024):
+            return response
+        compressed = compress(data, encoding, config)
+        if len(compressed) >= len(data):
+            return response
+        response.set_data(compressed)
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def init_compression(app):
+    if not app.config.get('COMPRESSION_ENABLED'):
+        return
+    app.after_request(compress_response)
@@ -0,0 +1,61 @@
+"""
+Read/write splitting between the primary database and a read replica
+
+Views decorated with @replica_reads send their queries to the 'replica' bind
+(SQLALCHEMY_BINDS, configured from REPLICA_DATABASE_URL). Flushes and Core
+INSERT/UPDATE/DELETE statements always go to the primary, as does every query
+outside those views.
+
+A request that writes sticks to the primary for the rest of the request, and
+the client's session remembers the write for REPLICA_STICKY_SECONDS so the
+next pages it loads (book_room -> my_stays, a new review -> the hotel page)
+see it even while the replica lags behind. Without a replica bind the
+decorator has no effect.
+"""
+import time
+from functools import wraps
+from flask import current_app, g, has_request_context, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND = 'replica'
+STICKY_SESSION_KEY = 'db_primary_until'
+
+class RoutingSession(Session):
+    """Session that sends reads from replica views to the replica bind"""
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not getattr(clause, 'is_dml', False) and _use_replica():
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def _use_replica():
+    return has_request_context() and g.get('db_replica_reads', False) and not g.get('db_use_primary', False)
+
+def replica_enabled():
+    return REPLICA_BIND in current_app.config.get('SQLALCHEMY_BINDS', {})
+
+def replica_reads(view):
+    """Decorator: the view is read-only, so its queries may use the replica"""
+    @wraps(view)
+    def decorated_function(*args, **kwargs):
+        if replica_enabled():
+            g.db_replica_reads = True
+            if session.get(STICKY_SESSION_KEY, 0) > time.time():
+                g.db_use_primary = True  # This client wrote recently
+        return view(*args, **kwargs)
+    return decorated_function
+
+def stick_to_primary():
+    """Read from the primary for the rest of this request and the client's next few seconds"""
+    if not has_request_context():
+        return
+    g.db_use_primary = True
+    if replica_enabled():
+        session[STICKY_SESSION_KEY] = time.time() + current_app.config.get('REPLICA_STICKY_SECONDS', 10)
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _stick_after_write(db_session, flush_context, instances):
+    if db_session.new or db_session.dirty or db_session.deleted:
+        stick_to_primary()
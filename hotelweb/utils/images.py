@@ -0,0 +1,226 @@
+"""
+Responsive image variants
+
+scripts/tools/build_image_variants.py resizes the photos under static/img
+(hotels, rooms, cities, brand and page heroes) to each of VARIANT_WIDTHS
+narrower than the original, plus one at the original width capped at
+MAX_WIDTH, as WebP and JPEG. The files go to static/img/variants, named by
+the source's content hash, and are listed in static/img/variants/manifest.json:
+
+    "img/hotels/hotel_7.jpg": {"width": 1920, "height": 1280,
+                               "webp": {"320": "img/variants/hotels/hotel_7.1a2b3c4d.320.webp", ...},
+                               "jpeg": {"320": "img/variants/hotels/hotel_7.1a2b3c4d.320.jpg", ...}}
+
+Templates use:
+    {{ responsive_img(hotel.image_url, hotel.name, sizes='(min-width: 768px) 33vw, 100vw', class_='hotel-card-img') }}
+        a <picture> with WebP and JPEG srcsets, width/height and loading="lazy"
+    style="{{ background_style(url) }}"
+        background-image declarations with the variants in an image-set()
+
+An image without variants (an external URL, or no build yet) gets a plain
+<img>, so nothing depends on the build having run.
+
+A new image_url saved through the staff or admin hotel and room forms is
+passed to schedule_variants(), which builds that image's variants on a
+background thread of this worker when Pillow is installed and
+IMAGE_VARIANTS_ON_SAVE is on. Other workers see the updated manifest within
+IMAGE_MANIFEST_CHECK_SECONDS.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, url_for
+from markupsafe import Markup, escape
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+
+VARIANT_DIR = 'img/variants'  # Under the static folder
+MANIFEST_NAME = 'manifest.json'
+SOURCE_DIR = 'img'
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+VARIANT_WIDTHS = (320, 640, 1024, 1600)
+MAX_WIDTH = 2048  # Largest variant; bigger originals are never sent
+BACKGROUND_WIDTH = 1600  # Variant used for full-width hero backgrounds
+EXIF_ORIENTATION = 0x0112
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)  # Stored sideways; width and height swap when displayed
+# Format -> (MIME type, extension, Pillow save options); the first is preferred
+FORMATS = {
+    'webp': ('image/webp', '.webp', {'quality': 80, 'method': 6}),
+    'jpeg': ('image/jpeg', '.jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+logger = logging.getLogger(__name__)
+_manifest_lock = threading.Lock()
+_executor = {'pool': None, 'pending': set()}
+
+def manifest_path(static_folder):
+    return os.path.join(static_folder, VARIANT_DIR, MANIFEST_NAME)
+
+def read_manifest(static_folder):
+    try:
+        with open(manifest_path(static_folder)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def update_manifest(static_folder, entries, replace=False):
+    """Merge entries into the manifest file (or replace it) with an atomic rename"""
+    path = manifest_path(static_folder)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _manifest_lock:
+        manifest = {} if replace else read_manifest(static_folder)
+        manifest.update(entries)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(temp_path, path)
+    return manifest
+
+def static_filename(src, static_url_path='/static'):
+    """'img/hotels/hotel_7.jpg' for '/static/img/hotels/hotel_7.jpg', None for other URLs"""
+    prefix = static_url_path.rstrip('/') + '/'
+    if not src or not src.startswith(prefix):
+        return None
+    filename = src[len(prefix):].split('?', 1)[0]
+    if '..' in filename.split('/') or not filename.lower().endswith(SOURCE_EXTENSIONS):
+        return None
+    return filename
+
+def variant_widths(width):
+    return [w for w in VARIANT_WIDTHS if w < min(width, MAX_WIDTH)] + [min(width, MAX_WIDTH)]
+
+def generate_variants(static_folder, filename):
+    """Write the variants of one source image; returns its manifest entry"""
+    if Image is None:
+        raise RuntimeError('Pillow is not installed')
+    source = os.path.join(static_folder, filename)
+    with open(source, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:8]
+    stem = os.path.splitext(os.path.relpath(filename, SOURCE_DIR))[0]
+    with Image.open(source) as original:
+        width, height = original.size
+        if original.getexif().get(EXIF_ORIENTATION) in ROTATED_ORIENTATIONS:
+            width, height = height, width
+        entry = {'width': width, 'height': height}
+        variants = []  # (width, format, path under static/)
+        for name, (_, extension, _) in FORMATS.items():
+            entry[name] = {}
+            for variant_width in variant_widths(width):
+                variant = f'{VARIANT_DIR}/{stem}.{digest}.{variant_width}{extension}'
+                entry[name][str(variant_width)] = variant
+                variants.append((variant_width, name, variant))
+        missing = [v for v in variants if not os.path.exists(os.path.join(static_folder, v[2]))]
+        if not missing:  # Same content hash, already built
+            return entry
+        image = ImageOps.exif_transpose(original).convert('RGB')
+    resized = {}
+    for variant_width, name, variant in missing:
+        if variant_width not in resized:
+            size = (variant_width, max(1, round(height * variant_width / width)))
+            resized[variant_width] = image if size == image.size else image.resize(size, Image.LANCZOS)
+        path = os.path.join(static_folder, variant)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        resized[variant_width].save(path, name.upper(), **FORMATS[name][2])
+    return entry
+
+def _state():
+    """This app's manifest, re-read when another process has rewritten the file"""
+    state = current_app.extensions['image_variants']
+    now = time.monotonic()
+    if now - state['checked'] >= current_app.config.get('IMAGE_MANIFEST_CHECK_SECONDS', 30):
+        state['checked'] = now
+        try:
+            mtime = os.stat(manifest_path(current_app.static_folder)).st_mtime
+        except OSError:
+            mtime = None
+        if mtime != state['mtime']:
+            state['mtime'] = mtime
+            state['entries'] = read_manifest(current_app.static_folder)
+    return state
+
+def image_variants(src):
+    """Manifest entry for an image URL, or None"""
+    filename = static_filename(src, current_app.static_url_path)
+    return _state()['entries'].get(filename) if filename else None
+
+def _srcset(entry, fmt):
+    return ', '.join(
+        f"{url_for('static', filename=path)} {width}w"
+        for width, path in sorted(entry[fmt].items(), key=lambda item: int(item[0]))
+    )
+
+def responsive_img(src, alt='', sizes='100vw', class_=None, lazy=True, **attrs):
+    """<picture> with WebP/JPEG srcsets for src, or a plain <img> when it has no variants"""
+    entry = image_variants(src)
+    img_attrs = {'src': src, 'alt': alt, 'class': class_}
+    if entry:
+        img_attrs.update(srcset=_srcset(entry, 'jpeg'), sizes=sizes, width=entry['width'], height=entry['height'])
+    if lazy:
+        img_attrs.update(loading='lazy', decoding='async')
+    img_attrs.update(attrs)
+    img = '<img {}>'.format(' '.join(
+        f'{name}="{escape(value)}"' for name, value in img_attrs.items() if value is not None
+    ))
+    if not entry:
+        return Markup(img)
+    return Markup(
+        f'<picture class="responsive-img">'
+        f'<source type="image/webp" srcset="{escape(_srcset(entry, "webp"))}" sizes="{escape(sizes)}">'
+        f'{img}</picture>'
+    )
+
+def background_style(src, width=BACKGROUND_WIDTH):
+    """background-image declarations for a hero: the original, then an image-set() of variants"""
+    style = f"background-image: url('{escape(src)}');"
+    entry = image_variants(src)
+    if not entry:
+        return Markup(style)
+    candidates = []
+    for fmt, (mimetype, _, _) in FORMATS.items():
+        widths = sorted(int(w) for w in entry[fmt])
+        chosen = next((w for w in widths if w >= width), widths[-1])
+        url = url_for('static', filename=entry[fmt][str(chosen)])
+        candidates.append(f"url('{escape(url)}') type('{mimetype}')")
+    # Browsers without image-set() keep the first declaration
+    return Markup(f"{style} background-image: image-set({', '.join(candidates)});")
+
+def _build_in_background(app, filename):
+    try:
+        entry = generate_variants(app.static_folder, filename)
+        manifest = update_manifest(app.static_folder, {filename: entry})
+        state = app.extensions['image_variants']
+        state['entries'] = manifest
+        app.logger.info('Built %d image variants for %s', 2 * len(entry['jpeg']), filename)
+    except Exception:
+        app.logger.exception('Could not build image variants for %s', filename)
+    finally:
+        _executor['pending'].discard(filename)
+
+def schedule_variants(image_url):
+    """Build variants for a newly saved image URL in the background; no-op if not applicable"""
+    app = current_app._get_current_object()
+    if not app.config.get('IMAGE_VARIANTS_ON_SAVE', True) or Image is None:
+        return False
+    filename = static_filename(image_url, app.static_url_path)
+    if not filename or filename in _executor['pending'] or image_variants(image_url) \
+            or not os.path.isfile(os.path.join(app.static_folder, filename)):
+        return False
+    if _executor['pool'] is None:
+        _executor['pool'] = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-variants')
+    _executor['pending'].add(filename)
+    _executor['pool'].submit(_build_in_background, app, filename)
+    return True
+
+def init_images(app):
+    app.extensions['image_variants'] = {'entries': {}, 'mtime': None, 'checked': float('-inf')}
+    app.jinja_env.globals.update(responsive_img=responsive_img, background_style=background_style,
+                                 image_variants=image_variants)
+    if Image is None and app.config.get('IMAGE_VARIANTS_ON_SAVE', True):
+        logger.info('Pillow is not installed; newly saved images are served without variants')
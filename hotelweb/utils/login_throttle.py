@@ -0,0 +1,149 @@
+"""
+Login rate limiting shared by the guest, staff and admin login forms
+
+Failed logins are counted per account (email) and per client IP over a
+sliding window of LOGIN_WINDOW_SECONDS. An account with LOGIN_MAX_ATTEMPTS
+failures in the window, or an IP with LOGIN_IP_MAX_ATTEMPTS (higher, since
+many guests can share one address), is locked for LOGIN_LOCKOUT_SECONDS after
+its latest failure. A successful login clears the account's failures but not
+the IP's, so logging in to one account does not reset a guessing run.
+
+Failures are kept in an attempt store chosen with LOGIN_ATTEMPT_STORE:
+  - 'memory': a per-process LRU of at most LOGIN_ATTEMPT_MAX_ENTRIES keys whose
+    entries expire once they can no longer affect a lockout; each worker
+    counts on its own, so use it with a single worker;
+  - 'database': a login_attempt table in the main database, shared by every
+    worker and host; old rows are pruned as it is used.
+"""
+import time
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import delete, func, select
+from ..extensions import db
+from ..models import LoginAttempt
+
+MAX_FAILURES_KEPT = 100  # Per key; more than any limit needs
+PRUNE_INTERVAL = 60  # Seconds between deletes of expired rows (database store)
+
+class MemoryAttemptStore:
+    """Failure timestamps per key in a bounded, thread-safe LRU"""
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl  # Seconds after its latest failure that a key is forgotten
+        self._entries = OrderedDict()  # key -> deque of failure times, least recently failed first
+        self._lock = threading.Lock()
+
+    def failures(self, key, since):
+        """(failures at or after since, time of the latest failure or None)"""
+        with self._lock:
+            times = self._entries.get(key)
+            if not times:
+                return 0, None
+            if times[-1] < time.time() - self.ttl:
+                del self._entries[key]
+                return 0, None
+            return sum(1 for t in times if t >= since), times[-1]
+
+    def add_failure(self, key, when):
+        with self._lock:
+            times = self._entries.pop(key, None) or deque(maxlen=MAX_FAILURES_KEPT)
+            times.append(when)
+            self._entries[key] = times
+            # Oldest entries first: drop the expired ones and anything over the size bound
+            cutoff = when - self.ttl
+            while self._entries:
+                oldest_key, oldest = next(iter(self._entries.items()))
+                if len(self._entries) <= self.max_entries and oldest[-1] >= cutoff:
+                    break
+                del self._entries[oldest_key]
+
+    def clear(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+class DatabaseAttemptStore:
+    """Failures as rows of the login_attempt table, visible to every worker"""
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._last_prune = 0.0
+
+    def failures(self, key, since):
+        count, latest = db.session.execute(
+            select(func.count(LoginAttempt.id), func.max(LoginAttempt.failed_at))
+            .where(LoginAttempt.key == key, LoginAttempt.failed_at >= since)
+        ).one()
+        return count, latest
+
+    def add_failure(self, key, when):
+        db.session.add(LoginAttempt(key=key, failed_at=when))
+        if when - self._last_prune > PRUNE_INTERVAL:
+            self._last_prune = when
+            db.session.execute(delete(LoginAttempt).where(LoginAttempt.failed_at < when - self.ttl))
+        db.session.commit()
+
+    def clear(self, key):
+        db.session.execute(delete(LoginAttempt).where(LoginAttempt.key == key))
+        db.session.commit()
+
+def attempt_store():
+    """This app's attempt store, created on first use"""
+    store = current_app.extensions.get('login_attempt_store')
+    if store is None:
+        config = current_app.config
+        ttl = max(config.get('LOGIN_WINDOW_SECONDS', 900), config.get('LOGIN_LOCKOUT_SECONDS', 900))
+        if config.get('LOGIN_ATTEMPT_STORE', 'memory') == 'database':
+            store = DatabaseAttemptStore(ttl)
+        else:
+            store = MemoryAttemptStore(config.get('LOGIN_ATTEMPT_MAX_ENTRIES', 10000), ttl)
+        current_app.extensions['login_attempt_store'] = store
+    return store
+
+def check_key(key, max_attempts, lockout_duration, window=None):
+    """(allowed, remaining attempts, lockout_until) for one key"""
+    window = window or current_app.config.get('LOGIN_WINDOW_SECONDS', 900)
+    now = time.time()
+    failures, latest = attempt_store().failures(key, now - window)
+    if failures >= max_attempts and latest + lockout_duration > now:
+        return False, 0, datetime.fromtimestamp(latest + lockout_duration)
+    return True, max(0, max_attempts - failures), None
+
+def record_failure(key):
+    attempt_store().add_failure(key, time.time())
+
+def clear_failures(key):
+    attempt_store().clear(key)
+
+def _keys(email, client_ip):
+    return (f'account:{email}' if email else None), (f'ip:{client_ip}' if client_ip else None)
+
+def check_login_allowed(email, client_ip):
+    """
+    (allowed, remaining, lockout_until) for a login attempt; remaining counts
+    the account's attempts left, lockout_until is when a lockout ends
+    """
+    config = current_app.config
+    lockout = config.get('LOGIN_LOCKOUT_SECONDS', 900)
+    account_key, ip_key = _keys(email, client_ip)
+    remaining = None
+    if ip_key:
+        allowed, remaining, lockout_until = check_key(ip_key, config.get('LOGIN_IP_MAX_ATTEMPTS', 20), lockout)
+        if not allowed:
+            return allowed, remaining, lockout_until
+    if account_key:
+        return check_key(account_key, config.get('LOGIN_MAX_ATTEMPTS', 5), lockout)
+    return True, remaining, None
+
+def record_login_result(email, client_ip, success):
+    account_key, ip_key = _keys(email, client_ip)
+    if success:
+        if account_key:
+            clear_failures(account_key)
+        return
+    for key in (account_key, ip_key):
+        if key:
+            record_failure(key)
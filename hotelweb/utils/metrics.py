@@ -0,0 +1,289 @@
+"""
+Built-in metrics, exposed in Prometheus text format at /metrics
+
+Each worker records into plain dicts with no lock on the request path (under
+the GIL an increment can at worst be lost to a concurrent one, which metrics
+tolerate):
+
+  - hotelweb_http_request_duration_seconds: latency histogram per endpoint
+    (for streamed pages, until the last chunk is rendered)
+  - hotelweb_http_requests_total: request count per endpoint and status
+  - hotelweb_db_pool_checkout_seconds: how long connections stay checked out
+  - hotelweb_cache_lookups_total / hotelweb_cache_hit_ratio: the reference data,
+    page and fragment caches, plus the invalidation bus counters
+
+Workers share nothing in memory, so every METRICS_FLUSH_INTERVAL seconds each
+one writes its snapshot to METRICS_DIR/worker-<pid>-<start>.json, and /metrics
+sums all snapshots. Files of stopped workers are kept (counters must not go
+backwards) until they are older than METRICS_RETENTION seconds.
+
+/metrics is served to admins, to scrapers sending "Authorization: Bearer
+<METRICS_TOKEN>", and, only with METRICS_ALLOW_LOCALHOST=true, to requests
+from the loopback address. Leave that off behind a reverse proxy on the same
+host, where every request comes from 127.0.0.1.
+
+p50/p99 for an endpoint, in PromQL:
+    histogram_quantile(0.99, sum by (le) (rate(hotelweb_http_request_duration_seconds_bucket{endpoint="main.search"}[5m])))
+"""
+import os
+import hmac
+import json
+import time
+import tempfile
+from collections import defaultdict
+from flask import Response, abort, current_app, g, request
+from flask_login import current_user
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+HISTOGRAM_BUCKETS = {
+    'hotelweb_http_request_duration_seconds': LATENCY_BUCKETS,
+    'hotelweb_db_pool_checkout_seconds': CHECKOUT_BUCKETS,
+}
+LOCAL_ADDRESSES = {'127.0.0.1', '::1'}
+
+_histograms = {}  # (name, labels) -> [bucket counts..., +Inf count, sum]
+_counters = defaultdict(float)  # (name, labels) -> value
+_state = {'last_flush': 0.0, 'pid': None, 'worker_id': None}
+
+HELP = {
+    'hotelweb_http_request_duration_seconds': ('histogram', 'Request latency by endpoint'),
+    'hotelweb_http_requests_total': ('counter', 'Requests by endpoint and status'),
+    'hotelweb_db_pool_checkout_seconds': ('histogram', 'Time a pooled DB connection stays checked out'),
+    'hotelweb_db_pool_checked_out': ('gauge', 'DB connections checked out right now'),
+    'hotelweb_cache_lookups_total': ('counter', 'Cache lookups by cache and result'),
+    'hotelweb_cache_hit_ratio': ('gauge', 'Share of cache lookups served from the cache'),
+    'hotelweb_cache_bus_total': ('counter', 'Cache invalidation bus activity'),
+    'hotelweb_admission_total': ('counter', 'Cost-classed requests admitted, rate limited (429) or shed (503)'),
+}
+
+def _worker_id():
+    """Unique per process; a forked worker drops what it inherited from its parent"""
+    if _state['pid'] != os.getpid():
+        _histograms.clear()
+        _counters.clear()
+        _state.update(pid=os.getpid(), worker_id=f'{os.getpid()}-{int(time.time())}', last_flush=0.0)
+    return _state['worker_id']
+
+def observe(name, labels, value):
+    """Add one observation to a histogram; labels is a tuple of (key, value) pairs"""
+    buckets = HISTOGRAM_BUCKETS[name]
+    key = (name, labels)
+    series = _histograms.get(key)
+    if series is None:
+        series = _histograms.setdefault(key, [0] * (len(buckets) + 2))
+    for i, bound in enumerate(buckets):
+        if value <= bound:
+            series[i] += 1
+            break
+    else:
+        series[len(buckets)] += 1
+    series[-1] += value
+
+def increment(name, labels, amount=1):
+    _counters[(name, labels)] += amount
+
+def _cache_samples():
+    """Counters pulled from the caches' and admission control's own stats at snapshot time"""
+    from .admission import admission_stats
+    from ..main.refdata import reference_cache_stats
+    from ..main.page_cache import page_cache_stats
+    from ..main.fragments import fragment_cache_stats
+    from ..main.invalidation import invalidation_bus_stats
+    from ..main.permissions import staff_permission_stats
+
+    page = page_cache_stats()
+    caches = {
+        'refdata': reference_cache_stats(),
+        'page': {
+            'hits': page['hits'] + page['stale_hits'] + page['revalidated'] + page['not_modified'],
+            'misses': page['misses'],
+        },
+        'fragment': fragment_cache_stats(),
+        'staff_permissions': staff_permission_stats(),
+    }
+    samples = {}
+    for cache, stats in caches.items():
+        for result in ('hits', 'misses'):
+            labels = (('cache', cache), ('result', result))
+            samples[('hotelweb_cache_lookups_total', labels)] = stats[result]
+    bus = invalidation_bus_stats()
+    for kind in ('polls', 'events', 'published', 'full_flushes'):
+        samples[('hotelweb_cache_bus_total', (('kind', kind),))] = bus[kind]
+    for result, count in admission_stats().items():
+        samples[('hotelweb_admission_total', (('result', result),))] = count
+    return samples
+
+def _snapshot():
+    counters = dict(_counters)
+    counters.update(_cache_samples())
+    return {
+        'updated': time.time(),
+        'histograms': [[name, labels, list(series)] for (name, labels), series in list(_histograms.items())],
+        'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+    }
+
+def _snapshot_path(directory):
+    return os.path.join(directory, f'worker-{_worker_id()}.json')
+
+def flush(directory):
+    """Write this worker's snapshot atomically"""
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(_snapshot(), f)
+    os.replace(tmp_path, _snapshot_path(directory))
+    _state['last_flush'] = time.time()
+
+def collect(directory, retention):
+    """Sum the snapshots of all workers (this one live, the others from disk)"""
+    own_path = _snapshot_path(directory)
+    snapshots = [_snapshot()]
+    now = time.time()
+    if os.path.isdir(directory):
+        for filename in os.listdir(directory):
+            path = os.path.join(directory, filename)
+            if not filename.startswith('worker-') or path == own_path:
+                continue
+            try:
+                if now - os.path.getmtime(path) > retention:
+                    os.remove(path)
+                    continue
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # Being replaced or removed by its worker
+
+    histograms, counters = {}, defaultdict(float)
+    for snapshot in snapshots:
+        for name, labels, series in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.setdefault(key, [0] * len(series))
+            for i, value in enumerate(series):
+                total[i] += value
+        for name, labels, value in snapshot['counters']:
+            counters[(name, tuple(map(tuple, labels)))] += value
+    return histograms, counters
+
+def _format_labels(labels):
+    escape = lambda value: str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{key}="{escape(value)}"' for key, value in labels)
+
+def render_prometheus(histograms, counters, gauges):
+    lines = []
+    by_name = defaultdict(list)
+    for (name, labels), series in histograms.items():
+        by_name[name].append((labels, series))
+    for (name, labels), value in list(counters.items()) + list(gauges.items()):
+        by_name[name].append((labels, value))
+
+    for name in sorted(by_name):
+        kind, help_text = HELP.get(name, ('untyped', name))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(by_name[name]):
+            if kind != 'histogram':
+                lines.append(f'{name}{{{_format_labels(labels)}}} {value:g}')
+                continue
+            cumulative = 0
+            for bound, count in zip(HISTOGRAM_BUCKETS[name] + ('+Inf',), value[:-1]):
+                cumulative += count
+                le = bound if bound == '+Inf' else f'{bound:g}'
+                lines.append(f'{name}_bucket{{{_format_labels(labels + (("le", le),))}}} {cumulative}')
+            lines.append(f'{name}_sum{{{_format_labels(labels)}}} {value[-1]:.6f}')
+            lines.append(f'{name}_count{{{_format_labels(labels)}}} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+def _gauges(counters):
+    from ..extensions import db
+    gauges = {}
+    for bind, engine in db.engines.items():
+        checkedout = getattr(engine.pool, 'checkedout', None)
+        if checkedout is not None:
+            gauges[('hotelweb_db_pool_checked_out', (('bind', bind or 'primary'),))] = checkedout()
+    for cache in ('refdata', 'page', 'fragment'):
+        hits = counters.get(('hotelweb_cache_lookups_total', (('cache', cache), ('result', 'hits'))), 0)
+        misses = counters.get(('hotelweb_cache_lookups_total', (('cache', cache), ('result', 'misses'))), 0)
+        if hits + misses:
+            gauges[('hotelweb_cache_hit_ratio', (('cache', cache),))] = round(hits / (hits + misses), 4)
+    return gauges
+
+def _scraper_allowed(config):
+    token = config.get('METRICS_TOKEN')
+    if token:
+        scheme, _, supplied = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and hmac.compare_digest(supplied.encode(), token.encode()):
+            return True
+    return config.get('METRICS_ALLOW_LOCALHOST', False) and request.remote_addr in LOCAL_ADDRESSES
+
+def metrics_view():
+    """Prometheus text exposition; admins or authorized scrapers only"""
+    config = current_app.config
+    if not _scraper_allowed(config) and not (current_user.is_authenticated and current_user.role == 'admin'):
+        abort(403)
+    histograms, counters = collect(config['METRICS_DIR'], config.get('METRICS_RETENTION', 86400))
+    body = render_prometheus(histograms, counters, _gauges(counters))
+    response = Response(body, mimetype='text/plain')
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+def init_metrics(app):
+    if not app.config.get('METRICS_ENABLED'):
+        return
+    if not app.config.get('METRICS_DIR'):
+        app.config['METRICS_DIR'] = os.path.join(app.instance_path, 'metrics')
+    interval = app.config.get('METRICS_FLUSH_INTERVAL', 10)
+
+    from ..extensions import db
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            _track_checkouts(engine, (('bind', bind or 'primary'),))
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    def record(labels, status, started):
+        _worker_id()
+        observe('hotelweb_http_request_duration_seconds', labels, time.perf_counter() - started)
+        increment('hotelweb_http_requests_total', labels + (('status', status),))
+        if time.time() - _state['last_flush'] >= interval:
+            try:
+                flush(app.config['METRICS_DIR'])
+            except OSError:
+                app.logger.exception('Could not write metrics snapshot')
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        endpoint = request.endpoint or 'unmatched'
+        labels = (('endpoint', endpoint), ('method', request.method))
+        if response.is_streamed:
+            # Time streamed pages until their template has rendered (teardown runs after the last chunk)
+            g.metrics_streamed = (labels, str(response.status_code), started)
+        else:
+            record(labels, str(response.status_code), started)
+        return response
+
+    @app.teardown_request
+    def record_streamed_request(exc):
+        streamed = g.pop('metrics_streamed', None)
+        if streamed is not None:
+            record(*streamed)
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+def _track_checkouts(engine, labels):
+    @event.listens_for(engine, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info['checked_out_at'] = time.perf_counter()
+
+    @event.listens_for(engine, 'checkin')
+    def on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop('checked_out_at', None)
+        if started is not None:
+            observe('hotelweb_db_pool_checkout_seconds', labels, time.perf_counter() - started)
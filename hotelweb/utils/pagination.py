@@ -0,0 +1,108 @@
+"""
+Keyset (cursor) pagination for long, newest-first lists
+
+OFFSET pagination makes the database read and discard every row before the
+page, so late pages of a long list get slower and slower. A keyset page
+instead starts right after the last row of the previous one:
+
+    WHERE (check_in, id) < (:check_in, :id) ORDER BY check_in DESC, id DESC LIMIT n
+
+which an index on the key columns answers by seeking, whatever the page.
+The key must be unique, so it ends with the primary key. Cursors are the key
+values of the first/last row of a page, passed back as ?after= or ?before=.
+Pages have no numbers: lists link to the first, previous and next page.
+
+A list over several values of a leading index column (a staff member's
+hotels: hotel_id IN (...)) can't be read in key order from one index range,
+so the database would sort every matching row for each page. Passing
+partition=(Booking.hotel_id, hotel_ids) instead takes the first rows of each
+hotel with its own index seek, picks the page's keys from those in one UNION
+ALL query, then loads the page's rows by id (rows_in_key_order, which
+unpaginated "first N" lists can use too).
+"""
+from datetime import date, datetime
+from sqlalchemy import select, tuple_, union_all
+
+CURSOR_SEPARATOR = '~'
+
+def encode_cursor(values):
+    return CURSOR_SEPARATOR.join(v.isoformat() if isinstance(v, (date, datetime)) else str(v) for v in values)
+
+def decode_cursor(cursor, columns):
+    """Key values from a cursor string, or None if it doesn't fit the columns"""
+    parts = cursor.split(CURSOR_SEPARATOR) if cursor else []
+    if len(parts) != len(columns):
+        return None
+    values = []
+    try:
+        for part, column in zip(parts, columns):
+            python_type = column.type.python_type
+            if python_type in (date, datetime):
+                values.append(python_type.fromisoformat(part))
+            else:
+                values.append(python_type(part))
+    except (ValueError, NotImplementedError):
+        return None
+    return values
+
+class KeysetPage:
+    """One page of a keyset-paginated query, newest first"""
+
+    def __init__(self, items, key, has_prev, has_next):
+        self.items = items
+        self.has_prev = has_prev
+        self.has_next = has_next
+        self.prev_cursor = encode_cursor(key(items[0])) if items and has_prev else None
+        self.next_cursor = encode_cursor(key(items[-1])) if items and has_next else None
+
+def rows_in_key_order(query, columns, limit, descending=True, partition=None):
+    """First `limit` rows of query ordered by columns, with one index seek per partition value if given"""
+    def order(cols):
+        return [c.desc() if descending else c.asc() for c in cols]
+    if partition is None or len(partition[1]) < 2:
+        return query.order_by(*order(columns)).limit(limit).all()
+
+    column, values = partition
+    arms = [select(query.filter(column == value).with_entities(*columns)
+                   .order_by(*order(columns)).limit(limit).subquery()) for value in values]
+    keys = union_all(*arms).subquery()
+    key_columns = [keys.c[c.key] for c in columns]
+    ids = query.session.execute(
+        select(key_columns[-1]).order_by(*order(key_columns)).limit(limit)
+    ).scalars().all()
+    if not ids:
+        return []
+    rows = query.filter(columns[-1].in_(ids)).all()
+    rows.sort(key=lambda item: [getattr(item, c.key) for c in columns], reverse=descending)
+    return rows
+
+def keyset_paginate(query, columns, per_page, after=None, before=None, partition=None):
+    """
+    Page of query ordered by columns, descending, starting after the row the
+    `after` cursor names (or ending before the `before` one). The last column
+    must be unique. An invalid cursor gives the first page. partition is an
+    optional (column, values) pair the query is already filtered to, see above.
+    """
+    key_columns = tuple_(*columns)
+    after_values = decode_cursor(after, columns)
+    before_values = None if after_values else decode_cursor(before, columns)
+
+    if before_values:
+        # Walk backwards from the cursor, then flip the rows back into display order
+        rows = rows_in_key_order(query.filter(key_columns > tuple_(*before_values)), columns, per_page + 1,
+                                 descending=False, partition=partition)
+        if len(rows) <= per_page:
+            return keyset_paginate(query, columns, per_page, partition=partition)  # Reached the start: show a full first page
+        items = list(reversed(rows[:per_page]))
+        has_prev, has_next = True, True
+    else:
+        if after_values:
+            query = query.filter(key_columns < tuple_(*after_values))
+        rows = rows_in_key_order(query, columns, per_page + 1, partition=partition)
+        items = rows[:per_page]
+        has_prev = after_values is not None
+        has_next = len(rows) > per_page
+
+    def key(item):
+        return [getattr(item, c.key) for c in columns]
+    return KeysetPage(items, key, has_prev, has_next)
@@ -0,0 +1,204 @@
+"""
+On-demand profiling of live requests (enabled with PROFILING_ENABLED=true)
+
+A request is profiled when:
+  - it sends the header "X-Profile: <PROFILE_SECRET>", or an admin adds
+    ?_profile=1 to the URL: the request runs under cProfile and the result is
+    saved as a .prof file (open with snakeviz, or pstats);
+  - it is picked at random with probability PROFILE_SAMPLE_RATE: a background
+    thread samples the request's stack every PROFILE_SAMPLE_INTERVAL seconds
+    and the result is saved as collapsed stacks (.collapsed, the input format
+    of flamegraph.pl and speedscope).
+Adding "X-Profile-Memory: 1" (or ?_profile=memory) also records the top
+allocations with tracemalloc (.alloc.txt).
+
+A streamed page (utils/streaming.py) is profiled until its last chunk is
+rendered, and gets no X-Profile-Id header since its headers are already sent.
+
+Only one cProfile/tracemalloc session runs per worker at a time; other
+triggered requests run unprofiled. The sampler costs one sleeping thread while
+a sampled request is in flight, so a low sample rate is safe to leave on.
+Results go to PROFILE_DIR, newest PROFILE_MAX_FILES kept, and admins can
+download them from /admin/profiles.
+"""
+import os
+import sys
+import hmac
+import time
+import random
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+from uuid import uuid4
+from flask import current_app, g, request
+from flask_login import current_user
+
+PROFILE_EXTENSIONS = ('.prof', '.collapsed', '.alloc.txt')
+
+_exclusive = threading.Lock()  # cProfile and tracemalloc are process-wide
+
+class StackSampler:
+    """Samples the stacks of registered threads from one background thread"""
+    def __init__(self):
+        self._targets = {}  # thread id -> Counter of collapsed stacks
+        self._lock = threading.Lock()
+        self._thread = None
+        self.interval = 0.005
+
+    def start(self, thread_id):
+        stacks = Counter()
+        with self._lock:
+            self._targets[thread_id] = stacks
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._thread.start()
+        return stacks
+
+    def stop(self, thread_id):
+        with self._lock:
+            return self._targets.pop(thread_id, None)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._targets:
+                    self._thread = None
+                    return
+                frames = sys._current_frames()
+                for thread_id, stacks in self._targets.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        stacks[_collapse(frame)] += 1
+
+def _collapse(frame):
+    """'outer;...;inner' with one 'function (file:line)' entry per frame"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+_sampler = StackSampler()
+
+def _requested_mode(config):
+    """'cpu', 'memory', 'sample' or None for this request"""
+    secret = config.get('PROFILE_SECRET')
+    header = request.headers.get('X-Profile')
+    if secret and header and hmac.compare_digest(header, secret):
+        return 'memory' if request.headers.get('X-Profile-Memory') == '1' else 'cpu'
+    param = request.args.get('_profile')
+    if param and current_user.is_authenticated and current_user.role == 'admin':
+        return 'memory' if param == 'memory' else 'cpu'
+    rate = config.get('PROFILE_SAMPLE_RATE', 0)
+    if rate and random.random() < rate:
+        return 'sample'
+    return None
+
+def _output_path(suffix):
+    directory = current_app.config['PROFILE_DIR']
+    os.makedirs(directory, exist_ok=True)
+    endpoint = (request.endpoint or 'unmatched').replace('.', '-')
+    name = f'{time.strftime("%Y%m%d-%H%M%S")}-{endpoint}-{uuid4().hex[:8]}{suffix}'
+    return os.path.join(directory, name)
+
+def list_profiles(directory):
+    """Saved profiles, newest first: (name, size in bytes, modified timestamp)"""
+    if not os.path.isdir(directory):
+        return []
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith(PROFILE_EXTENSIONS):
+            stat = os.stat(os.path.join(directory, name))
+            entries.append((name, stat.st_size, stat.st_mtime))
+    return sorted(entries, key=lambda entry: entry[2], reverse=True)
+
+def _prune(directory, keep):
+    for name, _, _ in list_profiles(directory)[keep:]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+
+def start_profiling():
+    mode = _requested_mode(current_app.config)
+    if mode is None:
+        return
+    if mode == 'sample':
+        g.profile = ('sample', _sampler.start(threading.get_ident()), time.perf_counter())
+        return
+    if not _exclusive.acquire(blocking=False):
+        return  # Another request in this worker is being profiled
+    if mode == 'memory':
+        tracemalloc.start(current_app.config.get('PROFILE_TRACEMALLOC_FRAMES', 10))
+    profiler = cProfile.Profile()
+    profiler.enable()
+    g.profile = (mode, profiler, time.perf_counter())
+
+def finish_profiling(response=None):
+    """Stop the request's profiler (if any) and save its output"""
+    if response is not None and response.is_streamed:
+        return response  # Still to render; stop_profiling runs after the last chunk
+    profile = g.pop('profile', None)
+    if profile is None:
+        return response
+    mode, collector, started = profile
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    paths = []
+    try:
+        if mode == 'sample':
+            _sampler.stop(threading.get_ident())
+            stacks = collector
+            if stacks:
+                path = _output_path('.collapsed')
+                with open(path, 'w') as f:
+                    f.writelines(f'{stack} {count}\n' for stack, count in stacks.items())
+                paths.append(path)
+        else:
+            collector.disable()
+            path = _output_path('.prof')
+            pstats.Stats(collector).dump_stats(path)
+            paths.append(path)
+            if mode == 'memory':
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                path = _output_path('.alloc.txt')
+                with open(path, 'w') as f:
+                    f.write(f'{request.method} {request.full_path.rstrip("?")} ({elapsed_ms:.1f} ms)\n')
+                    f.writelines(f'{stat}\n' for stat in snapshot.statistics('lineno')[:50])
+                paths.append(path)
+    finally:
+        if mode != 'sample':
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            _exclusive.release()
+
+    if not paths:
+        return response  # Finished before the sampler's first tick
+    names = [os.path.basename(path) for path in paths]
+    current_app.logger.info('Profiled %s %s (%s, %.1f ms): %s',
+                            request.method, request.path, mode, elapsed_ms, ', '.join(names))
+    _prune(current_app.config['PROFILE_DIR'], current_app.config.get('PROFILE_MAX_FILES', 200))
+    if response is not None:
+        response.headers['X-Profile-Id'] = ', '.join(names)
+    return response
+
+def init_profiling(app):
+    if not app.config.get('PROFILING_ENABLED'):
+        return
+    if not app.config.get('PROFILE_DIR'):
+        app.config['PROFILE_DIR'] = os.path.join(app.instance_path, 'profiles')
+    _sampler.interval = app.config.get('PROFILE_SAMPLE_INTERVAL', 0.005)
+
+    app.before_request(start_profiling)
+    app.after_request(finish_profiling)
+
+    # after_request is skipped when a request fails outright, and a streamed page is
+    # profiled until its template has rendered; stop the profiler here then
+    @app.teardown_request
+    def stop_profiling(exc):
+        if g.get('profile') is not None:
+            finish_profiling()
@@ -0,0 +1,103 @@
+"""
+Traffic capture for replay (enabled with REQUEST_CAPTURE=true)
+
+Each captured request is written as one JSON line: time, method, path,
+endpoint, query args, the names (never the values) of form and JSON fields,
+the user's role, status and duration. Query args whose name looks sensitive
+(passwords, tokens, card details) and free-text searches, which carry
+usernames and emails, are redacted. scripts/tools/replay_requests.py
+replays the log against a local app.
+
+Every worker writes its own file, REQUEST_CAPTURE_DIR/requests-<pid>.jsonl,
+rotated at REQUEST_CAPTURE_MAX_BYTES with REQUEST_CAPTURE_BACKUPS old files
+kept, so workers never write to or rotate the same file. Set
+REQUEST_CAPTURE_SAMPLE_RATE below 1 to capture a share of the traffic.
+"""
+import os
+import re
+import json
+import time
+import random
+import logging
+from logging.handlers import RotatingFileHandler
+from flask import g, request
+from flask_login import current_user
+
+SENSITIVE = re.compile(r'pass|token|secret|csrf|card|cvv|cvc|expiry|email|phone', re.IGNORECASE)
+# Free-text searches (admin users, staff bookings...) hold usernames and emails
+FREE_TEXT = {'search', 'q', 'query'}
+SKIPPED_ENDPOINTS = {'static', 'metrics'}
+
+_logger = logging.getLogger('hotelweb.request_capture')
+_logger.propagate = False
+_state = {'pid': None}
+
+def _capture_logger(config):
+    """The logger with this worker's file handler (replaced after a fork)"""
+    if _state['pid'] != os.getpid():
+        for handler in list(_logger.handlers):
+            _logger.removeHandler(handler)
+            handler.close()
+        directory = config['REQUEST_CAPTURE_DIR']
+        os.makedirs(directory, exist_ok=True)
+        handler = RotatingFileHandler(
+            os.path.join(directory, f'requests-{os.getpid()}.jsonl'),
+            maxBytes=config.get('REQUEST_CAPTURE_MAX_BYTES', 50 * 1024 * 1024),
+            backupCount=config.get('REQUEST_CAPTURE_BACKUPS', 5),
+            delay=True
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+        _state['pid'] = os.getpid()
+    return _logger
+
+def sanitize_args(args):
+    """Query args as {name: [values]}, with sensitive values replaced"""
+    return {
+        name: ['[redacted]'] * len(values) if name.lower() in FREE_TEXT or SENSITIVE.search(name) else values
+        for name, values in args.to_dict(flat=False).items()
+    }
+
+def request_descriptor(response, duration, role):
+    descriptor = {
+        'ts': round(time.time(), 3),
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'args': sanitize_args(request.args),
+        'form_keys': sorted(request.form.keys()),
+        'role': role,
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 2),
+    }
+    if request.is_json:
+        body = request.get_json(silent=True)
+        descriptor['json_keys'] = sorted(body) if isinstance(body, dict) else []
+    return descriptor
+
+def init_request_capture(app):
+    if not app.config.get('REQUEST_CAPTURE'):
+        return
+    if not app.config.get('REQUEST_CAPTURE_DIR'):
+        app.config['REQUEST_CAPTURE_DIR'] = os.path.join(app.instance_path, 'capture')
+    rate = app.config.get('REQUEST_CAPTURE_SAMPLE_RATE', 1.0)
+
+    @app.before_request
+    def start_capture():
+        if request.endpoint not in SKIPPED_ENDPOINTS and (rate >= 1 or random.random() < rate):
+            # Role as the request arrived (a login request is replayed logged out)
+            g.capture_role = current_user.role if current_user.is_authenticated else 'anonymous'
+            g.capture_started = time.perf_counter()
+
+    @app.after_request
+    def capture_request(response):
+        started = g.pop('capture_started', None)
+        if started is None:
+            return response
+        try:
+            descriptor = request_descriptor(response, time.perf_counter() - started, g.pop('capture_role'))
+            _capture_logger(app.config).info(json.dumps(descriptor, separators=(',', ':')))
+        except OSError:
+            app.logger.exception('Could not write captured request')
+        return response
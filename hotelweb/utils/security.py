@@ -7,6 +7,7 @@ import time
 from flask import session, request, abort
 from functools import wraps
 from datetime import datetime, timedelta
+from .login_throttle import check_key, record_failure, clear_failures, check_login_allowed, record_login_result
 
 def generate_csrf_token():
     """Generate a CSRF token and store it in session"""
@@ -18,7 +19,8 @@ def generate_csrf_token():
 
 def validate_csrf_token(token):
     """Validate CSRF token from form"""
-    if not token:
+    # JSON bodies can carry any type; compare_digest raises on non-strings
+    if not token or not isinstance(token, str):
         return False
     expected_token = session.get('csrf_token')
     if not expected_token:
@@ -403,51 +405,18 @@ def validate_integer(value, field_name, min_value=None, max_value=None, required
     except (ValueError, TypeError):
         return False, f"Invalid {field_name} format", None
 
-# Login attempt tracking (in-memory, for production use Redis or database)
-_login_attempts = {}
-
+# Login attempt tracking: see utils/login_throttle.py for the stores and the
+# per-account/per-IP limits the login forms use (check_login_allowed,
+# record_login_result)
 def check_login_attempts(identifier, max_attempts=5, lockout_duration=900):
     """
     Check if login attempts exceed limit
     identifier: email or IP address
-    max_attempts: maximum failed attempts allowed
+    max_attempts: maximum failed attempts allowed in the sliding window
     lockout_duration: lockout duration in seconds (default 15 minutes)
     Returns (allowed, remaining_attempts, lockout_until)
     """
-    now = datetime.now()
-    
-    if identifier not in _login_attempts:
-        return True, max_attempts, None
-    
-    attempts_data = _login_attempts[identifier]
-    
-    # Check if locked out
-    if attempts_data.get('lockout_until'):
-        if now < attempts_data['lockout_until']:
-            remaining_seconds = int((attempts_data['lockout_until'] - now).total_seconds())
-            return False, 0, attempts_data['lockout_until']
-        else:
-            # Lockout expired, reset
-            _login_attempts[identifier] = {'attempts': 0, 'last_attempt': None, 'lockout_until': None}
-            return True, max_attempts, None
-    
-    # Check attempt count
-    attempts = attempts_data.get('attempts', 0)
-    last_attempt = attempts_data.get('last_attempt')
-    
-    # Reset if last attempt was more than 1 hour ago
-    if last_attempt and (now - last_attempt).total_seconds() > 3600:
-        _login_attempts[identifier] = {'attempts': 0, 'last_attempt': None, 'lockout_until': None}
-        return True, max_attempts, None
-    
-    if attempts >= max_attempts:
-        # Lock out
-        lockout_until = now + timedelta(seconds=lockout_duration)
-        _login_attempts[identifier]['lockout_until'] = lockout_until
-        return False, 0, lockout_until
-    
-    remaining = max_attempts - attempts
-    return True, remaining, None
+    return check_key(identifier, max_attempts, lockout_duration)
 
 def record_login_attempt(identifier, success):
     """
@@ -456,25 +425,15 @@ def record_login_attempt(identifier, success):
     success: True if login successful, False otherwise
     """
     if success:
-        # Reset on successful login
-        if identifier in _login_attempts:
-            del _login_attempts[identifier]
+        clear_failures(identifier)
     else:
-        # Increment failed attempts
-        if identifier not in _login_attempts:
-            _login_attempts[identifier] = {'attempts': 0, 'last_attempt': None, 'lockout_until': None}
-        
-        _login_attempts[identifier]['attempts'] += 1
-        _login_attempts[identifier]['last_attempt'] = datetime.now()
+        record_failure(identifier)
 
 def get_client_ip():
     """
-    Get client IP address from request
+    Get client IP address from request.
+    X-Forwarded-For/X-Real-IP sent by the client are not trusted; behind a
+    proxy, set TRUSTED_PROXY_COUNT so ProxyFix fills in remote_addr.
     """
-    if request.headers.get('X-Forwarded-For'):
-        return request.headers.get('X-Forwarded-For').split(',')[0].strip()
-    elif request.headers.get('X-Real-IP'):
-        return request.headers.get('X-Real-IP')
-    else:
-        return request.remote_addr
+    return request.remote_addr
 
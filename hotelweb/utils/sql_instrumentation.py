@@ -0,0 +1,150 @@
+"""
+Per-request SQL instrumentation (opt-in with SQL_INSTRUMENTATION=true)
+
+Times every statement through SQLAlchemy's before/after_cursor_execute events
+and keeps, per request: the query count, total SQL time, the slowest
+statements, and how often each statement shape ran. A shape that runs
+SQL_N_PLUS_ONE_THRESHOLD times or more in one request is reported as a likely
+N+1 pattern together with the line of code (or template) that first issued it.
+
+Every response gets a Server-Timing header (db time and query count, total
+app time), visible in the browser dev tools; for a streamed page it covers
+the view only, as it is sent before the template runs. Requests over SQL_BUDGET_QUERIES
+queries or SQL_BUDGET_MS of SQL time, or with an N+1 pattern, are logged as
+warnings with the details.
+"""
+import os
+import re
+import sys
+import time
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+_WHITESPACE = re.compile(r'\s+')
+_PARAM_LIST = re.compile(r'\(\?(?:, \?)*\)|\(__\[POSTCOMPILE_\w+\]\)')
+_settings = {'keep_slowest': 3}
+
+class RequestSQLStats:
+    """SQL activity of one request"""
+    __slots__ = ('count', 'total', 'shapes', 'slowest', 'started')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0  # Seconds
+        self.shapes = {}  # shape -> [count, seconds, first call site]
+        self.slowest = []  # (seconds, shape), longest first
+        self.started = time.perf_counter()
+
+    def record(self, statement, elapsed, keep_slowest):
+        self.count += 1
+        self.total += elapsed
+        shape = statement_shape(statement)
+        entry = self.shapes.get(shape)
+        if entry is None:
+            self.shapes[shape] = [1, elapsed, _call_site()]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+        if len(self.slowest) < keep_slowest or elapsed > self.slowest[-1][0]:
+            self.slowest.append((elapsed, shape))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[keep_slowest:]
+
+    def repeated(self, threshold):
+        """(shape, count, seconds, call site) for shapes run at least threshold times"""
+        return sorted(
+            ((shape, n, seconds, site) for shape, (n, seconds, site) in self.shapes.items() if n >= threshold),
+            key=lambda item: item[1], reverse=True
+        )
+
+def statement_shape(statement):
+    """Statement text with whitespace collapsed and IN lists folded, so (?, ?) == (?)"""
+    return _PARAM_LIST.sub('(?)', _WHITESPACE.sub(' ', statement).strip())
+
+def _call_site():
+    """Innermost frame in our code (views, services, templates) that led to the query"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        template = frame.f_globals.get('__jinja_template__')
+        if template is not None:
+            return f'templates/{template.name}:{template.get_corresponding_lineno(frame.f_lineno)}'
+        filename = frame.f_code.co_filename
+        if filename.startswith(_PACKAGE_DIR) and filename != _THIS_FILE:
+            return f'{os.path.relpath(filename, _PACKAGE_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return 'unknown'
+
+def request_sql_stats():
+    """Stats for the current request, or None when instrumentation is off"""
+    return g.get('sql_stats') if has_request_context() else None
+
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    stats = request_sql_stats()
+    if stats is not None:
+        stats.record(statement, elapsed, _settings['keep_slowest'])
+
+def _drop_timer(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    # so the pooled connection's stack doesn't grow
+    conn = context.connection
+    if conn is not None and context.execution_context is not None:
+        started = conn.info.get('query_started')
+        if started:
+            started.pop()
+
+def init_sql_instrumentation(app):
+    if not app.config.get('SQL_INSTRUMENTATION'):
+        return
+    _settings['keep_slowest'] = app.config.get('SQL_SLOWEST_COUNT', 3)
+    # Engine-wide listeners, registered once however many apps are created
+    if not event.contains(Engine, 'before_cursor_execute', _start_timer):
+        event.listen(Engine, 'before_cursor_execute', _start_timer)
+        event.listen(Engine, 'after_cursor_execute', _stop_timer)
+        event.listen(Engine, 'handle_error', _drop_timer)
+
+    @app.before_request
+    def start_sql_stats():
+        g.sql_stats = RequestSQLStats()
+
+    def report(stats, app_ms, db_ms):
+        config = app.config
+        repeated = stats.repeated(config.get('SQL_N_PLUS_ONE_THRESHOLD', 5))
+        over_budget = stats.count > config.get('SQL_BUDGET_QUERIES', 50) or db_ms > config.get('SQL_BUDGET_MS', 200)
+        if over_budget or repeated:
+            lines = [f'{request.method} {request.full_path.rstrip("?")}: {stats.count} queries, '
+                     f'{db_ms:.1f} ms SQL, {app_ms:.1f} ms total']
+            for shape, n, seconds, site in repeated:
+                lines.append(f'  N+1: {n}x ({seconds * 1000:.1f} ms) at {site}: {shape[:200]}')
+            for seconds, shape in stats.slowest:
+                lines.append(f'  slow: {seconds * 1000:.1f} ms: {shape[:200]}')
+            app.logger.warning('SQL budget report\n%s', '\n'.join(lines))
+
+    @app.after_request
+    def report_sql_stats(response):
+        stats = g.get('sql_stats')
+        if stats is None:
+            return response
+        app_ms = (time.perf_counter() - stats.started) * 1000
+        db_ms = stats.total * 1000
+        response.headers.add(
+            'Server-Timing', f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={app_ms:.1f}'
+        )
+        if not response.is_streamed:
+            g.pop('sql_stats')
+            report(stats, app_ms, db_ms)
+        return response
+
+    # A streamed template still runs queries after after_request; count them and
+    # report once it is rendered (teardown runs after the last chunk)
+    @app.teardown_request
+    def report_streamed_sql_stats(exc):
+        stats = g.pop('sql_stats', None)
+        if stats is not None:
+            report(stats, (time.perf_counter() - stats.started) * 1000, stats.total * 1000)
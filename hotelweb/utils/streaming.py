@@ -0,0 +1,55 @@
+"""
+Streamed rendering for pages with long lists (STREAM_TEMPLATES=true)
+
+stream_page() returns a response whose template is rendered while it is
+sent: the browser receives the <head> (and starts fetching CSS and JS) and
+the top of the page while the rest of a long result list is still being
+rendered. Output is sent in chunks of about STREAM_BUFFER_SIZE bytes rather
+than one per template statement.
+
+The headers, and so the session cookie, go out before the template runs, so
+anything a template would store in the session is done up front: flashed
+messages are taken from the session and the CSRF token is created.
+Templates must not otherwise change the session, set cookies or change the
+status code. Other things to keep in mind:
+  - an error in the template cuts the page short after a 200 status (it is
+    logged), so do the work that can fail in the view;
+  - after_request hooks run before the body is rendered. Hooks that measure
+    the whole request (the SQL report, request metrics, profiling) finish in
+    teardown_request instead, which runs after the last chunk; headers they
+    set, such as Server-Timing, cover the view only;
+  - a @cost_class concurrency slot is held until the response is closed.
+Don't use it under @cached_page, which needs the whole body to store.
+"""
+from flask import current_app, get_flashed_messages, render_template, stream_template
+from .security import generate_csrf_token
+
+def _buffered(chunks, size):
+    buffer, buffered = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield ''.join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+def _logged(chunks, app, template_name):
+    try:
+        yield from chunks
+    except Exception:
+        # The request context is gone by now, so log through the app passed in
+        app.logger.exception('Error while streaming %s; the page was cut short', template_name)
+
+def stream_page(template_name, **context):
+    """Render template_name as it is sent (render_template when STREAM_TEMPLATES is off)"""
+    config = current_app.config
+    if not config.get('STREAM_TEMPLATES'):
+        return render_template(template_name, **context)
+    # Session changes the template would make must happen before the headers are sent
+    get_flashed_messages()
+    generate_csrf_token()
+    chunks = _buffered(stream_template(template_name, **context), config.get('STREAM_BUFFER_SIZE', 8192))
+    app = current_app._get_current_object()
+    return app.response_class(_logged(chunks, app, template_name), mimetype='text/html')